@@ -0,0 +1,227 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""asyncio flavour of the base client manager.
+
+This module needs Python 3.6+ and aiohttp.
+"""
+
+import asyncio
+
+import aiohttp
+
+from climateclient import base
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+def create_session(pool_maxsize=base.DEFAULT_POOL_MAXSIZE):
+    """Creates a non-blocking HTTP session with a keep-alive pool.
+
+    :param pool_maxsize: Maximum number of connections kept per host.
+    :type pool_maxsize: int
+
+    :returns: Session to be shared between the client managers.
+    :rtype: aiohttp.ClientSession
+    """
+    connector = aiohttp.TCPConnector(limit_per_host=pool_maxsize)
+    return aiohttp.ClientSession(connector=connector)
+
+
+def client_timeout(timeout):
+    """Turns a timeout of the requests flavour into an aiohttp one.
+
+    :param timeout: (connect, read) seconds, one value for both, or None.
+
+    :rtype: aiohttp.ClientTimeout
+    """
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=None)
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+    else:
+        connect = read = timeout
+    return aiohttp.ClientTimeout(total=None, sock_connect=connect,
+                                 sock_read=read)
+
+
+class AsyncBaseClientManager(base.BaseClientManager):
+    """Base manager to interact with a particular type of API from asyncio.
+
+    Methods are coroutines mirroring the ones of BaseClientManager, except
+    _paginate which is an asynchronous generator, and _iter which has no
+    asyncio flavour: listings are streamed with _paginate. The number of
+    requests in flight is bounded by the semaphore shared by all the
+    managers of a client.
+    """
+    def __init__(self, climate_url, auth_token, session, semaphore=None,
+                 retry_policy=None, rate_limiter=None,
+                 timeout=base.DEFAULT_TIMEOUT, circuit_breaker=None):
+        super(AsyncBaseClientManager, self).__init__(
+            climate_url, auth_token, session=session,
+            retry_policy=retry_policy, rate_limiter=rate_limiter,
+            timeout=timeout, circuit_breaker=circuit_breaker)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+        self.semaphore = semaphore
+
+    async def _get(self, url, response_key):
+        resp, body = await self.request(url, 'GET')
+        return body[response_key]
+
+    async def _list(self, url, response_key, limit=None, marker=None,
+                    sort_key=None, sort_dir=None, filters=None):
+        """Sends a paginated list request, see BaseClientManager._list."""
+        filters = self._clean_filters(filters)
+        if filters and limit is not None:
+            return [resource async for resource in self._paginate(
+                url, response_key, limit=limit, marker=marker,
+                sort_key=sort_key, sort_dir=sort_dir, filters=filters)]
+        resources = await self._get(
+            self._list_url(url, limit, marker, sort_key, sort_dir, filters),
+            response_key)
+        return self._paginate_locally(resources, limit, marker, sort_key,
+                                      sort_dir, filters)
+
+    async def _paginate(self, url, response_key,
+                        page_size=base.DEFAULT_PAGE_SIZE, limit=None,
+                        marker=None, sort_key=None, sort_dir=None,
+                        filters=None):
+        """Iterates over the resources, fetching pages of them on demand.
+
+        Asynchronous generator, see BaseClientManager._paginate.
+        """
+        filters = self._clean_filters(filters)
+        remaining = limit
+        first_page = True
+        while remaining is None or remaining > 0:
+            if remaining is None or filters:
+                size = page_size
+            else:
+                size = min(page_size, remaining)
+            page = await self._get(
+                self._list_url(url, size, marker, sort_key, sort_dir,
+                               filters),
+                response_key)
+            if self._is_whole_listing(page, size, first_page, marker):
+                for resource in self._paginate_locally(
+                        page, remaining, marker, sort_key, sort_dir,
+                        filters):
+                    yield resource
+                return
+            first_page = False
+            matching = self._filter_locally(page, filters)
+            if remaining is not None:
+                matching = matching[:remaining]
+            for resource in matching:
+                yield resource
+            if len(page) < size:
+                return
+            marker = page[-1]['id']
+            if remaining is not None:
+                remaining -= len(matching)
+
+    def _as_records(self, resources, as_records):
+        """Turns resources into instances of record_class if as_records.
+
+        A list gives a list, an asynchronous iterable gives an asynchronous
+        generator.
+        """
+        if not as_records or isinstance(resources, list):
+            return super(AsyncBaseClientManager, self)._as_records(
+                resources, as_records)
+
+        async def records():
+            async for resource in resources:
+                yield self.record_class(resource)
+        return records()
+
+    async def _create(self, url, body, response_key):
+        resp, body = await self.request(url, 'POST', body=body)
+        return body[response_key]
+
+    async def _delete(self, url):
+        resp, body = await self.request(url, 'DELETE')
+
+    async def _update(self, url, body, response_key=None):
+        resp, body = await self.request(url, 'PUT', body=body)
+        return body[response_key]
+
+    async def _run_many(self, func, ids):
+        """Runs the coroutine function func for every ID concurrently.
+
+        Concurrency is bounded by the semaphore of the client.
+
+        :returns: One BulkResult per ID, in the order of ids.
+        :rtype: list
+        """
+        async def run_one(item_id):
+            try:
+                return base.BulkResult(item_id, result=await func(item_id))
+            except Exception as e:
+                return base.BulkResult(item_id, error=e)
+
+        return await asyncio.gather(*[run_one(item_id) for item_id in ids])
+
+    async def request(self, url, method, **kwargs):
+        """Base request coroutine.
+
+        Adds specific headers and URL prefix to the request, retries it as
+        allowed by the retry policy, and maps errors to the same exceptions
+        as BaseClientManager.request. Retries wait without holding the
+        semaphore.
+
+        :returns: Response and body.
+        :rtype: tuple
+        """
+        kwargs = self._prepare_request(kwargs)
+        kwargs.setdefault('timeout', client_timeout(self.timeout))
+
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve(self.climate_url)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            try:
+                async with self.semaphore:
+                    async with self.session.request(
+                            method, self.climate_url + url,
+                            **kwargs) as resp:
+                        text = await resp.text()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self._record_outcome(failed=True)
+                if (self.retry_policy is None or
+                        not self.retry_policy.should_retry(
+                            attempt, method, connection_error=True)):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+            except BaseException:
+                # NOTE: includes the cancellation of the task.
+                self._record_outcome(failed=True)
+                raise
+            else:
+                self._record_outcome(failed=resp.status >= 500)
+                if (self.retry_policy is None or
+                        not self.retry_policy.should_retry(
+                            attempt, method, resp.status, resp.headers)):
+                    break
+                delay = self.retry_policy.backoff(attempt, resp.headers)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        return resp, self._decode_response(resp.status, text)
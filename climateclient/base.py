@@ -14,12 +14,79 @@
 # limitations under the License.
 
 
+import copy
 import json
+import logging
+from multiprocessing import pool
+import time
 
 import requests
+from requests import adapters
+from six.moves.urllib import parse
 
+from climateclient import cache
 from climateclient import exception
+from climateclient import instrumentation
 from climateclient.openstack.common.gettextutils import _  # noqa
+from climateclient import utils
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_MAX_WORKERS = 10
+STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 60
+DEFAULT_TIMEOUT = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+
+
+def create_session(pool_connections=DEFAULT_POOL_CONNECTIONS,
+                   pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False):
+    """Creates an HTTP session backed by a keep-alive connection pool.
+
+    :param pool_connections: Number of per-host connection pools to cache.
+    :type pool_connections: int
+
+    :param pool_maxsize: Maximum number of connections kept per host.
+    :type pool_maxsize: int
+
+    :param pool_block: Whether to wait for a free connection instead of
+                       opening a new, non-pooled one when the pool is full.
+    :type pool_block: bool
+
+    :returns: Session to be shared between the client managers.
+    :rtype: requests.Session
+    """
+    session = requests.Session()
+    adapter = adapters.HTTPAdapter(pool_connections=pool_connections,
+                                   pool_maxsize=pool_maxsize,
+                                   pool_block=pool_block)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class BulkResult(object):
+    """Outcome of one item of a bulk operation.
+
+    Either result is set to the value returned for the item, or error to
+    the exception raised while processing it.
+    """
+    def __init__(self, item_id, result=None, error=None):
+        self.id = item_id
+        self.result = result
+        self.error = error
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.succeeded:
+            return '<BulkResult %s: %r>' % (self.id, self.result)
+        return '<BulkResult %s: error %r>' % (self.id, self.error)
 
 
 class BaseClientManager(object):
@@ -28,12 +95,26 @@ class BaseClientManager(object):
     There are environments, nodes and jobs types of API requests.
     Manager provides CRUD operations for them.
     """
-    def __init__(self, climate_url, auth_token):
+    def __init__(self, climate_url, auth_token, session=None,
+                 response_cache=None, hooks=None, retry_policy=None,
+                 rate_limiter=None, timeout=DEFAULT_TIMEOUT,
+                 circuit_breaker=None, single_flight=None):
         self.climate_url = climate_url
         self.auth_token = auth_token
+        self.session = session
+        self.response_cache = response_cache
+        self.hooks = hooks or []
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
+        self.single_flight = single_flight
 
     USER_AGENT = 'python-climateclient'
 
+    # NOTE: compact type of the listed resources, see v1.records.
+    record_class = None
+
     def _get(self, url, response_key):
         """Sends get request to Climate.
 
@@ -49,6 +130,188 @@ class BaseClientManager(object):
         resp, body = self.request(url, 'GET')
         return body[response_key]
 
+    def _list(self, url, response_key, limit=None, marker=None,
+              sort_key=None, sort_dir=None, filters=None):
+        """Sends a paginated list request to Climate.
+
+        limit, marker, sort_key, sort_dir and filters are passed to the
+        server as query parameters. They are applied again to the result,
+        which makes no difference if the server handled them and makes them
+        work if it ignored them.
+
+        :param limit: Maximum number of resources to return.
+        :type limit: int
+
+        :param marker: ID of the resource after which to start.
+        :type marker: str
+
+        :param sort_key: Attribute to sort the resources by.
+        :type sort_key: str
+
+        :param sort_dir: Sort direction, 'asc' (default) or 'desc'.
+        :type sort_dir: str
+
+        :param filters: Values the resources must match, see _filter_locally.
+        :type filters: dict
+
+        :returns: Resource entities.
+        :rtype: list
+        """
+        filters = self._clean_filters(filters)
+        if filters and limit is not None:
+            # NOTE: a server ignoring the filters would return fewer than
+            #       limit matching resources, keep fetching until limit.
+            return list(self._paginate(url, response_key,
+                                       limit=limit, marker=marker,
+                                       sort_key=sort_key, sort_dir=sort_dir,
+                                       filters=filters))
+        resources = self._get(
+            self._list_url(url, limit, marker, sort_key, sort_dir, filters),
+            response_key)
+        return self._paginate_locally(resources, limit, marker, sort_key,
+                                      sort_dir, filters)
+
+    def _paginate(self, url, response_key, page_size=DEFAULT_PAGE_SIZE,
+                  limit=None, marker=None, sort_key=None, sort_dir=None,
+                  filters=None):
+        """Iterates over the resources, fetching pages of them on demand.
+
+        If the server turns out to ignore the pagination parameters, the
+        resources of the first response are paginated locally instead.
+        Filters ignored by the server are applied to every page. With
+        filters, full pages are fetched until limit resources match, as a
+        server ignoring them may return few matching resources per page.
+
+        :param page_size: Number of resources fetched per request.
+        :type page_size: int
+
+        :param limit: Maximum number of resources to iterate over.
+        :type limit: int
+
+        :returns: Generator of the resource entities.
+        :rtype: generator
+        """
+        filters = self._clean_filters(filters)
+        remaining = limit
+        first_page = True
+        while remaining is None or remaining > 0:
+            if remaining is None or filters:
+                size = page_size
+            else:
+                size = min(page_size, remaining)
+            page = self._get(
+                self._list_url(url, size, marker, sort_key, sort_dir,
+                               filters),
+                response_key)
+            if self._is_whole_listing(page, size, first_page, marker):
+                for resource in self._paginate_locally(
+                        page, remaining, marker, sort_key, sort_dir,
+                        filters):
+                    yield resource
+                return
+            first_page = False
+            matching = self._filter_locally(page, filters)
+            if remaining is not None:
+                matching = matching[:remaining]
+            for resource in matching:
+                yield resource
+            if len(page) < size:
+                return
+            marker = page[-1]['id']
+            if remaining is not None:
+                remaining -= len(matching)
+
+    @staticmethod
+    def _is_whole_listing(page, size, first_page, marker):
+        """Tells whether the server ignored the pagination parameters.
+
+        Such a server returns all the resources, i.e. more than size, fewer
+        than size on the first page, or the marker resource itself.
+        """
+        return (len(page) > size or
+                (first_page and len(page) < size) or
+                (marker is not None and any(r['id'] == marker for r in page)))
+
+    def _as_records(self, resources, as_records):
+        """Turns resources into instances of record_class if as_records.
+
+        A list gives a list, any other iterable gives an iterator.
+        """
+        if not as_records:
+            return resources
+        if isinstance(resources, list):
+            return [self.record_class(r) for r in resources]
+        return (self.record_class(r) for r in resources)
+
+    @staticmethod
+    def _clean_filters(filters):
+        return dict((k, v) for k, v in (filters or {}).items()
+                    if v is not None)
+
+    @staticmethod
+    def _list_url(url, limit, marker, sort_key, sort_dir, filters=None):
+        params = [(k, v) for k, v in (('limit', limit), ('marker', marker),
+                                      ('sort_key', sort_key),
+                                      ('sort_dir', sort_dir))
+                  if v is not None]
+        params.extend(sorted((filters or {}).items()))
+        if not params:
+            return url
+        return '%s?%s' % (url, parse.urlencode(params))
+
+    def _filter_locally(self, resources, filters):
+        """Returns the resources matching all the filters.
+
+        A resource matches a filter if its attribute named after the filter
+        equals the filter value. Managers supporting other kinds of filters
+        override this method.
+        """
+        if not filters:
+            return resources
+        return [r for r in resources
+                if all(r.get(k) == v for k, v in filters.items())]
+
+    def _paginate_locally(self, resources, limit, marker, sort_key, sort_dir,
+                          filters=None):
+        if sort_key:
+            resources = sorted(resources, key=lambda r: r[sort_key],
+                               reverse=(sort_dir == 'desc'))
+        if marker is not None:
+            for index, resource in enumerate(resources):
+                if resource['id'] == marker:
+                    resources = resources[index + 1:]
+                    break
+        resources = self._filter_locally(resources, filters)
+        if limit is not None:
+            resources = resources[:limit]
+        return resources
+
+    def _iter(self, url, response_key):
+        """Sends get request to Climate and streams the listed resources.
+
+        The response is decoded incrementally, so that only one resource at
+        a time is held in memory rather than the whole list.
+
+        :param url: URL to the wanted Climate resources.
+        :type url: str
+
+        :param response_key: Type of resources (leases, hosts).
+        :type response_key: str
+
+        :returns: Generator of the resource entities.
+        :rtype: generator
+        """
+        kwargs = self._prepare_request({'stream': True})
+        resp = self._send('GET', url, **kwargs)
+        try:
+            if resp.status_code >= 400:
+                self._decode_response(resp.status_code, resp.text)
+            chunks = resp.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            for item in utils.iter_json_array(chunks, response_key):
+                yield item
+        finally:
+            resp.close()
+
     def _create(self, url, body, response_key):
         """Sends create request to Climate.
 
@@ -93,6 +356,38 @@ class BaseClientManager(object):
         resp, body = self.request(url, 'PUT', body=body)
         return body[response_key]
 
+    def _run_many(self, func, ids, max_workers=DEFAULT_MAX_WORKERS):
+        """Calls func for every ID on a bounded pool of worker threads.
+
+        :param func: Function to call with each ID.
+        :type func: callable
+
+        :param ids: IDs of the resources to process.
+        :type ids: list
+
+        :param max_workers: Maximum number of concurrent calls.
+        :type max_workers: int
+
+        :returns: One BulkResult per ID, in the order of ids.
+        :rtype: list
+        """
+        def run_one(item_id):
+            try:
+                return BulkResult(item_id, result=func(item_id))
+            except Exception as e:
+                return BulkResult(item_id, error=e)
+
+        ids = list(ids)
+        if len(ids) <= 1:
+            return [run_one(item_id) for item_id in ids]
+
+        workers = pool.ThreadPool(min(max_workers, len(ids)))
+        try:
+            return workers.map(run_one, ids)
+        finally:
+            workers.close()
+            workers.join()
+
     def request(self, url, method, **kwargs):
         """Base request method.
 
@@ -107,6 +402,168 @@ class BaseClientManager(object):
         :returns: Response and body.
         :rtype: tuple
         """
+        kwargs = self._prepare_request(kwargs)
+
+        cache_key = cached = None
+        if method == 'GET' and self.response_cache is not None:
+            cache_key = self.response_cache.key(self.climate_url + url,
+                                                self.auth_token)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                if cached.etag:
+                    kwargs['headers']['If-None-Match'] = cached.etag
+                if cached.last_modified:
+                    kwargs['headers']['If-Modified-Since'] = (
+                        cached.last_modified)
+
+        resp, body = self._send_and_decode(url, method, kwargs, cached)
+
+        # NOTE: callers get their own copy of cached bodies, which they may
+        #       modify, e.g. ClimateCommand.format_output_data does.
+        if cached is not None and resp.status_code == 304:
+            self.response_cache.record(hit=True)
+            return resp, copy.deepcopy(cached.body)
+
+        if cache_key is not None:
+            self.response_cache.record(hit=False)
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.response_cache.set(
+                    cache_key, cache.CachedResponse(copy.deepcopy(body), etag,
+                                                    last_modified))
+        return resp, body
+
+    def _send_and_decode(self, url, method, kwargs, cached):
+        """Sends the request and decodes the response, timing each phase.
+
+        The pre_request, post_response and on_error hooks are called with
+        the instrumentation.RequestEvent of the request. A 304 response to
+        a request revalidating the cached response is not decoded.
+        """
+        event = instrumentation.RequestEvent(method, url)
+        event.request_bytes = len(kwargs.get('data') or '')
+        instrumentation.notify(self.hooks, 'pre_request', event)
+
+        if self.hooks:
+            # NOTE: the body is read separately to time its download.
+            kwargs['stream'] = True
+        start = time.time()
+        try:
+            resp = self._send_shared(method, url, event, kwargs)
+            event.status = resp.status_code
+            event.timings['ttfb'] = (time.time() - start -
+                                     event.timings.get('throttle', 0))
+
+            phase_start = time.time()
+            content = resp.content or b''
+            event.response_bytes = len(content)
+            event.timings['download'] = time.time() - phase_start
+
+            phase_start = time.time()
+            body = None
+            if cached is None or resp.status_code != 304:
+                body = self._decode_response(resp.status_code, resp.text)
+            event.timings['decode'] = time.time() - phase_start
+        except Exception as e:
+            event.error = e
+            event.timings['total'] = time.time() - start
+            instrumentation.notify(self.hooks, 'on_error', event)
+            raise
+        event.timings['total'] = time.time() - start
+        instrumentation.notify(self.hooks, 'post_response', event)
+        return resp, body
+
+    def _send_shared(self, method, url, event, kwargs):
+        """Sends the request, sharing identical GETs sent concurrently.
+
+        GETs of the same URL with the same token and conditional headers
+        share the response of the first one while it is in flight. The
+        response body is read before it is shared and every caller decodes
+        it, so that callers do not share mutable resources.
+        """
+        if method != 'GET' or self.single_flight is None:
+            return self._send(method, url, event=event, **kwargs)
+
+        headers = kwargs.get('headers', {})
+        key = (self.climate_url + url, self.auth_token,
+               headers.get('If-None-Match'), headers.get('If-Modified-Since'))
+
+        def send():
+            resp = self._send(method, url, event=event, **kwargs)
+            # NOTE: read the streamed body once, for all the callers.
+            resp.content
+            return resp
+
+        return self.single_flight.do(key, send)
+
+    def _send(self, method, url, event=None, **kwargs):
+        """Sends the request, retrying it as allowed by the retry policy.
+
+        Every attempt first waits for the rate limiter if there is one, the
+        time waited being added to the throttle timing of event. Attempts
+        are not sent while the circuit breaker is open, and their outcome
+        is reported to it. An attempt raising any other error than a
+        connection error or a timeout counts as failed too.
+        """
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire(self.climate_url)
+                if event is not None and waited:
+                    event.timings['throttle'] = (
+                        event.timings.get('throttle', 0) + waited)
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.before_request()
+            try:
+                resp = self._send_once(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as e:
+                self._record_outcome(failed=True)
+                if (self.retry_policy is None or
+                        not self.retry_policy.should_retry(
+                            attempt, method, connection_error=True)):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                LOG.debug('Retrying %s %s in %.2fs after error: %s',
+                          method, url, delay, e)
+            except BaseException:
+                # NOTE: the outcome must be recorded whatever happened, or
+                #       a half-open circuit would wait for it forever.
+                self._record_outcome(failed=True)
+                raise
+            else:
+                self._record_outcome(failed=resp.status_code >= 500)
+                if (self.retry_policy is None or
+                        not self.retry_policy.should_retry(
+                            attempt, method, resp.status_code,
+                            resp.headers)):
+                    return resp
+                delay = self.retry_policy.backoff(attempt, resp.headers)
+                LOG.debug('Retrying %s %s in %.2fs after status %s',
+                          method, url, delay, resp.status_code)
+                resp.close()
+            self.retry_policy.sleep(delay)
+            attempt += 1
+
+    def _record_outcome(self, failed):
+        if self.circuit_breaker is None:
+            return
+        if failed:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _send_once(self, method, url, **kwargs):
+        """Sends the request over the shared session if there is one."""
+        kwargs.setdefault('timeout', self.timeout)
+        if self.session is not None:
+            return self.session.request(method, self.climate_url + url,
+                                        **kwargs)
+        return requests.request(method, self.climate_url + url, **kwargs)
+
+    def _prepare_request(self, kwargs):
+        """Adds the Climate specific headers and serializes the body."""
         kwargs.setdefault('headers', kwargs.get('headers', {}))
         kwargs['headers']['User-Agent'] = self.USER_AGENT
         kwargs['headers']['Accept'] = 'application/json'
@@ -116,21 +573,32 @@ class BaseClientManager(object):
             kwargs['headers']['Content-Type'] = 'application/json'
             kwargs['data'] = json.dumps(kwargs['body'])
             del kwargs['body']
+        return kwargs
+
+    def _decode_response(self, status_code, text):
+        """Decodes the response body, raising the error it carries if any.
 
-        resp = requests.request(method, self.climate_url + url, **kwargs)
+        :param status_code: HTTP status code of the response.
+        :type status_code: int
 
+        :param text: Response body.
+        :type text: str
+
+        :returns: Decoded body, None if it is not JSON.
+        :rtype: dict
+        """
         try:
-            body = json.loads(resp.text)
+            body = json.loads(text)
         except ValueError:
             body = None
 
-        if resp.status_code >= 400:
+        if status_code >= 400:
             if body is not None:
                 error_message = body.get('error_message', body)
             else:
-                error_message = resp.text
+                error_message = text
 
             body = _("ERROR: {0}").format(error_message)
-            raise exception.ClimateClientException(body, code=resp.status_code)
+            raise exception.ClimateClientException(body, code=status_code)
 
-        return resp, body
+        return body
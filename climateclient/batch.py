@@ -0,0 +1,143 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import shlex
+import sys
+
+from cliff import command
+import six
+
+from climateclient import exception
+
+
+def parse_line(line):
+    """Returns the arguments of a batch line, None for blank lines.
+
+    A line is either a JSON array of arguments or a command line split as
+    a POSIX shell would do it. Lines starting with # are comments.
+    """
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+    if line.startswith('['):
+        try:
+            args = json.loads(line)
+        except ValueError as e:
+            raise exception.ClimateClientException(
+                'Invalid JSON line: %s' % e)
+        if not all(isinstance(arg, six.string_types) for arg in args):
+            raise exception.ClimateClientException(
+                'JSON lines must be arrays of strings')
+        return args
+    if six.PY2:
+        return [arg.decode('utf-8') for arg in
+                shlex.split(line.encode('utf-8'), comments=True)]
+    return shlex.split(line, comments=True)
+
+
+class _ErrorCollector(logging.Handler):
+    """Collects the errors logged while a command runs."""
+
+    def __init__(self):
+        super(_ErrorCollector, self).__init__(logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+class Batch(command.Command):
+    """Run the commands of a file with a single authenticated session.
+
+    Prints one JSON object per command, with its line number, arguments,
+    exit status, output and error output.
+    """
+
+    log = logging.getLogger(__name__ + '.Batch')
+
+    def get_parser(self, prog_name):
+        parser = super(Batch, self).get_parser(prog_name)
+        parser.add_argument(
+            'file', metavar='FILE',
+            help='File with one command per line, or - for the standard '
+                 'input. A line is a command as typed after "climate", or a '
+                 'JSON array of its arguments')
+        parser.add_argument(
+            '--stop-on-error',
+            action='store_true',
+            default=False,
+            help='Stop at the first command that fails')
+        return parser
+
+    def take_action(self, parsed_args):
+        if parsed_args.file == '-':
+            return self.run_lines(sys.stdin, parsed_args.stop_on_error)
+        with open(parsed_args.file) as f:
+            return self.run_lines(f, parsed_args.stop_on_error)
+
+    def run_lines(self, lines, stop_on_error=False):
+        """Runs every command of lines and reports its results.
+
+        :returns: 0 if all the commands succeeded, 1 otherwise.
+        :rtype: int
+        """
+        failed = False
+        for number, line in enumerate(lines, 1):
+            try:
+                args = parse_line(line)
+            except (exception.ClimateClientException, ValueError) as e:
+                args = None
+                report = {'line': number, 'command': line.strip(),
+                          'status': 2, 'stdout': '', 'stderr': str(e)}
+            else:
+                if args is None:
+                    continue
+                report = self.run_one(number, args)
+            self.app.stdout.write(json.dumps(report) + '\n')
+            self.app.stdout.flush()
+            if report['status'] != 0:
+                failed = True
+                if stop_on_error:
+                    break
+        return 1 if failed else 0
+
+    def run_one(self, number, args):
+        """Runs one command, capturing its output and logged errors."""
+        if args and args[0] == 'batch':
+            return {'line': number, 'command': args, 'status': 2,
+                    'stdout': '', 'stderr': 'Batches cannot be nested'}
+
+        stdout, stderr = self.app.stdout, self.app.stderr
+        self.app.stdout, self.app.stderr = six.StringIO(), six.StringIO()
+        errors = _ErrorCollector()
+        root_logger = logging.getLogger('')
+        root_logger.addHandler(errors)
+        try:
+            status = self.app.run_subcommand(args)
+        except Exception as e:
+            status = 1
+            errors.messages.append(six.text_type(e))
+        finally:
+            root_logger.removeHandler(errors)
+            output = self.app.stdout.getvalue()
+            error_output = self.app.stderr.getvalue()
+            self.app.stdout, self.app.stderr = stdout, stderr
+
+        if errors.messages:
+            error_output += '\n'.join(errors.messages) + '\n'
+        return {'line': number, 'command': args, 'status': status or 0,
+                'stdout': output, 'stderr': error_output}
@@ -0,0 +1,161 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from climateclient import utils
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 128
+# NOTE: Keystone tokens are valid for a day at most by default, cached
+#       responses older than that cannot be requested with their token
+#       anymore.
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+class CachedResponse(object):
+    """Validators and decoded body of a cached GET response."""
+
+    def __init__(self, body, etag=None, last_modified=None):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def to_dict(self):
+        return {'body': self.body, 'etag': self.etag,
+                'last_modified': self.last_modified}
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(values['body'], values.get('etag'),
+                   values.get('last_modified'))
+
+
+class FileCacheBackend(object):
+    """Stores cached responses as files, one per URL and token.
+
+    As tokens expire, the files older than max_age seconds are removed the
+    first time a response is stored by the backend.
+    """
+
+    def __init__(self, path, max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._pruned = False
+
+    def get(self, key):
+        try:
+            with open(self._file(key)) as f:
+                return CachedResponse.from_dict(json.load(f))
+        except (IOError, ValueError, KeyError):
+            return None
+
+    def set(self, key, response):
+        if not self._pruned:
+            self._pruned = True
+            self._prune()
+        try:
+            utils.write_private_file(self._file(key),
+                                     json.dumps(response.to_dict()))
+        except (IOError, OSError) as e:
+            LOG.debug('Unable to write response cache %s: %s', self.path, e)
+
+    def _prune(self):
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return
+        expired = time.time() - self.max_age
+        for name in names:
+            path = os.path.join(self.path, name)
+            try:
+                if os.path.getmtime(path) < expired:
+                    os.remove(path)
+            except OSError as e:
+                LOG.debug('Unable to remove response cache %s: %s', path, e)
+
+    def _file(self, key):
+        return os.path.join(self.path, '%s.json' % key)
+
+
+class ResponseCache(object):
+    """Cache of GET responses revalidated with conditional requests.
+
+    Responses carrying an ETag or Last-Modified header are kept in a
+    bounded in-memory LRU and, if a backend is given, in the backend as
+    well. The next GET of the same URL with the same token is sent with
+    If-None-Match/If-Modified-Since, and the cached body is reused if the
+    server answers 304 Not Modified.
+
+    Cached bodies are copied by BaseClientManager.request before being
+    returned, so that callers may modify them.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, backend=None):
+        self.max_entries = max_entries
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url, auth_token):
+        """Returns the cache key of a URL requested with a token."""
+        scope = '%s|%s' % (auth_token, url)
+        return hashlib.sha1(scope.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            response = self._entries.pop(key, None)
+            if response is not None:
+                self._entries[key] = response
+                return response
+        if self.backend is not None:
+            response = self.backend.get(key)
+            if response is not None:
+                self._store(key, response)
+        return response
+
+    def set(self, key, response):
+        self._store(key, response)
+        if self.backend is not None:
+            self.backend.set(key, response)
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(self._entries)}
+
+    def _store(self, key, response):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = response
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
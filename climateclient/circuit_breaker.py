@@ -0,0 +1,87 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+
+from climateclient import exception
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class CircuitBreaker(object):
+    """Fails requests fast while the reservation service is down.
+
+    The circuit opens after failure_threshold consecutive failures, i.e.
+    connection errors, timeouts or 5xx responses. While it is open,
+    requests raise CircuitOpen without being sent. After reset_timeout
+    seconds it half-opens and lets a single request through: the circuit
+    closes again if it succeeds and reopens if it fails. If the outcome of
+    that trial request is never recorded, another one is let through once
+    it is reset_timeout seconds old.
+
+    A breaker is meant to be shared by everything talking to the same
+    endpoint, e.g. all the requests of a Horizon process.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = None
+        self._trial_started_at = None
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """Raises CircuitOpen unless a request may be sent now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.time()
+            if ((self.state == OPEN and
+                    now - self._opened_at >= self.reset_timeout) or
+                    (self.state == HALF_OPEN and
+                     now - self._trial_started_at >= self.reset_timeout)):
+                LOG.debug('Circuit half-open, trying one request')
+                self.state = HALF_OPEN
+                self._trial_started_at = now
+                return
+        raise exception.CircuitOpen()
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                LOG.debug('Circuit closed')
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if (self.state == HALF_OPEN or
+                    self.failures >= self.failure_threshold):
+                if self.state != OPEN:
+                    LOG.warning('Circuit opened after %d failures',
+                                self.failures)
+                self.state = OPEN
+                self._opened_at = time.time()
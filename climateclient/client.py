@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+
 from climateclient import exception
 from climateclient.openstack.common.gettextutils import _  # noqa
 from climateclient.openstack.common import importutils
@@ -23,6 +25,22 @@ def Client(version=1, *args, **kwargs):
         '1': 'climateclient.v1.client.Client',
         '1a0': 'climateclient.v1.client.Client',
     }
+    return _import_client(version_map, version, *args, **kwargs)
+
+
+def AsyncClient(version=1, *args, **kwargs):
+    """Returns the asyncio client, requires Python 3.6+ and aiohttp."""
+    if sys.version_info < (3, 6):
+        raise exception.ClimateClientException(
+            _("The asyncio client requires Python 3.6 or later"))
+    version_map = {
+        '1': 'climateclient.v1.async_client.Client',
+        '1a0': 'climateclient.v1.async_client.Client',
+    }
+    return _import_client(version_map, version, *args, **kwargs)
+
+
+def _import_client(version_map, version, *args, **kwargs):
     try:
         client_path = version_map[str(version)]
     except (KeyError, ValueError):
@@ -14,7 +14,9 @@
 # limitations under the License.
 
 from __future__ import print_function
+import argparse
 import ast
+import itertools
 import logging
 import six
 
@@ -23,10 +25,23 @@ from cliff.formatters import table
 from cliff import lister
 from cliff import show
 
+from climateclient import base
 from climateclient import exception
 from climateclient import utils
 
 
+def positive_int(value):
+    """argparse type of the options taking a number greater than 0."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            'expected a positive integer, got %s' % value)
+    return number
+
+
 class OpenStackCommand(command.Command):
     """Base class for OpenStack commands."""
 
@@ -79,6 +94,71 @@ class ClimateCommand(OpenStackCommand):
     def get_client(self):
         return self.app.client
 
+    def get_name_index(self):
+        return getattr(self.app, 'name_index', None)
+
+    def get_resource_id(self, name_or_id, fresh=False):
+        """Returns the ID of the resource the user referred to.
+
+        Names are resolved from the name index unless fresh is True, which
+        commands modifying the resource use so that they cannot act on a
+        resource renamed or replaced since the index was built.
+        """
+        if not self.allow_names or utils.is_uuid_like(name_or_id):
+            # NOTE: no lookup is needed for IDs, the request made with the
+            #       ID will fail with a 404 if the resource does not exist.
+            return name_or_id
+        return utils.find_resource_id_by_name_or_id(self.get_client(),
+                                                    self.resource,
+                                                    name_or_id,
+                                                    self.get_name_index(),
+                                                    fresh=fresh)
+
+    def get_resource_ids(self, names_or_ids, fresh=False):
+        """Returns the IDs of several resources the user referred to.
+
+        All the names are resolved from a single listing, see
+        get_resource_id. The result of each name or ID is returned as a
+        BulkResult, failed for names that cannot be resolved so that the
+        other resources can still be processed.
+        """
+        names = [i for i in names_or_ids
+                 if self.allow_names and not utils.is_uuid_like(i)]
+        found = {}
+        if names:
+            found = utils.find_resource_ids_by_names(self.get_client(),
+                                                     self.resource, names,
+                                                     self.get_name_index(),
+                                                     fresh=fresh)
+        results = []
+        for name_or_id in names_or_ids:
+            if name_or_id not in found:
+                results.append(base.BulkResult(name_or_id, result=name_or_id))
+                continue
+            try:
+                res_id = utils.get_unique_resource_id(self.resource,
+                                                      name_or_id,
+                                                      found[name_or_id])
+            except exception.ClimateClientException as e:
+                results.append(base.BulkResult(name_or_id, error=e))
+            else:
+                results.append(base.BulkResult(name_or_id, result=res_id))
+        return results
+
+    def run_many(self, names_or_ids, func, fresh=False):
+        """Resolves names_or_ids then calls func with the resolved IDs.
+
+        :param func: Bulk operation of the resource manager, such as
+                     delete_many, returning one BulkResult per ID.
+
+        :returns: One BulkResult per name or ID, in the order of
+                  names_or_ids.
+        """
+        resolved = self.get_resource_ids(names_or_ids, fresh=fresh)
+        res_ids = [r.result for r in resolved if r.succeeded]
+        processed = iter(func(res_ids) if res_ids else [])
+        return [next(processed) if r.succeeded else r for r in resolved]
+
     def get_parser(self, prog_name):
         parser = super(ClimateCommand, self).get_parser(prog_name)
         return parser
@@ -128,10 +208,13 @@ class CreateCommand(ClimateCommand, show.ShowOne):
         body = self.args2body(parsed_args)
         resource_manager = getattr(climate_client, self.resource)
         data = resource_manager.create(**body)
+        name_index = self.get_name_index()
+        if name_index is not None and data and 'name' in data:
+            name_index.add(self.resource, data['name'], data['id'])
         self.format_output_data(data)
 
         if data:
-            print(self.app.stdout, 'Created a new %s:' % self.resource)
+            print('Created a new %s:' % self.resource, file=self.app.stdout)
         else:
             data = {'': ''}
         return zip(*sorted(six.iteritems(data)))
@@ -161,16 +244,15 @@ class UpdateCommand(ClimateCommand):
         self.log.debug('run(%s)' % parsed_args)
         climate_client = self.get_client()
         body = self.args2body(parsed_args)
-        if self.allow_names:
-            res_id = utils.find_resource_id_by_name_or_id(climate_client,
-                                                          self.resource,
-                                                          parsed_args.id)
-        else:
-            res_id = parsed_args.id
+        res_id = self.get_resource_id(parsed_args.id, fresh=True)
         resource_manager = getattr(climate_client, self.resource)
         resource_manager.update(res_id, **body)
-        print(self.app.stdout, 'Updated %s: %s' % (self.resource,
-                                                   parsed_args.id))
+        name_index = self.get_name_index()
+        if name_index is not None and body.get('name'):
+            name_index.discard(self.resource, res_id)
+            name_index.add(self.resource, body['name'], res_id)
+        print('Updated %s: %s' % (self.resource, parsed_args.id),
+              file=self.app.stdout)
         return
 
 
@@ -188,7 +270,7 @@ class DeleteCommand(ClimateCommand):
         else:
             help_str = 'ID of %s to delete'
         parser.add_argument(
-            'id', metavar=self.resource.upper(),
+            'id', metavar=self.resource.upper(), nargs='+',
             help=help_str % self.resource)
         return parser
 
@@ -196,16 +278,31 @@ class DeleteCommand(ClimateCommand):
         self.log.debug('run(%s)' % parsed_args)
         climate_client = self.get_client()
         resource_manager = getattr(climate_client, self.resource)
-        if self.allow_names:
-            res_id = utils.find_resource_id_by_name_or_id(climate_client,
-                                                          self.resource,
-                                                          parsed_args.id)
-        else:
-            res_id = parsed_args.id
-        resource_manager.delete(res_id)
-        print(self.app.stdout, 'Deleted %s: %s' % (self.resource,
-                                                   parsed_args.id))
-        return
+        name_index = self.get_name_index()
+        if len(parsed_args.id) == 1:
+            res_id = self.get_resource_id(parsed_args.id[0], fresh=True)
+            resource_manager.delete(res_id)
+            if name_index is not None:
+                name_index.discard(self.resource, res_id)
+            print('Deleted %s: %s' % (self.resource, parsed_args.id[0]),
+                  file=self.app.stdout)
+            return
+
+        failed = False
+        results = self.run_many(parsed_args.id, resource_manager.delete_many,
+                                fresh=True)
+        for name_or_id, result in zip(parsed_args.id, results):
+            if result.succeeded:
+                if name_index is not None:
+                    name_index.discard(self.resource, result.id)
+                print('Deleted %s: %s' % (self.resource, name_or_id),
+                      file=self.app.stdout)
+            else:
+                failed = True
+                print('Unable to delete %s %s: %s' %
+                      (self.resource, name_or_id, result.error),
+                      file=self.app.stderr)
+        return 1 if failed else 0
 
 
 class ListCommand(ClimateCommand, lister.Lister):
@@ -217,31 +314,75 @@ class ListCommand(ClimateCommand, lister.Lister):
     _formatters = {}
     list_columns = []
     unknown_parts_flag = True
+    # NOTE: column the resources are sorted by unless --sort-by or --stream
+    #       is given.
+    default_sort_by = None
 
     def args2body(self, parsed_args):
         params = {}
-        if parsed_args.sort_by:
+        if getattr(parsed_args, 'sort_by', None):
             if parsed_args.sort_by in self.list_columns:
-                params['sort_by'] = parsed_args.sort_by
+                params['sort_key'] = parsed_args.sort_by
             else:
                 msg = 'Invalid sort option %s' % parsed_args.sort_by
                 raise exception.ClimateClientException(msg)
+        if getattr(parsed_args, 'limit', None) is not None:
+            params['limit'] = parsed_args.limit
+        if getattr(parsed_args, 'marker', None):
+            params['marker'] = parsed_args.marker
         return params
 
     def get_parser(self, prog_name):
         parser = super(ListCommand, self).get_parser(prog_name)
+        parser.add_argument(
+            '--stream',
+            action='store_true',
+            default=False,
+            help='Output all the %ss as they are received instead of '
+                 'downloading the whole list first. Cannot be combined '
+                 'with sorting, pagination or filtering options'
+                 % self.resource)
+        parser.add_argument(
+            '--limit', metavar='<integer>',
+            type=positive_int,
+            help='Maximum number of %ss to list' % self.resource)
+        parser.add_argument(
+            '--marker', metavar='<%s_id>' % self.resource,
+            help='List the %ss after the one with this ID' % self.resource)
+        parser.add_argument(
+            '--page-size', metavar='<integer>',
+            type=positive_int,
+            help='Fetch the %ss in pages of this size and output them as '
+                 'they are received' % self.resource)
         return parser
 
     def retrieve_list(self, parsed_args):
         """Retrieve a list of resources from Climate server"""
         climate_client = self.get_client()
-        body = self.args2body(parsed_args)
         resource_manager = getattr(climate_client, self.resource)
+        body = self.args2body(parsed_args)
+        if getattr(parsed_args, 'stream', False):
+            if body or getattr(parsed_args, 'page_size', None):
+                raise exception.ClimateClientException(
+                    '--stream cannot be combined with sorting, pagination '
+                    'or filtering options')
+            return resource_manager.iter_list()
+        if self.default_sort_by:
+            body.setdefault('sort_key', self.default_sort_by)
+        if getattr(parsed_args, 'page_size', None):
+            return resource_manager.paginate(page_size=parsed_args.page_size,
+                                             **body)
         data = resource_manager.list(**body)
         return data
 
     def setup_columns(self, info, parsed_args):
-        columns = len(info) > 0 and sorted(info[0].keys()) or []
+        # NOTE: info may be a generator, only its first item is looked at
+        #       to find out the columns.
+        info = iter(info)
+        first = next(info, None)
+        if first is not None:
+            info = itertools.chain([first], info)
+        columns = first is not None and sorted(first.keys()) or []
         if not columns:
             parsed_args.columns = []
         elif parsed_args.columns:
@@ -273,22 +414,40 @@ class ShowCommand(ClimateCommand, show.ShowOne):
             help_str = 'ID or name of %s to look up'
         else:
             help_str = 'ID of %s to look up'
-        parser.add_argument('id', metavar=self.resource.upper(),
+        parser.add_argument('id', metavar=self.resource.upper(), nargs='+',
                             help=help_str % self.resource)
         return parser
 
+    def run(self, parsed_args):
+        if len(parsed_args.id) == 1:
+            return super(ShowCommand, self).run(parsed_args)
+
+        # NOTE: the resources are fetched concurrently, then displayed one
+        #       after the other as ShowOne only knows about one resource.
+        self.log.debug('run(%s)' % parsed_args)
+        climate_client = self.get_client()
+        resource_manager = getattr(climate_client, self.resource)
+        failed = False
+        results = self.run_many(parsed_args.id, resource_manager.get_many)
+        for name_or_id, result in zip(parsed_args.id, results):
+            if result.succeeded:
+                self.produce_output(parsed_args,
+                                    *self._format_resource(result.result))
+            else:
+                failed = True
+                print('Unable to show %s %s: %s' %
+                      (self.resource, name_or_id, result.error),
+                      file=self.app.stderr)
+        return 1 if failed else 0
+
     def get_data(self, parsed_args):
         self.log.debug('get_data(%s)' % parsed_args)
         climate_client = self.get_client()
-
-        if self.allow_names:
-            res_id = utils.find_resource_id_by_name_or_id(climate_client,
-                                                          self.resource,
-                                                          parsed_args.id)
-        else:
-            res_id = parsed_args.id
-
+        res_id = self.get_resource_id(parsed_args.id[0])
         resource_manager = getattr(climate_client, self.resource)
         data = resource_manager.get(res_id)
+        return self._format_resource(data)
+
+    def _format_resource(self, data):
         self.format_output_data(data)
         return zip(*sorted(six.iteritems(data)))
@@ -76,3 +76,10 @@ class IncorrectLease(ClimateClientException):
     """Occurs if lease parameters are incorrect."""
     message = _("The lease parameters are incorrect.")
     code = 409
+
+
+class CircuitOpen(ClimateClientException):
+    """Occurs if requests are suspended after repeated server failures."""
+    message = _("The reservation service keeps failing, requests to it are "
+                "suspended for a while.")
+    code = 503
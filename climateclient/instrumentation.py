@@ -0,0 +1,221 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Hooks observing the requests sent to the reservation API.
+
+A hook is any object with some of the pre_request, post_response and
+on_error methods, each called with the RequestEvent of a request. Hooks are
+given to the client with its hooks argument, and this module provides
+collectors for a Prometheus text dump, statsd and the --timing option of
+the shell.
+"""
+
+import collections
+import logging
+import socket
+import threading
+import time
+
+LOG = logging.getLogger(__name__)
+
+# NOTE: phases of a request, in order. throttle is the time waited for the
+#       rate limiter. connect is included in ttfb as requests does not
+#       report DNS resolution and connection times.
+PHASES = ('throttle', 'ttfb', 'download', 'decode')
+
+
+def url_template(url):
+    """Returns the URL with resource IDs replaced by {id}.
+
+    Paths of the reservation API alternate collections and IDs, e.g.
+    /leases/<lease_id>, so every second path segment is an ID. The query
+    string is dropped.
+    """
+    path = url.split('?', 1)[0]
+    segments = path.split('/')
+    for index in range(2, len(segments), 2):
+        if segments[index]:
+            segments[index] = '{id}'
+    return '/'.join(segments)
+
+
+class RequestEvent(object):
+    """What is known about a request at the time a hook is called.
+
+    timings maps the phases of PHASES and total to durations in seconds.
+    """
+
+    def __init__(self, method, url):
+        self.method = method
+        self.url = url
+        self.url_template = url_template(url)
+        self.status = None
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.timings = {}
+        self.error = None
+        self.started_at = time.time()
+
+    def __repr__(self):
+        return '<RequestEvent %s %s: %s>' % (self.method, self.url,
+                                             self.status)
+
+
+def notify(hooks, name, event):
+    """Calls the name method of every hook having it.
+
+    A failing hook is logged and does not fail the request.
+    """
+    for hook in hooks or ():
+        method = getattr(hook, name, None)
+        if method is None:
+            continue
+        try:
+            method(event)
+        except Exception:
+            LOG.exception('Instrumentation hook %r failed', hook)
+
+
+class PrometheusCollector(object):
+    """Aggregates requests into metrics dumped in the Prometheus format."""
+
+    def __init__(self, prefix='climateclient'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._requests = collections.defaultdict(int)
+        self._bytes = collections.defaultdict(int)
+        self._seconds = collections.defaultdict(float)
+        self._phases = collections.defaultdict(float)
+
+    def post_response(self, event):
+        self._record(event)
+
+    def on_error(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        status = str(event.status or 'error')
+        with self._lock:
+            self._requests[(event.method, event.url_template, status)] += 1
+            self._bytes[(event.method, event.url_template)] += (
+                event.response_bytes)
+            self._seconds[(event.method, event.url_template)] += (
+                event.timings.get('total', 0))
+            for phase in PHASES:
+                if phase in event.timings:
+                    self._phases[(event.method, event.url_template,
+                                  phase)] += event.timings[phase]
+
+    def dump(self):
+        """Returns the metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            self._dump_metric(
+                lines, 'requests_total', 'counter',
+                'Requests sent to the reservation API.',
+                ('method', 'url', 'status'), self._requests)
+            self._dump_metric(
+                lines, 'response_bytes_total', 'counter',
+                'Bytes received from the reservation API.',
+                ('method', 'url'), self._bytes)
+            self._dump_metric(
+                lines, 'request_seconds_total', 'counter',
+                'Time spent in requests to the reservation API.',
+                ('method', 'url'), self._seconds)
+            self._dump_metric(
+                lines, 'request_phase_seconds_total', 'counter',
+                'Time spent in each phase of the requests.',
+                ('method', 'url', 'phase'), self._phases)
+        return '\n'.join(lines) + '\n'
+
+    def _dump_metric(self, lines, name, metric_type, description,
+                     label_names, values):
+        name = '%s_%s' % (self.prefix, name)
+        lines.append('# HELP %s %s' % (name, description))
+        lines.append('# TYPE %s %s' % (name, metric_type))
+        for labels, value in sorted(values.items()):
+            label_text = ','.join(
+                '%s="%s"' % (label_name, str(label).replace('"', '\\"'))
+                for label_name, label in zip(label_names, labels))
+            lines.append('%s{%s} %s' % (name, label_text, value))
+
+
+class StatsdCollector(object):
+    """Sends request counters and timers to statsd over UDP.
+
+    Metric names are <prefix>.<method>.<url>.<metric>, the URL template
+    being turned into a dotted name, e.g. climateclient.GET.leases.id.ttfb.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8125, prefix='climateclient'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def post_response(self, event):
+        self._send(event, str(event.status))
+
+    def on_error(self, event):
+        self._send(event, str(event.status or 'error'))
+
+    def _send(self, event, status):
+        name = '%s.%s.%s' % (self.prefix, event.method,
+                             self._dotted(event.url_template))
+        metrics = ['%s.status.%s:1|c' % (name, status),
+                   '%s.bytes:%d|c' % (name, event.response_bytes)]
+        for phase, seconds in sorted(event.timings.items()):
+            metrics.append('%s.%s:%d|ms' % (name, phase, seconds * 1000))
+        try:
+            self._socket.sendto('\n'.join(metrics).encode('utf-8'),
+                                self.address)
+        except socket.error as e:
+            LOG.debug('Unable to send metrics to statsd: %s', e)
+
+    @staticmethod
+    def _dotted(template):
+        return '.'.join(segment.strip('{}') for segment in
+                        template.split('/') if segment) or 'root'
+
+
+class TimingCollector(object):
+    """Records the requests of a shell command for the --timing option."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings = []
+
+    def post_response(self, event):
+        self._record(event)
+
+    def on_error(self, event):
+        self._record(event)
+
+    def _record(self, event):
+        with self._lock:
+            self.timings.append(('%s %s' % (event.method, event.url),
+                                 event.status,
+                                 event.timings.get('total', 0)))
+
+    def format(self):
+        """Returns the recorded requests as a table."""
+        width = max([len('Request')] + [len(t[0]) for t in self.timings])
+        lines = ['%s  Status  Seconds' % 'Request'.ljust(width)]
+        total = 0
+        for request, status, seconds in self.timings:
+            total += seconds
+            lines.append('%s  %6s  %7.3f' % (request.ljust(width),
+                                             status or '-', seconds))
+        lines.append('%s  %6s  %7.3f' % ('Total'.ljust(width), '', total))
+        return '\n'.join(lines)
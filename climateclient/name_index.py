@@ -0,0 +1,173 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import threading
+import time
+
+from climateclient import utils
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+
+
+class NameIndex(object):
+    """TTL-bounded name to ID index of Climate resources.
+
+    The index of a resource type is built from one ``list()`` call and is
+    then used to resolve names without listing again until it expires. A
+    name missing from the index triggers a refresh, and created or deleted
+    resources can be recorded with ``add``/``discard`` so the index stays
+    current without a new listing.
+
+    Names are resolved from a possibly stale index: resources renamed,
+    deleted or created by others since the index was built are not seen.
+    Commands acting on the resource resolve names with fresh=True.
+
+    If ``path`` is set, the index is also persisted to that file so that it
+    survives between CLI invocations.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, path=None):
+        self.ttl = ttl
+        self.path = path
+        self._lock = threading.Lock()
+        self._resources = None
+
+    def resolve(self, client, resource, name, fresh=False):
+        """Returns the ID of the resource with the given name.
+
+        :param client: Climate client used to list the resources.
+        :param resource: Type of resource (lease, host).
+        :type resource: str
+        :param name: Name of the resource.
+        :type name: str
+        :param fresh: Whether to list the resources again instead of using
+                      the index, e.g. before modifying the resource.
+        :type fresh: bool
+
+        :returns: ID of the resource.
+        :rtype: str
+        """
+        ids = self.lookup(client, resource, [name], fresh=fresh)[name]
+        return utils.get_unique_resource_id(resource, name, ids)
+
+    def lookup(self, client, resource, names, fresh=False):
+        """Returns the IDs of the resources with the given names.
+
+        The resources are listed at most once, if fresh is True or if one
+        of the names is missing from the index.
+
+        :param client: Climate client used to list the resources.
+        :param resource: Type of resource (lease, host).
+        :type resource: str
+        :param names: Names of the resources.
+        :type names: list
+        :param fresh: Whether to list the resources again instead of using
+                      the index.
+        :type fresh: bool
+
+        :returns: IDs of the resources having each name.
+        :rtype: dict
+        """
+        with self._lock:
+            found = {}
+            if not fresh:
+                found = dict((name, self._lookup(resource, name))
+                             for name in names)
+            if not all(found.get(name) for name in names):
+                listed = self._refresh(client, resource)
+                found = dict((name, listed.get(name, [])) for name in names)
+        return found
+
+    def add(self, resource, name, resource_id):
+        """Records a resource created after the index was built."""
+        with self._lock:
+            entry = self._entry(resource)
+            if entry is None:
+                return
+            ids = entry['names'].setdefault(name, [])
+            if resource_id not in ids:
+                ids.append(resource_id)
+            self._save()
+
+    def discard(self, resource, resource_id):
+        """Forgets a resource deleted after the index was built."""
+        with self._lock:
+            entry = self._entry(resource)
+            if entry is None:
+                return
+            for name, ids in list(entry['names'].items()):
+                if resource_id in ids:
+                    ids.remove(resource_id)
+                    if not ids:
+                        del entry['names'][name]
+            self._save()
+
+    def invalidate(self, resource=None):
+        """Drops the index of one or all resource types."""
+        with self._lock:
+            self._load()
+            if resource is None:
+                self._resources.clear()
+            else:
+                self._resources.pop(resource, None)
+            self._save()
+
+    def _lookup(self, resource, name):
+        entry = self._entry(resource)
+        if entry is None:
+            return []
+        return entry['names'].get(name, [])
+
+    def _entry(self, resource):
+        self._load()
+        entry = self._resources.get(resource)
+        if entry is None or time.time() - entry['updated_at'] > self.ttl:
+            return None
+        return entry
+
+    def _refresh(self, client, resource):
+        self._load()
+        names = {}
+        for res in getattr(client, resource).list():
+            names.setdefault(res['name'], []).append(res['id'])
+        self._resources[resource] = {'updated_at': time.time(),
+                                     'names': names}
+        self._save()
+        return names
+
+    def _load(self):
+        if self._resources is not None:
+            return
+        self._resources = {}
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self._resources = json.load(f)
+        except (IOError, ValueError) as e:
+            LOG.debug('Ignoring unreadable name index %s: %s', self.path, e)
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            utils.write_private_file(self.path, json.dumps(self._resources))
+        except (IOError, OSError) as e:
+            LOG.debug('Unable to write name index %s: %s', self.path, e)
@@ -0,0 +1,163 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from six.moves.urllib import parse
+
+from climateclient import utils
+
+LOG = logging.getLogger(__name__)
+
+
+class TokenBucket(object):
+    """Token bucket letting rate requests per second through on average.
+
+    Up to burst requests can go through at once after a quiet period.
+    Requests beyond that reserve a token in advance and wait for it, so
+    that waiting requests are let through in turn at the given rate.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes a token, returns the seconds to wait before using it."""
+        with self._lock:
+            self._tokens, self._updated_at, wait = _take(
+                self._tokens, self._updated_at, self.rate, self.burst)
+        return wait
+
+
+class FileTokenBucket(object):
+    """Token bucket whose state is shared by processes through a file.
+
+    The state is read and updated under an inter-process lock, so that the
+    rate applies to all the processes using the same file, e.g. the climate
+    commands run concurrently by a cron job.
+    """
+
+    def __init__(self, path, rate, burst):
+        self.path = path
+        self.rate = float(rate)
+        self.burst = burst
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes a token, returns the seconds to wait before using it."""
+        with self._lock:
+            with utils.inter_process_lock(self.path):
+                tokens, updated_at = self._load()
+                tokens, updated_at, wait = _take(tokens, updated_at,
+                                                 self.rate, self.burst)
+                self._save(tokens, updated_at)
+        return wait
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            return float(state['tokens']), float(state['updated_at'])
+        except (IOError, ValueError, KeyError, TypeError):
+            return float(self.burst), time.time()
+
+    def _save(self, tokens, updated_at):
+        try:
+            utils.write_private_file(self.path, json.dumps(
+                {'tokens': tokens, 'updated_at': updated_at}))
+        except (IOError, OSError) as e:
+            LOG.debug('Unable to write rate limiter state %s: %s',
+                      self.path, e)
+
+
+def _take(tokens, updated_at, rate, burst):
+    """Refills the bucket and takes a token from it.
+
+    :returns: New number of tokens, which is negative if tokens are
+              reserved, new update time and seconds to wait for the token.
+    :rtype: tuple
+    """
+    now = time.time()
+    tokens = min(burst, tokens + (now - updated_at) * rate)
+    tokens -= 1
+    wait = -tokens / rate if tokens < 0 else 0
+    return tokens, now, wait
+
+
+class RateLimiter(object):
+    """Client-side limit of the request rate to each endpoint.
+
+    Every endpoint (scheme, host and port) gets its own bucket of rate
+    requests per second with bursts of burst requests. A limiter is meant
+    to be shared by all the managers and clients of a process. If path is
+    set, buckets are kept in files of that directory and shared by all the
+    processes using it.
+    """
+
+    def __init__(self, rate, burst=1, path=None):
+        self.rate = rate
+        self.burst = burst
+        self.path = path
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, url):
+        """Takes a token for the endpoint of url.
+
+        :returns: Seconds to wait before sending the request.
+        :rtype: float
+        """
+        return self._bucket(url).reserve()
+
+    def acquire(self, url):
+        """Waits until a request can be sent to the endpoint of url.
+
+        :returns: Seconds waited.
+        :rtype: float
+        """
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _bucket(self, url):
+        parts = parse.urlparse(url)
+        endpoint = '%s://%s' % (parts.scheme, parts.netloc)
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                if self.path:
+                    try:
+                        os.makedirs(self.path, 0o700)
+                    except OSError:
+                        if not os.path.isdir(self.path):
+                            raise
+                    name = hashlib.sha1(endpoint.encode('utf-8')).hexdigest()
+                    bucket = FileTokenBucket(
+                        os.path.join(self.path, '%s.json' % name),
+                        self.rate, self.burst)
+                else:
+                    bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[endpoint] = bucket
+        return bucket
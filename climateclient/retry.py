@@ -0,0 +1,119 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from email import utils as email_utils
+import logging
+import random
+import time
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 30
+DEFAULT_RETRY_STATUSES = (502, 503, 504)
+DEFAULT_METHODS = ('GET', 'DELETE', 'PUT')
+
+
+def parse_retry_after(value):
+    """Returns the seconds to wait from a Retry-After header, or None.
+
+    The header holds either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    date = email_utils.parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0, email_utils.mktime_tz(date) - time.time())
+
+
+class RetryPolicy(object):
+    """When and after how long failed requests are sent again.
+
+    A request is retried if its method is one of methods and it failed with
+    a connection error, a status of retry_statuses, or a 409 Conflict
+    carrying a Retry-After header, which the server sends when it is busy
+    rather than when the request conflicts with the resource state.
+
+    The n-th retry waits a random time up to backoff_factor * 2 ** (n - 1)
+    seconds, capped to max_backoff, or longer if the server asked so with
+    Retry-After. At most max_attempts attempts are made in total.
+
+    A policy holds no per-request state and can be shared between threads
+    and clients.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR,
+                 max_backoff=DEFAULT_MAX_BACKOFF, jitter=True,
+                 retry_statuses=DEFAULT_RETRY_STATUSES,
+                 methods=DEFAULT_METHODS, honor_retry_after=True):
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.honor_retry_after = honor_retry_after
+
+    def should_retry(self, attempt, method, status=None, headers=None,
+                     connection_error=False):
+        """Tells whether a failed attempt should be followed by another.
+
+        :param attempt: Number of the failed attempt, starting from 1.
+        :type attempt: int
+
+        :param method: HTTP method of the request.
+        :type method: str
+
+        :param status: Status of the response, None if there is none.
+        :type status: int
+
+        :param headers: Headers of the response.
+        :type headers: dict
+
+        :param connection_error: Whether the request failed to be sent or
+                                 to get a response.
+        :type connection_error: bool
+
+        :rtype: bool
+        """
+        if attempt >= self.max_attempts or method.upper() not in self.methods:
+            return False
+        if connection_error:
+            return True
+        if status in self.retry_statuses:
+            return True
+        return status == 409 and bool((headers or {}).get('Retry-After'))
+
+    def backoff(self, attempt, headers=None):
+        """Returns the seconds to wait before the attempt after attempt."""
+        delay = min(self.max_backoff,
+                    self.backoff_factor * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.honor_retry_after and headers:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
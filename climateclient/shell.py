@@ -19,34 +19,41 @@ Command-line interface to the Climate APIs
 
 from __future__ import print_function
 import argparse
+import hashlib
 import logging
 import os
+import six
 import sys
 
 from cliff import app
 from cliff import commandmanager
-from keystoneclient import exceptions as keystone_exceptions
-import keystoneclient.v2_0 as keystone_client
 
+from climateclient import cache
 from climateclient import client as climate_client
 from climateclient import exception
+from climateclient import instrumentation
+from climateclient import name_index
+from climateclient.openstack.common import importutils
 from climateclient.openstack.common import strutils
+from climateclient import ratelimit
+from climateclient import retry
+from climateclient import token_cache
 from climateclient import utils
-from climateclient.v1.shell_commands import hosts
-from climateclient.v1.shell_commands import leases
-from climateclient import version as base_version
 
+# NOTE: commands are registered by path and only imported when they are run,
+#       so that the CLI starts quickly.
 COMMANDS_V1 = {
-    'lease-list': leases.ListLeases,
-    'lease-show': leases.ShowLease,
-    'lease-create': leases.CreateLease,
-    'lease-update': leases.UpdateLease,
-    'lease-delete': leases.DeleteLease,
-    'host-list': hosts.ListHosts,
-    'host-show': hosts.ShowHost,
-    'host-create': hosts.CreateHost,
-    'host-update': hosts.UpdateHost,
-    'host-delete': hosts.DeleteHost
+    'lease-list': 'climateclient.v1.shell_commands.leases.ListLeases',
+    'lease-show': 'climateclient.v1.shell_commands.leases.ShowLease',
+    'lease-create': 'climateclient.v1.shell_commands.leases.CreateLease',
+    'lease-update': 'climateclient.v1.shell_commands.leases.UpdateLease',
+    'lease-delete': 'climateclient.v1.shell_commands.leases.DeleteLease',
+    'host-list': 'climateclient.v1.shell_commands.hosts.ListHosts',
+    'host-show': 'climateclient.v1.shell_commands.hosts.ShowHost',
+    'host-create': 'climateclient.v1.shell_commands.hosts.CreateHost',
+    'host-update': 'climateclient.v1.shell_commands.hosts.UpdateHost',
+    'host-delete': 'climateclient.v1.shell_commands.hosts.DeleteHost',
+    'batch': 'climateclient.batch.Batch'
 }
 
 VERSION = 1
@@ -81,6 +88,47 @@ def env(*_vars, **kwargs):
     return kwargs.get('default', '')
 
 
+def command_module_file(module_name):
+    """Returns the source file of a climateclient module, not importing it."""
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    parts = module_name.split('.')[1:]
+    return os.path.join(package_dir, *parts) + '.py'
+
+
+class LazyEntryPoint(object):
+    """Entry point of a command class imported on first load."""
+
+    def __init__(self, name, command_path):
+        self.name = name
+        self.command_path = command_path
+
+    def load(self):
+        return importutils.import_class(self.command_path)
+
+    @property
+    def value(self):
+        return self.command_path
+
+
+class CommandManager(commandmanager.CommandManager):
+    """Command manager accepting command classes given by path."""
+
+    def add_command(self, name, command_class):
+        if isinstance(command_class, six.string_types):
+            self.commands[name] = LazyEntryPoint(name, command_class)
+        else:
+            super(CommandManager, self).add_command(name, command_class)
+
+
+class VersionAction(argparse.Action):
+    """Prints the package version, only looked up when asked for."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from climateclient import version as base_version
+
+        parser.exit(message='%s\n' % base_version.__version__)
+
+
 class HelpAction(argparse.Action):
     """Provide a custom action so the -h and --help options
     to the main app will print a list of the commands.
@@ -116,7 +164,7 @@ class ClimateShell(app.App):
         super(ClimateShell, self).__init__(
             description=__doc__.strip(),
             version=VERSION,
-            command_manager=commandmanager.CommandManager('climate.cli'), )
+            command_manager=CommandManager('climate.cli'), )
         self.commands = COMMANDS
 
     def build_option_parser(self, description, version, argparse_kwargs=None):
@@ -130,8 +178,9 @@ class ClimateShell(app.App):
             add_help=False)
         parser.add_argument(
             '--version',
-            action='version',
-            version=base_version.__version__)
+            action=VersionAction,
+            nargs=0,
+            help="show program's version number and exit")
         parser.add_argument(
             '-v', '--verbose',
             action='count',
@@ -252,11 +301,94 @@ class ClimateShell(app.App):
                  "SSL (https) requests. The server's certificate will "
                  "not be verified against any certificate authorities. "
                  "This option should be used with caution.")
+        parser.add_argument(
+            '--name-cache-ttl',
+            metavar='<seconds>',
+            type=int,
+            default=env('CLIMATECLIENT_NAME_CACHE_TTL', default=0),
+            help="Time in seconds during which resource names are resolved "
+                 "from a local cache instead of listing all the resources, "
+                 "e.g. %s. Commands updating or deleting resources always "
+                 "list them. Defaults to env[CLIMATECLIENT_NAME_CACHE_TTL] "
+                 "or 0, which disables the cache." % name_index.DEFAULT_TTL)
+        parser.add_argument(
+            '--http-cache',
+            action='store_true',
+            default=strutils.bool_from_string(
+                env('CLIMATECLIENT_HTTP_CACHE', default=False)),
+            help="Keep listed and shown resources in a local cache and only "
+                 "download them again if they changed on the server. "
+                 "Defaults to env[CLIMATECLIENT_HTTP_CACHE].")
+        parser.add_argument(
+            '--retries',
+            metavar='<count>',
+            type=int,
+            default=env('CLIMATECLIENT_RETRIES', default=0),
+            help="Number of times GET, PUT and DELETE requests are retried "
+                 "after a connection error or a 502, 503 or 504 response, "
+                 "with an exponential backoff. Defaults to "
+                 "env[CLIMATECLIENT_RETRIES] or 0.")
+        parser.add_argument(
+            '--rate-limit',
+            metavar='<requests/s>',
+            type=float,
+            default=env('CLIMATECLIENT_RATE_LIMIT', default=0),
+            help="Maximum rate of requests to the reservation API, shared "
+                 "by all the climate commands of the user running at the "
+                 "same time. 0 disables the limit. Defaults to "
+                 "env[CLIMATECLIENT_RATE_LIMIT] or 0.")
+        parser.add_argument(
+            '--timeout',
+            metavar='<seconds>',
+            type=float,
+            default=env('CLIMATECLIENT_TIMEOUT', default=None),
+            help="Seconds to wait for a connection to the reservation API "
+                 "and for each read from it, 0 to wait forever. Defaults to "
+                 "env[CLIMATECLIENT_TIMEOUT] or 10 to connect and 60 to "
+                 "read.")
+        parser.add_argument(
+            '--timing',
+            action='store_true',
+            default=False,
+            help="Print the time taken by each request to the reservation "
+                 "API after the command output.")
+        parser.add_argument(
+            '--no-token-cache',
+            action='store_false',
+            dest='token_cache',
+            default=not strutils.bool_from_string(
+                env('CLIMATECLIENT_NO_TOKEN_CACHE', default=False)),
+            help="Authenticate with Keystone on every invocation instead of "
+                 "reusing the token and endpoint cached by the previous "
+                 "ones. Defaults to env[CLIMATECLIENT_NO_TOKEN_CACHE].")
 
         return parser
 
     def _bash_completion(self):
-        """Prints all of the commands and options for bash-completion."""
+        """Prints all of the commands and options for bash-completion.
+
+        Building the parser of every command is slow, so the words are
+        computed once and kept in a cache file. The file is keyed by the
+        command set and by the sources defining the commands and options,
+        which change when the client is upgraded.
+        """
+        path = self._completion_cache_path()
+        try:
+            with open(path) as f:
+                print(f.read())
+            return
+        except IOError:
+            pass
+
+        words = self._completion_words()
+        print(words)
+        try:
+            utils.write_private_file(path, words)
+        except (IOError, OSError) as e:
+            self.log.debug('Unable to write completion cache %s: %s',
+                           path, e)
+
+    def _completion_words(self):
         commands = set()
         options = set()
 
@@ -271,7 +403,29 @@ class ClimateShell(app.App):
             for option, _action in cmd_parser._option_string_actions.items():
                 options.add(option)
 
-        print(' '.join(commands | options))
+        return ' '.join(sorted(commands | options))
+
+    def _completion_cache_path(self):
+        """Returns the completion cache file of the current command set."""
+        sources = [__file__, command_module_file('climateclient.command'),
+                   app.__file__]
+        scope = []
+        for command_name, command in sorted(self.command_manager):
+            command_path = getattr(command, 'command_path', '')
+            scope.append('%s=%s' % (command_name, command_path))
+            if command_path:
+                sources.append(command_module_file(
+                    command_path.rpartition('.')[0]))
+        for source in sorted(set(sources)):
+            try:
+                stat = os.stat(source)
+                scope.append('%s:%d:%d' % (source, stat.st_mtime,
+                                           stat.st_size))
+            except OSError:
+                scope.append(source)
+        digest = hashlib.sha1('|'.join(scope).encode('utf-8')).hexdigest()
+        return os.path.join(utils.get_cache_dir(),
+                            'completion-%s.txt' % digest)
 
     def run(self, argv):
         """Equivalent to the main program for the application.
@@ -332,6 +486,8 @@ class ClimateShell(app.App):
             result = self.interact()
         else:
             result = self.run_subcommand(remainder)
+        if getattr(self, 'timing', None) is not None:
+            print(self.timing.format(), file=self.stderr)
         return result
 
     def run_subcommand(self, argv):
@@ -344,7 +500,16 @@ class ClimateShell(app.App):
             full_name = (cmd_name if self.interactive_mode else
                          ' '.join([self.NAME, cmd_name]))
             cmd_parser = cmd.get_parser(full_name)
-            return run_command(cmd, cmd_parser, sub_argv)
+            try:
+                return run_command(cmd, cmd_parser, sub_argv)
+            except exception.ClimateClientException as e:
+                # NOTE: a cached token may have been revoked, authenticate
+                #       again and retry once.
+                if (not getattr(self, 'cached_token', False) or
+                        e.kwargs.get('code') != 401):
+                    raise
+                self.authenticate_user(use_token_cache=False)
+                return run_command(cmd, cmd_parser, sub_argv)
         except Exception as err:
             if self.options.debug:
                 self.log.exception(unicode(err))
@@ -369,9 +534,12 @@ class ClimateShell(app.App):
                         self.log.error('Could not clean up: %s', unicode(err3))
         return result
 
-    def authenticate_user(self):
+    def authenticate_user(self, use_token_cache=True):
         """Make sure the user has provided all of the authentication
         info we need.
+
+        The token is taken from the token cache unless use_token_cache is
+        False, in which case the cached one is dropped.
         """
         if not self.options.os_token:
             if not self.options.os_username:
@@ -396,6 +564,95 @@ class ClimateShell(app.App):
                     "You must provide an auth url via"
                     " either --os-auth-url or via env[OS_AUTH_URL]")
 
+        self.token_cache = None
+        self.token_cache_key = None
+        if self.options.token_cache and not self.options.os_token:
+            self.token_cache = token_cache.TokenCache(
+                os.path.join(utils.get_cache_dir(), 'tokens.json'))
+            self.token_cache_key = token_cache.TokenCache.key(
+                self.options.os_auth_url, self.options.os_username,
+                self.options.os_tenant_id, self.options.os_tenant_name,
+                self.options.os_region_name)
+
+        self.cached_token = False
+        if self.token_cache is None:
+            auth_token, climate_url, expires = self._keystone_authenticate()
+        else:
+            # NOTE: concurrent invocations wait for the first one to
+            #       authenticate and then reuse its token.
+            with self.token_cache.lock():
+                if not use_token_cache:
+                    self.token_cache.invalidate(self.token_cache_key)
+                entry = self.token_cache.get(self.token_cache_key)
+                if entry is not None:
+                    auth_token = entry['token']
+                    climate_url = entry['endpoint']
+                    self.cached_token = True
+                else:
+                    auth_token, climate_url, expires = (
+                        self._keystone_authenticate())
+                    if expires is not None:
+                        self.token_cache.set(self.token_cache_key,
+                                             auth_token, expires,
+                                             climate_url)
+
+        response_cache = None
+        if self.options.http_cache:
+            response_cache = cache.ResponseCache(
+                backend=cache.FileCacheBackend(
+                    os.path.join(utils.get_cache_dir(), 'http')))
+
+        retry_policy = None
+        if self.options.retries > 0:
+            retry_policy = retry.RetryPolicy(
+                max_attempts=self.options.retries + 1)
+
+        rate_limiter = None
+        if self.options.rate_limit > 0:
+            rate_limiter = ratelimit.RateLimiter(
+                self.options.rate_limit,
+                burst=max(1, int(self.options.rate_limit)),
+                path=os.path.join(utils.get_cache_dir(), 'ratelimit'))
+
+        # NOTE: the client defaults apply unless a timeout is given, base
+        #       is not imported here as it pulls requests.
+        client_kwargs = {}
+        if self.options.timeout is not None:
+            client_kwargs['timeout'] = self.options.timeout or None
+
+        hooks = []
+        self.timing = None
+        if self.options.timing:
+            self.timing = instrumentation.TimingCollector()
+            hooks.append(self.timing)
+
+        client = climate_client.Client(self.options.os_reservation_api_version,
+                                       climate_url=climate_url,
+                                       auth_token=auth_token,
+                                       response_cache=response_cache,
+                                       hooks=hooks,
+                                       retry_policy=retry_policy,
+                                       rate_limiter=rate_limiter,
+                                       **client_kwargs)
+        self.client = client
+        self.name_index = None
+        if self.options.name_cache_ttl > 0:
+            self.name_index = name_index.NameIndex(
+                ttl=self.options.name_cache_ttl,
+                path=self._name_index_path(climate_url))
+        return
+
+    def _keystone_authenticate(self):
+        """Authenticates with Keystone.
+
+        :returns: Token, reservation endpoint and expiry date of the token.
+        :rtype: tuple
+        """
+        # NOTE: keystoneclient is slow to import and is not needed by the
+        #       commands that do not authenticate, e.g. help.
+        from keystoneclient import exceptions as keystone_exceptions
+        import keystoneclient.v2_0 as keystone_client
+
         keystone = keystone_client.Client(
             token=self.options.os_token,
             auth_url=self.options.os_auth_url,
@@ -421,11 +678,18 @@ class ClimateShell(app.App):
             raise exception.NotAuthorized("User %s is not authorized." %
                                           self.options.os_username)
 
-        client = climate_client.Client(self.options.os_reservation_api_version,
-                                       climate_url=climate_url,
-                                       auth_token=keystone.auth_token)
-        self.client = client
-        return
+        auth_ref = getattr(keystone, 'auth_ref', None)
+        expires = getattr(auth_ref, 'expires', None)
+        return keystone.auth_token, climate_url, expires
+
+    def _name_index_path(self, climate_url):
+        """Returns the file of the name index for this user and endpoint."""
+        scope = '|'.join([climate_url,
+                          self.options.os_tenant_id or '',
+                          self.options.os_tenant_name or '',
+                          self.options.os_username or ''])
+        digest = hashlib.sha1(scope.encode('utf-8')).hexdigest()
+        return os.path.join(utils.get_cache_dir(), 'names-%s.json' % digest)
 
     def initialize_app(self, argv):
         """Global app init bits:
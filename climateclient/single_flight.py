@@ -0,0 +1,85 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+import threading
+
+import six
+
+
+class _Call(object):
+    """A call in flight and the callers waiting for its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result = None
+        self.exc_info = None
+
+
+class SingleFlight(object):
+    """Shares the outcome of identical calls made concurrently.
+
+    The first caller of a key runs the function, callers of the same key
+    arriving while it runs wait for it and get the same result, or the
+    same exception. Once the call is over, the next caller of the key runs
+    the function again: nothing is cached.
+
+    A SingleFlight is meant to be shared by the threads of a process, e.g.
+    all the requests handled by a Horizon worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        # NOTE: number of calls that waited for another one.
+        self.shared = 0
+
+    def do(self, key, func):
+        """Runs func, or waits for the call of key in flight.
+
+        :returns: Result of the call.
+        :raises: Exception raised by the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.exc_info is not None:
+                six.reraise(*call.exc_info)
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        """Returns the number of calls in flight."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,138 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-process fake of the Blazar API, needs Python 3.6+ and aiohttp."""
+
+import asyncio
+import datetime
+import uuid
+
+from aiohttp import web
+
+from climateclient.v1 import async_client
+
+
+class FakeBlazar(object):
+    """Serves leases and hosts kept in memory on a local port.
+
+    Records the number of requests served concurrently so that tests can
+    check the client concurrency limit.
+    """
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.leases = {}
+        self.hosts = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures = 0
+        self.url = None
+        self._runner = None
+
+        self.app = web.Application(middlewares=[self._track])
+        self.app.router.add_get('/leases', self.list_leases)
+        self.app.router.add_post('/leases', self.create_lease)
+        self.app.router.add_get('/leases/{id}', self.get_lease)
+        self.app.router.add_put('/leases/{id}', self.update_lease)
+        self.app.router.add_delete('/leases/{id}', self.delete_lease)
+        self.app.router.add_get('/os-hosts', self.list_hosts)
+        self.app.router.add_get('/os-hosts/{id}', self.get_host)
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = 'http://127.0.0.1:%s' % self._runner.addresses[0][1]
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    async def create_client(self, **kwargs):
+        """Returns a client of the fake, created from the running loop."""
+        return async_client.Client(self.url, 'token', **kwargs)
+
+    def add_lease(self, **values):
+        lease = {'id': str(uuid.uuid4()), 'name': 'lease',
+                 'start_date': '2014-01-01T00:00:00.000000',
+                 'end_date': '2014-01-02T00:00:00.000000'}
+        lease.update(values)
+        self.leases[lease['id']] = lease
+        return lease
+
+    @web.middleware
+    async def _track(self, request, handler):
+        if request.headers.get('x-auth-token') is None:
+            return web.json_response({'error_message': 'Unauthorized'},
+                                     status=401)
+        if self.failures > 0:
+            self.failures -= 1
+            return web.json_response({'error_message': 'Unavailable'},
+                                     status=503)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    def _lease_values(self, values):
+        for key in ('start_date', 'end_date'):
+            if key in values:
+                date = datetime.datetime.strptime(values[key],
+                                                  '%Y-%m-%d %H:%M')
+                values[key] = date.strftime('%Y-%m-%dT%H:%M:%S.%f')
+        return values
+
+    def _lease(self, request):
+        try:
+            return self.leases[request.match_info['id']]
+        except KeyError:
+            raise web.HTTPNotFound(
+                text='{"error_message": "Lease not found"}',
+                content_type='application/json')
+
+    async def list_leases(self, request):
+        return web.json_response({'leases': list(self.leases.values())})
+
+    async def create_lease(self, request):
+        values = self._lease_values(await request.json())
+        return web.json_response({'lease': self.add_lease(**values)},
+                                 status=201)
+
+    async def get_lease(self, request):
+        return web.json_response({'lease': self._lease(request)})
+
+    async def update_lease(self, request):
+        lease = self._lease(request)
+        lease.update(self._lease_values(await request.json()))
+        return web.json_response({'lease': lease})
+
+    async def delete_lease(self, request):
+        self.leases.pop(self._lease(request)['id'])
+        return web.Response(status=204)
+
+    async def list_hosts(self, request):
+        return web.json_response({'hosts': list(self.hosts.values())})
+
+    async def get_host(self, request):
+        try:
+            host = self.hosts[request.match_info['id']]
+        except KeyError:
+            raise web.HTTPNotFound(
+                text='{"error_message": "Host not found"}',
+                content_type='application/json')
+        return web.json_response({'host': host})
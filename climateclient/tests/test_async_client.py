@@ -0,0 +1,149 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import six
+import testtools
+
+from climateclient import circuit_breaker
+from climateclient import exception
+from climateclient.openstack.common import importutils
+from climateclient import retry
+from climateclient import tests
+
+aiohttp = importutils.try_import('aiohttp')
+
+if six.PY3 and aiohttp is not None:
+    import asyncio
+
+    from climateclient.tests import fake_blazar
+
+
+@testtools.skipIf(not six.PY3 or aiohttp is None,
+                  'The asyncio client needs Python 3 and aiohttp')
+class AsyncClientTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(AsyncClientTestCase, self).setUp()
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(self.loop.close)
+
+        self.fake = fake_blazar.FakeBlazar()
+        self.run_async(self.fake.start())
+        self.addCleanup(lambda: self.run_async(self.fake.stop()))
+
+        self.client = self.run_async(
+            self.fake.create_client(max_concurrency=3))
+        self.addCleanup(lambda: self.run_async(self.client.close()))
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_get(self):
+        lease = self.fake.add_lease(name='lease1')
+        self.assertEqual(lease, self.run_async(self.client.lease.get(
+            lease['id'])))
+
+    def test_get_not_found(self):
+        e = self.assertRaises(exception.ClimateClientException,
+                              self.run_async,
+                              self.client.lease.get('unknown'))
+        self.assertEqual(404, e.kwargs['code'])
+
+    def test_list_sorted(self):
+        self.fake.add_lease(name='b')
+        self.fake.add_lease(name='a')
+        leases = self.run_async(self.client.lease.list(sort_by='name'))
+        self.assertEqual(['a', 'b'], [l['name'] for l in leases])
+
+    def test_list_filters_limit(self):
+        self.fake.add_lease(name='a', status='ACTIVE')
+        self.fake.add_lease(name='b', status='PENDING')
+        self.fake.add_lease(name='c', status='ACTIVE')
+
+        leases = self.run_async(self.client.lease.list(
+            status='ACTIVE', sort_key='name', limit=1, as_records=True))
+        self.assertEqual(['a'], [l.name for l in leases])
+
+        leases = self.run_async(self.client.lease.list(
+            start='2014-01-01 12:00', end='2014-01-01 13:00'))
+        self.assertEqual(3, len(leases))
+
+    def test_paginate(self):
+        for name in 'abc':
+            self.fake.add_lease(name=name)
+
+        async def names():
+            return [l.name async for l in self.client.lease.paginate(
+                page_size=2, sort_key='name', as_records=True)]
+
+        self.assertEqual(['a', 'b', 'c'], self.run_async(names()))
+
+    def test_create_update_delete(self):
+        lease = self.run_async(self.client.lease.create(
+            'lease1', '2014-01-01 00:00', '2014-01-02 00:00', [], []))
+        lease = self.run_async(self.client.lease.update(lease['id'],
+                                                        name='lease2',
+                                                        prolong_for='1d'))
+        self.assertEqual('lease2', lease['name'])
+        self.assertEqual('2014-01-03T00:00:00.000000', lease['end_date'])
+
+        self.run_async(self.client.lease.delete(lease['id']))
+        self.assertEqual({}, self.fake.leases)
+
+    def test_concurrency_limit(self):
+        ids = [self.fake.add_lease()['id'] for _i in range(10)]
+        leases = self.run_async(asyncio.gather(
+            *[self.client.lease.get(lease_id) for lease_id in ids]))
+
+        self.assertEqual(ids, [l['id'] for l in leases])
+        self.assertEqual(3, self.fake.max_in_flight)
+
+    def test_get_many(self):
+        lease = self.fake.add_lease()
+        results = self.run_async(self.client.lease.get_many([lease['id'],
+                                                             'unknown']))
+
+        self.assertEqual(lease, results[0].result)
+        self.assertFalse(results[1].succeeded)
+        self.assertEqual(404, results[1].error.kwargs['code'])
+
+    def test_retry(self):
+        client = self.run_async(self.fake.create_client(
+            retry_policy=retry.RetryPolicy(backoff_factor=0.01)))
+        self.addCleanup(lambda: self.run_async(client.close()))
+        lease = self.fake.add_lease()
+        self.fake.failures = 2
+
+        self.assertEqual(lease, self.run_async(client.lease.get(
+            lease['id'])))
+        self.assertEqual(0, self.fake.failures)
+
+    def test_circuit_breaker(self):
+        client = self.run_async(self.fake.create_client(
+            circuit_breaker=circuit_breaker.CircuitBreaker(
+                failure_threshold=2)))
+        self.addCleanup(lambda: self.run_async(client.close()))
+        lease = self.fake.add_lease()
+        self.fake.failures = 3
+
+        for _i in range(2):
+            self.assertRaises(exception.ClimateClientException,
+                              self.run_async,
+                              client.lease.get(lease['id']))
+        self.assertRaises(exception.CircuitOpen, self.run_async,
+                          client.lease.get(lease['id']))
+        self.assertEqual(1, self.fake.failures)
@@ -14,10 +14,16 @@
 # limitations under the License.
 
 
+import mock
 import requests
+from six.moves.urllib import parse
 
 from climateclient import base
+from climateclient import cache
+from climateclient import circuit_breaker
 from climateclient import exception
+from climateclient import retry
+from climateclient import single_flight
 from climateclient import tests
 
 
@@ -100,3 +106,329 @@ class BaseClientManagerTestCase(tests.TestCase):
         self.assertRaises(exception.ClimateClientException,
                           self.manager.request,
                           self.url, "POST", **kwargs)
+
+    def test_request_uses_session(self):
+        session = mock.MagicMock()
+        session.request.return_value.status_code = 200
+        session.request.return_value.text = '{"key": "value"}'
+        manager = base.BaseClientManager(self.url, self.token,
+                                         session=session)
+
+        self.assertEqual((session.request.return_value, {"key": "value"}),
+                         manager.request("/leases", "GET"))
+        session.request.assert_called_once_with(
+            "GET", self.url + "/leases", headers=mock.ANY,
+            timeout=base.DEFAULT_TIMEOUT)
+        self.assertFalse(self.request.called)
+
+    def test_request_cached(self):
+        self.manager.response_cache = cache.ResponseCache()
+        self.request.return_value.status_code = 200
+        self.request.return_value.text = '{"key": "value"}'
+        self.request.return_value.headers = {'ETag': '"1"'}
+
+        resp, body = self.manager.request('/leases', 'GET')
+        self.assertEqual({"key": "value"}, body)
+        body['key'] = 'modified'
+
+        self.request.return_value.status_code = 304
+        self.request.return_value.text = ''
+        resp, cached_body = self.manager.request('/leases', 'GET')
+        self.assertEqual({"key": "value"}, cached_body)
+        cached_body['key'] = 'modified'
+
+        resp, cached_body = self.manager.request('/leases', 'GET')
+        self.assertEqual({"key": "value"}, cached_body)
+        self.assertEqual('"1"',
+                         self.request.call_args[1]['headers']['If-None-Match'])
+        self.assertEqual({'hits': 2, 'misses': 1, 'entries': 1},
+                         self.manager.response_cache.stats())
+
+    def test_request_hooks(self):
+        hook = mock.Mock()
+        self.manager.hooks = [hook]
+        self.request.return_value.status_code = 200
+        self.request.return_value.content = b'{"lease": {}}'
+        self.request.return_value.text = '{"lease": {}}'
+
+        self.manager.request('/leases/1234', 'GET')
+
+        self.assertTrue(self.request.call_args[1]['stream'])
+        event = hook.pre_request.call_args[0][0]
+        self.assertIs(event, hook.post_response.call_args[0][0])
+        self.assertFalse(hook.on_error.called)
+        self.assertEqual('/leases/{id}', event.url_template)
+        self.assertEqual(200, event.status)
+        self.assertEqual(13, event.response_bytes)
+        self.assertEqual(set(['ttfb', 'download', 'decode', 'total']),
+                         set(event.timings))
+
+    def test_request_hooks_error(self):
+        hook = mock.Mock()
+        self.manager.hooks = [hook]
+        self.request.return_value.status_code = 404
+        self.request.return_value.content = b''
+        self.request.return_value.text = '{"error_message": "Not found"}'
+
+        self.assertRaises(exception.ClimateClientException,
+                          self.manager.request, '/leases/1234', 'GET')
+
+        event = hook.on_error.call_args[0][0]
+        self.assertEqual(404, event.status)
+        self.assertIsInstance(event.error, exception.ClimateClientException)
+        self.assertFalse(hook.post_response.called)
+
+    def _retrying_manager(self):
+        policy = retry.RetryPolicy(max_attempts=3)
+        self.sleep = self.patch(policy, 'sleep')
+        self.manager.retry_policy = policy
+
+    def _response(self, status_code, text='{}'):
+        return mock.Mock(status_code=status_code, text=text,
+                         content=text.encode('utf-8'), headers={})
+
+    def test_request_retry(self):
+        self._retrying_manager()
+        self.request.side_effect = [
+            requests.exceptions.ConnectionError(),
+            self._response(503),
+            self._response(200, '{"lease": {}}')]
+
+        resp, body = self.manager.request('/leases/1', 'GET')
+
+        self.assertEqual({'lease': {}}, body)
+        self.assertEqual(3, self.request.call_count)
+        self.assertEqual(2, self.sleep.call_count)
+
+    def test_request_retry_exhausted(self):
+        self._retrying_manager()
+        self.request.return_value = self._response(503)
+
+        e = self.assertRaises(exception.ClimateClientException,
+                              self.manager.request, '/leases/1', 'DELETE')
+        self.assertEqual(503, e.kwargs['code'])
+        self.assertEqual(3, self.request.call_count)
+
+    def test_request_no_retry_post(self):
+        self._retrying_manager()
+        self.request.return_value = self._response(503)
+
+        self.assertRaises(exception.ClimateClientException,
+                          self.manager.request, '/leases', 'POST', body={})
+        self.assertEqual(1, self.request.call_count)
+
+    def test_request_timeout(self):
+        self.request.return_value = self._response(200)
+
+        self.manager.request('/leases', 'GET')
+        self.assertEqual(base.DEFAULT_TIMEOUT,
+                         self.request.call_args[1]['timeout'])
+
+        self.manager.timeout = 5
+        self.manager.request('/leases', 'GET')
+        self.assertEqual(5, self.request.call_args[1]['timeout'])
+
+    def test_request_circuit_breaker(self):
+        self.manager.circuit_breaker = circuit_breaker.CircuitBreaker(
+            failure_threshold=2)
+        self.request.side_effect = [requests.exceptions.ReadTimeout(),
+                                    self._response(500)]
+
+        self.assertRaises(requests.exceptions.Timeout,
+                          self.manager.request, '/leases', 'GET')
+        self.assertRaises(exception.ClimateClientException,
+                          self.manager.request, '/leases', 'GET')
+        e = self.assertRaises(exception.CircuitOpen,
+                              self.manager.request, '/leases', 'GET')
+        self.assertEqual(503, e.kwargs['code'])
+        self.assertEqual(2, self.request.call_count)
+
+    def test_request_circuit_breaker_client_error(self):
+        self.manager.circuit_breaker = circuit_breaker.CircuitBreaker(
+            failure_threshold=1)
+        self.request.return_value = self._response(404)
+
+        for _i in range(2):
+            self.assertRaises(exception.ClimateClientException,
+                              self.manager.request, '/leases/1', 'GET')
+        self.assertEqual(2, self.request.call_count)
+
+    def test_request_circuit_breaker_other_error(self):
+        self.manager.circuit_breaker = circuit_breaker.CircuitBreaker(
+            failure_threshold=1, reset_timeout=0)
+        self.request.side_effect = [
+            requests.exceptions.ReadTimeout(),
+            requests.exceptions.ChunkedEncodingError(),
+            self._response(200, '{"leases": []}')]
+
+        self.assertRaises(requests.exceptions.Timeout,
+                          self.manager.request, '/leases', 'GET')
+        self.assertRaises(requests.exceptions.ChunkedEncodingError,
+                          self.manager.request, '/leases', 'GET')
+        self.assertEqual(circuit_breaker.OPEN,
+                         self.manager.circuit_breaker.state)
+        self.assertEqual({'leases': []},
+                         self.manager.request('/leases', 'GET')[1])
+        self.assertEqual(circuit_breaker.CLOSED,
+                         self.manager.circuit_breaker.state)
+
+    def test_request_single_flight(self):
+        self.manager.single_flight = single_flight.SingleFlight()
+        do = self.patch(self.manager.single_flight, 'do')
+        do.return_value = self._response(200, '{"leases": []}')
+
+        self.assertEqual({'leases': []},
+                         self.manager.request('/leases', 'GET')[1])
+        key = do.call_args[0][0]
+        self.assertEqual((self.url + '/leases', self.token, None, None), key)
+
+        self.request.return_value = self._response(201, '{"lease": {}}')
+        self.manager.request('/leases', 'POST', body={})
+        self.assertEqual(1, do.call_count)
+
+    def test_iter(self):
+        self.request.return_value.status_code = 200
+        self.request.return_value.iter_content.return_value = [
+            b'{"leases": [{"id": 1}, ', b'{"id": 2}]}']
+
+        self.assertEqual([{"id": 1}, {"id": 2}],
+                         list(self.manager._iter('/leases', 'leases')))
+        self.assertEqual(True, self.request.call_args[1]['stream'])
+        self.request.return_value.close.assert_called_once_with()
+
+    def test_iter_fail(self):
+        self.request.return_value.status_code = 404
+        self.request.return_value.text = '{"error_message": "Not found"}'
+
+        self.assertRaises(exception.ClimateClientException, list,
+                          self.manager._iter('/leases', 'leases'))
+
+    def _fake_server(self, paginates):
+        resources = [{'id': str(i), 'name': 'r%02d' % (9 - i)}
+                     for i in range(10)]
+        urls = []
+
+        def get(url, response_key):
+            urls.append(url)
+            if not paginates:
+                return list(resources)
+            query = dict(parse.parse_qsl(parse.urlparse(url).query))
+            result = list(resources)
+            if 'marker' in query:
+                ids = [r['id'] for r in result]
+                result = result[ids.index(query['marker']) + 1:]
+            if 'limit' in query:
+                result = result[:int(query['limit'])]
+            return result
+
+        self.patch(self.manager, '_get').side_effect = get
+        return urls
+
+    def test_list_server_side(self):
+        urls = self._fake_server(paginates=True)
+
+        resources = self.manager._list('/leases', 'leases', limit=3,
+                                       marker='2')
+
+        self.assertEqual(['3', '4', '5'], [r['id'] for r in resources])
+        self.assertEqual(['/leases?limit=3&marker=2'], urls)
+
+    def test_list_fallback(self):
+        self._fake_server(paginates=False)
+
+        resources = self.manager._list('/leases', 'leases', limit=2,
+                                       sort_key='name')
+
+        self.assertEqual(['r00', 'r01'], [r['name'] for r in resources])
+
+    def test_list_fallback_marker_desc(self):
+        self._fake_server(paginates=False)
+
+        resources = self.manager._list('/leases', 'leases', marker='7',
+                                       sort_key='id', sort_dir='desc')
+
+        self.assertEqual(['6', '5', '4', '3', '2', '1', '0'],
+                         [r['id'] for r in resources])
+
+    def test_list_filters_limit(self):
+        urls = self._fake_server(paginates=True)
+
+        resources = self.manager._list('/leases', 'leases', limit=1,
+                                       filters={'name': 'r05'})
+
+        url = '/leases?limit=%d&name=r05' % base.DEFAULT_PAGE_SIZE
+        self.assertEqual(['4'], [r['id'] for r in resources])
+        self.assertEqual([url], urls)
+
+    def test_paginate_filters_limit(self):
+        urls = self._fake_server(paginates=True)
+
+        resources = list(self.manager._paginate(
+            '/leases', 'leases', page_size=4, limit=1,
+            filters={'name': 'r02'}))
+
+        self.assertEqual(['7'], [r['id'] for r in resources])
+        self.assertEqual(['/leases?limit=4&name=r02',
+                          '/leases?limit=4&marker=3&name=r02'], urls)
+
+    def test_paginate(self):
+        urls = self._fake_server(paginates=True)
+
+        resources = self.manager._paginate('/leases', 'leases', page_size=4)
+
+        self.assertEqual([], urls)
+        self.assertEqual([str(i) for i in range(10)],
+                         [r['id'] for r in resources])
+        self.assertEqual(['/leases?limit=4', '/leases?limit=4&marker=3',
+                          '/leases?limit=4&marker=7'], urls)
+
+    def test_paginate_limit(self):
+        urls = self._fake_server(paginates=True)
+
+        resources = list(self.manager._paginate('/leases', 'leases',
+                                                page_size=4, limit=6))
+
+        self.assertEqual([str(i) for i in range(6)],
+                         [r['id'] for r in resources])
+        self.assertEqual(['/leases?limit=4', '/leases?limit=2&marker=3'],
+                         urls)
+
+    def test_paginate_fallback(self):
+        urls = self._fake_server(paginates=False)
+
+        resources = list(self.manager._paginate('/leases', 'leases',
+                                                page_size=4, limit=6,
+                                                sort_key='name'))
+
+        self.assertEqual(['r%02d' % i for i in range(6)],
+                         [r['name'] for r in resources])
+        self.assertEqual(['/leases?limit=4&sort_key=name'], urls)
+
+    def test_run_many(self):
+        def get(item_id):
+            if item_id == 'bad':
+                raise exception.ClimateClientException('ERROR', code=404)
+            return item_id.upper()
+
+        results = self.manager._run_many(get, ['a', 'bad', 'c'],
+                                         max_workers=2)
+
+        self.assertEqual(['a', 'bad', 'c'], [r.id for r in results])
+        self.assertEqual(['A', None, 'C'], [r.result for r in results])
+        self.assertEqual([True, False, True],
+                         [r.succeeded for r in results])
+        self.assertIsInstance(results[1].error,
+                              exception.ClimateClientException)
+
+
+class CreateSessionTestCase(tests.TestCase):
+
+    def test_create_session(self):
+        session = base.create_session(pool_connections=2, pool_maxsize=5,
+                                      pool_block=True)
+
+        adapter = session.get_adapter('https://www.fake.com')
+        self.assertEqual(2, adapter._pool_connections)
+        self.assertEqual(5, adapter._pool_maxsize)
+        self.assertTrue(adapter._pool_block)
+        self.assertIs(adapter, session.get_adapter('http://www.fake.com'))
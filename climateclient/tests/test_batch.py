@@ -0,0 +1,137 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+
+import fixtures
+import mock
+import six
+
+from climateclient import batch
+from climateclient import exception
+from climateclient import shell
+from climateclient import tests
+
+
+class ParseLineTestCase(tests.TestCase):
+
+    def test_command_line(self):
+        self.assertEqual(['lease-create', '--name', 'my lease'],
+                         batch.parse_line('lease-create --name "my lease"\n'))
+
+    def test_json_line(self):
+        self.assertEqual(['lease-show', 'a b'],
+                         batch.parse_line('["lease-show", "a b"]'))
+
+    def test_blank_and_comment(self):
+        self.assertIsNone(batch.parse_line('  \n'))
+        self.assertIsNone(batch.parse_line('# lease-list'))
+
+    def test_invalid_json(self):
+        self.assertRaises(exception.ClimateClientException,
+                          batch.parse_line, '["lease-show", 1]')
+
+
+class BatchTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(BatchTestCase, self).setUp()
+
+        self.app = mock.MagicMock()
+        self.app.stdout = six.StringIO()
+        self.app.run_subcommand.side_effect = self.run_subcommand
+        self.batch = batch.Batch(self.app, None)
+
+    def run_subcommand(self, args):
+        if args[0] == 'fail':
+            logging.getLogger('climateclient.shell').error('failed')
+            return 1
+        self.app.stdout.write(' '.join(args))
+        return 0
+
+    def reports(self):
+        return [json.loads(line)
+                for line in self.app.stdout.getvalue().splitlines()]
+
+    def test_run_lines(self):
+        status = self.batch.run_lines(['lease-list --limit 2\n', '\n',
+                                       '["lease-show", "lease"]\n'])
+
+        self.assertEqual(0, status)
+        self.assertEqual(
+            [{'line': 1, 'command': ['lease-list', '--limit', '2'],
+              'status': 0, 'stdout': 'lease-list --limit 2', 'stderr': ''},
+             {'line': 3, 'command': ['lease-show', 'lease'],
+              'status': 0, 'stdout': 'lease-show lease', 'stderr': ''}],
+            self.reports())
+
+    def test_run_lines_failure(self):
+        status = self.batch.run_lines(['fail\n', 'lease-list\n'])
+
+        reports = self.reports()
+        self.assertEqual(1, status)
+        self.assertEqual([1, 0], [r['status'] for r in reports])
+        self.assertEqual('failed\n', reports[0]['stderr'])
+
+    def test_stop_on_error(self):
+        status = self.batch.run_lines(['fail\n', 'lease-list\n'],
+                                      stop_on_error=True)
+
+        self.assertEqual(1, status)
+        self.assertEqual(1, len(self.reports()))
+
+    def test_nested_batch(self):
+        self.batch.run_lines(['batch other-file\n'])
+
+        self.assertEqual(2, self.reports()[0]['status'])
+        self.assertFalse(self.app.run_subcommand.called)
+
+
+class BatchCommandsTestCase(tests.TestCase):
+    """Runs real commands of the shell in a batch."""
+
+    def setUp(self):
+        super(BatchCommandsTestCase, self).setUp()
+
+        self.shell = shell.ClimateShell()
+        self.shell.options, _argv = self.shell.parser.parse_known_args([])
+        for name, command_class in shell.COMMANDS_V1.items():
+            self.shell.command_manager.add_command(name, command_class)
+        self.shell.interactive_mode = False
+        self.shell.client = mock.MagicMock()
+        self.shell.name_index = None
+        self.shell.stdout = six.StringIO()
+        self.stdout = six.StringIO()
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', self.stdout))
+        self.batch = batch.Batch(self.shell, None)
+
+    def test_reports_only(self):
+        lease_id = 'ecd5a3e2-69e2-4d4b-9f2c-06d0e02d1b8d'
+        self.shell.client.lease.create.return_value = {'id': lease_id,
+                                                       'name': 'lease'}
+
+        status = self.batch.run_lines([
+            'lease-create --physical-reservation min=1,max=1 lease\n',
+            'lease-update --name other %s\n' % lease_id])
+
+        self.assertEqual(0, status)
+        self.assertEqual('', self.stdout.getvalue())
+        reports = [json.loads(line)
+                   for line in self.shell.stdout.getvalue().splitlines()]
+        self.assertEqual([0, 0], [r['status'] for r in reports])
+        self.assertIn('Created a new lease:', reports[0]['stdout'])
+        self.assertEqual('Updated lease: %s\n' % lease_id,
+                         reports[1]['stdout'])
@@ -0,0 +1,74 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import time
+
+from climateclient import cache
+from climateclient import tests
+
+
+class ResponseCacheTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(ResponseCacheTestCase, self).setUp()
+
+        self.cache = cache.ResponseCache(max_entries=2)
+
+    def test_key_depends_on_token(self):
+        self.assertNotEqual(self.cache.key('/leases', 'token1'),
+                            self.cache.key('/leases', 'token2'))
+
+    def test_lru(self):
+        for key in ('a', 'b'):
+            self.cache.set(key, cache.CachedResponse(key, etag=key))
+        self.cache.get('a')
+        self.cache.set('c', cache.CachedResponse('c', etag='c'))
+
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual('a', self.cache.get('a').body)
+        self.assertEqual('c', self.cache.get('c').body)
+
+    def test_stats(self):
+        self.cache.record(hit=True)
+        self.cache.record(hit=False)
+        self.cache.record(hit=False)
+        self.assertEqual({'hits': 1, 'misses': 2, 'entries': 0},
+                         self.cache.stats())
+
+    def test_file_backend(self):
+        path = os.path.join(tempfile.mkdtemp(), 'http')
+        self.cache.backend = cache.FileCacheBackend(path)
+        self.cache.set('a', cache.CachedResponse({'leases': []}, etag='1'))
+
+        other = cache.ResponseCache(backend=cache.FileCacheBackend(path))
+        response = other.get('a')
+        self.assertEqual({'leases': []}, response.body)
+        self.assertEqual('1', response.etag)
+        self.assertEqual(0o600,
+                         os.stat(os.path.join(path, 'a.json')).st_mode & 0o777)
+
+    def test_file_backend_prunes(self):
+        path = os.path.join(tempfile.mkdtemp(), 'http')
+        backend = cache.FileCacheBackend(path, max_age=60)
+        backend.set('a', cache.CachedResponse({'leases': []}, etag='1'))
+        old = time.time() - 120
+        os.utime(os.path.join(path, 'a.json'), (old, old))
+
+        backend = cache.FileCacheBackend(path, max_age=60)
+        backend.set('b', cache.CachedResponse({'leases': []}, etag='2'))
+
+        self.assertEqual(['b.json'], os.listdir(path))
@@ -0,0 +1,88 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from climateclient import circuit_breaker
+from climateclient import exception
+from climateclient import tests
+
+
+class CircuitBreakerTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(CircuitBreakerTestCase, self).setUp()
+
+        self.now = 1000.0
+        self.patch(circuit_breaker.time, 'time').side_effect = (
+            lambda: self.now)
+        self.breaker = circuit_breaker.CircuitBreaker(failure_threshold=3,
+                                                      reset_timeout=30)
+
+    def _fail(self, times):
+        for _i in range(times):
+            self.breaker.before_request()
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        self._fail(3)
+
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state)
+        self.assertRaises(exception.CircuitOpen, self.breaker.before_request)
+
+    def test_success_resets_failures(self):
+        self._fail(2)
+        self.breaker.record_success()
+        self._fail(2)
+
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+        self.breaker.before_request()
+
+    def test_half_open_single_trial(self):
+        self._fail(3)
+        self.now += 30
+
+        self.breaker.before_request()
+        self.assertEqual(circuit_breaker.HALF_OPEN, self.breaker.state)
+        self.assertRaises(exception.CircuitOpen, self.breaker.before_request)
+
+    def test_half_open_success_closes(self):
+        self._fail(3)
+        self.now += 30
+        self.breaker.before_request()
+        self.breaker.record_success()
+
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+        self.breaker.before_request()
+
+    def test_half_open_failure_reopens(self):
+        self._fail(3)
+        self.now += 30
+        self._fail(1)
+
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state)
+        self.now += 29
+        self.assertRaises(exception.CircuitOpen, self.breaker.before_request)
+        self.now += 1
+        self.breaker.before_request()
+
+    def test_half_open_stale_trial(self):
+        self._fail(3)
+        self.now += 30
+        self.breaker.before_request()
+
+        self.now += 29
+        self.assertRaises(exception.CircuitOpen, self.breaker.before_request)
+        self.now += 1
+        self.breaker.before_request()
+        self.assertEqual(circuit_breaker.HALF_OPEN, self.breaker.state)
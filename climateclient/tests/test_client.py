@@ -42,3 +42,13 @@ class BaseClientTestCase(tests.TestCase):
         self.assertRaises(exception.UnsupportedVersion,
                           self.client.Client,
                           version='0.0')
+
+    def test_async_with_v1(self):
+        self.client.AsyncClient()
+        self.import_obj.assert_called_once_with(
+            'climateclient.v1.async_client.Client')
+
+    def test_async_with_wrong_vers(self):
+        self.assertRaises(exception.UnsupportedVersion,
+                          self.client.AsyncClient,
+                          version='0.0')
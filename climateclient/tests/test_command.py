@@ -16,6 +16,7 @@
 import mock
 import testtools
 
+from climateclient import base
 from climateclient import command
 from climateclient import tests
 
@@ -109,13 +110,53 @@ class UpdateCommandTestCase(tests.TestCase):
         self.update_command = command.UpdateCommand(self.app, [])
 
 
-@testtools.skip("Under construction")
 class DeleteCommandTestCase(tests.TestCase):
     def setUp(self):
         super(DeleteCommandTestCase, self).setUp()
 
         self.app = mock.MagicMock()
         self.delete_command = command.DeleteCommand(self.app, [])
+        self.delete_command.resource = 'lease'
+        self.delete_command.allow_names = False
+        self.delete_command.log = mock.MagicMock()
+
+    def test_delete_many(self):
+        self.app.client.lease.delete_many.return_value = [
+            base.BulkResult('id1'),
+            base.BulkResult('id2', error=Exception('ERROR'))]
+        parsed_args = mock.Mock(id=['id1', 'id2'])
+
+        self.assertEqual(1, self.delete_command.run(parsed_args))
+        self.app.client.lease.delete_many.assert_called_once_with(
+            ['id1', 'id2'])
+        self.app.name_index.discard.assert_called_once_with('lease', 'id1')
+
+    def test_delete_many_by_name(self):
+        self.delete_command.allow_names = True
+        self.app.name_index = None
+        self.app.client.lease.list.return_value = [
+            {'id': 'id1', 'name': 'lease1'},
+            {'id': 'id2', 'name': 'lease2'}]
+        self.app.client.lease.delete_many.return_value = [
+            base.BulkResult('id1'), base.BulkResult('id2')]
+        parsed_args = mock.Mock(id=['lease1', 'lease3', 'lease2'])
+
+        self.assertEqual(1, self.delete_command.run(parsed_args))
+        self.app.client.lease.list.assert_called_once_with()
+        self.app.client.lease.delete_many.assert_called_once_with(
+            ['id1', 'id2'])
+        self.assertIn('lease3', self.app.stderr.write.call_args_list[0][0][0])
+
+    def test_delete_by_name_lists_again(self):
+        self.delete_command.allow_names = True
+        self.app.client.lease.list.return_value = []
+        self.app.name_index.resolve.return_value = 'id1'
+        parsed_args = mock.Mock(id=['lease1'])
+
+        self.delete_command.run(parsed_args)
+        self.app.name_index.resolve.assert_called_once_with(
+            self.app.client, 'lease', 'lease1', fresh=True)
+        self.app.client.lease.delete.assert_called_once_with('id1')
 
 
 @testtools.skip("Under construction")
@@ -0,0 +1,87 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import socket
+
+from climateclient import instrumentation
+from climateclient import tests
+
+
+def make_event(method='GET', url='/leases/1234', status=200):
+    event = instrumentation.RequestEvent(method, url)
+    event.status = status
+    event.response_bytes = 100
+    event.timings = {'ttfb': 0.25, 'download': 0.125, 'decode': 0.0,
+                     'total': 0.375}
+    return event
+
+
+class InstrumentationTestCase(tests.TestCase):
+
+    def test_url_template(self):
+        self.assertEqual('/leases', instrumentation.url_template('/leases'))
+        self.assertEqual('/leases/{id}',
+                         instrumentation.url_template('/leases/abc'))
+        self.assertEqual('/os-hosts',
+                         instrumentation.url_template('/os-hosts?limit=1'))
+
+    def test_notify_ignores_failing_hooks(self):
+        class Hook(object):
+            def pre_request(self, event):
+                raise RuntimeError()
+
+        instrumentation.notify([Hook(), object()], 'pre_request',
+                               make_event())
+
+    def test_prometheus(self):
+        collector = instrumentation.PrometheusCollector()
+        collector.post_response(make_event())
+        collector.post_response(make_event(url='/leases/5678'))
+        collector.on_error(make_event(status=None))
+
+        dump = collector.dump()
+
+        self.assertIn('# TYPE climateclient_requests_total counter', dump)
+        self.assertIn('climateclient_requests_total{method="GET",'
+                      'url="/leases/{id}",status="200"} 2', dump)
+        self.assertIn('climateclient_requests_total{method="GET",'
+                      'url="/leases/{id}",status="error"} 1', dump)
+        self.assertIn('climateclient_request_phase_seconds_total{'
+                      'method="GET",url="/leases/{id}",phase="ttfb"} 0.75',
+                      dump)
+
+    def test_statsd(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.settimeout(5)
+        collector = instrumentation.StatsdCollector(
+            port=server.getsockname()[1])
+
+        collector.post_response(make_event())
+
+        metrics = server.recv(4096).decode('utf-8').splitlines()
+        self.assertIn('climateclient.GET.leases.id.status.200:1|c', metrics)
+        self.assertIn('climateclient.GET.leases.id.ttfb:250|ms', metrics)
+
+    def test_timing(self):
+        collector = instrumentation.TimingCollector()
+        collector.post_response(make_event())
+
+        lines = collector.format().splitlines()
+
+        self.assertEqual(['GET', '/leases/1234', '200', '0.375'],
+                         lines[1].split())
+        self.assertEqual(['Total', '0.375'], lines[2].split())
@@ -0,0 +1,104 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+
+import mock
+
+from climateclient import exception
+from climateclient import name_index
+from climateclient import tests
+
+
+class NameIndexTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(NameIndexTestCase, self).setUp()
+
+        self.client = mock.MagicMock()
+        self.client.lease.list.return_value = [
+            {'id': 'id1', 'name': 'lease1'},
+            {'id': 'id2', 'name': 'lease2'},
+            {'id': 'id3', 'name': 'lease2'},
+        ]
+        self.index = name_index.NameIndex()
+
+    def test_resolve(self):
+        self.assertEqual('id1', self.index.resolve(self.client, 'lease',
+                                                   'lease1'))
+        self.assertEqual('id1', self.index.resolve(self.client, 'lease',
+                                                   'lease1'))
+        self.client.lease.list.assert_called_once_with()
+
+    def test_resolve_not_unique(self):
+        self.assertRaises(exception.NoUniqueMatch,
+                          self.index.resolve, self.client, 'lease', 'lease2')
+
+    def test_resolve_unknown_refreshes(self):
+        self.index.resolve(self.client, 'lease', 'lease1')
+        self.assertRaises(exception.ClimateClientException,
+                          self.index.resolve, self.client, 'lease', 'lease3')
+        self.assertEqual(2, self.client.lease.list.call_count)
+
+    def test_resolve_fresh(self):
+        self.index.resolve(self.client, 'lease', 'lease1')
+        self.client.lease.list.return_value = [
+            {'id': 'id4', 'name': 'lease1'},
+            {'id': 'id5', 'name': 'lease1'},
+        ]
+
+        self.assertRaises(exception.NoUniqueMatch, self.index.resolve,
+                          self.client, 'lease', 'lease1', fresh=True)
+        self.assertEqual(2, self.client.lease.list.call_count)
+
+    def test_resolve_fresh_new_index(self):
+        self.assertEqual('id1', self.index.resolve(self.client, 'lease',
+                                                   'lease1', fresh=True))
+        self.client.lease.list.assert_called_once_with()
+
+    def test_lookup(self):
+        self.assertEqual({'lease1': ['id1'], 'lease2': ['id2', 'id3'],
+                          'lease3': []},
+                         self.index.lookup(self.client, 'lease',
+                                           ['lease1', 'lease2', 'lease3']))
+        self.client.lease.list.assert_called_once_with()
+
+    def test_resolve_expired(self):
+        self.index.ttl = -1
+        self.index.resolve(self.client, 'lease', 'lease1')
+        self.index.resolve(self.client, 'lease', 'lease1')
+        self.assertEqual(2, self.client.lease.list.call_count)
+
+    def test_add_and_discard(self):
+        self.index.resolve(self.client, 'lease', 'lease1')
+        self.index.add('lease', 'lease4', 'id4')
+        self.index.discard('lease', 'id1')
+
+        self.assertEqual('id4', self.index.resolve(self.client, 'lease',
+                                                   'lease4'))
+        self.client.lease.list.assert_called_once_with()
+        self.index.resolve(self.client, 'lease', 'lease1')
+        self.assertEqual(2, self.client.lease.list.call_count)
+
+    def test_persisted(self):
+        path = os.path.join(tempfile.mkdtemp(), 'cache', 'names.json')
+        index = name_index.NameIndex(path=path)
+        index.resolve(self.client, 'lease', 'lease1')
+
+        self.assertEqual(0o600, os.stat(path).st_mode & 0o777)
+        other = name_index.NameIndex(path=path)
+        self.assertEqual('id1', other.resolve(self.client, 'lease', 'lease1'))
+        self.client.lease.list.assert_called_once_with()
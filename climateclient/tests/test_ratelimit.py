@@ -0,0 +1,112 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import threading
+
+import mock
+
+from climateclient import base
+from climateclient import ratelimit
+from climateclient import tests
+
+
+class RateLimiterTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(RateLimiterTestCase, self).setUp()
+
+        self.now = 1000.0
+        self.patch(ratelimit.time, 'time').side_effect = lambda: self.now
+        self.sleep = self.patch(ratelimit.time, 'sleep')
+
+    def test_burst_then_rate(self):
+        limiter = ratelimit.RateLimiter(rate=2, burst=2)
+
+        waits = [limiter.reserve('http://climate:1234/v1')
+                 for _i in range(4)]
+
+        self.assertEqual([0, 0, 0.5, 1.0], waits)
+
+    def test_refill(self):
+        limiter = ratelimit.RateLimiter(rate=2, burst=2)
+        for _i in range(3):
+            limiter.reserve('http://climate/v1')
+
+        self.now += 10
+        self.assertEqual(0, limiter.reserve('http://climate/v1'))
+        self.assertEqual(0, limiter.reserve('http://climate/v1'))
+
+    def test_per_endpoint(self):
+        limiter = ratelimit.RateLimiter(rate=1)
+
+        self.assertEqual(0, limiter.reserve('http://climate1/v1'))
+        self.assertEqual(0, limiter.reserve('http://climate2/v1'))
+        self.assertEqual(1, limiter.reserve('http://climate1/v1/leases'))
+
+    def test_acquire_sleeps(self):
+        limiter = ratelimit.RateLimiter(rate=4)
+        limiter.acquire('http://climate/v1')
+
+        self.assertEqual(0.25, limiter.acquire('http://climate/v1'))
+        self.sleep.assert_called_once_with(0.25)
+
+    def test_threads(self):
+        limiter = ratelimit.RateLimiter(rate=10, burst=1)
+        waits = []
+
+        def reserve():
+            waits.append(limiter.reserve('http://climate/v1'))
+
+        threads = [threading.Thread(target=reserve) for _i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([i / 10.0 for i in range(10)],
+                         [round(w, 6) for w in sorted(waits)])
+
+    def test_shared_file(self):
+        path = os.path.join(tempfile.mkdtemp(), 'ratelimit')
+        limiter1 = ratelimit.RateLimiter(rate=1, path=path)
+        limiter2 = ratelimit.RateLimiter(rate=1, path=path)
+
+        self.assertEqual(0, limiter1.reserve('http://climate/v1'))
+        self.assertEqual(1, limiter2.reserve('http://climate/v1'))
+        self.assertEqual(2, limiter1.reserve('http://climate/v1'))
+        self.assertEqual(1, len([f for f in os.listdir(path)
+                                 if f.endswith('.json')]))
+
+
+class RateLimitedRequestTestCase(tests.TestCase):
+
+    def test_throttle_timing(self):
+        limiter = mock.Mock()
+        limiter.acquire.return_value = 0.5
+        manager = base.BaseClientManager('http://climate/v1', 'token',
+                                         rate_limiter=limiter)
+        hook = mock.Mock()
+        manager.hooks = [hook]
+        send_once = self.patch(manager, '_send_once')
+        send_once.return_value = mock.Mock(status_code=200, text='{}',
+                                           content=b'{}')
+
+        manager.request('/leases', 'GET')
+
+        limiter.acquire.assert_called_once_with('http://climate/v1')
+        event = hook.post_response.call_args[0][0]
+        self.assertEqual(0.5, event.timings['throttle'])
@@ -0,0 +1,66 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+from climateclient import retry
+from climateclient import tests
+
+
+class RetryPolicyTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(RetryPolicyTestCase, self).setUp()
+
+        self.policy = retry.RetryPolicy(max_attempts=3, backoff_factor=1,
+                                        max_backoff=3, jitter=False)
+
+    def test_should_retry_status(self):
+        self.assertTrue(self.policy.should_retry(1, 'GET', 503))
+        self.assertTrue(self.policy.should_retry(2, 'delete', 502))
+        self.assertFalse(self.policy.should_retry(3, 'GET', 503))
+        self.assertFalse(self.policy.should_retry(1, 'GET', 500))
+        self.assertFalse(self.policy.should_retry(1, 'POST', 503))
+
+    def test_should_retry_connection_error(self):
+        self.assertTrue(self.policy.should_retry(1, 'PUT',
+                                                 connection_error=True))
+        self.assertFalse(self.policy.should_retry(1, 'POST',
+                                                  connection_error=True))
+
+    def test_should_retry_busy_conflict(self):
+        self.assertFalse(self.policy.should_retry(1, 'PUT', 409, {}))
+        self.assertTrue(self.policy.should_retry(1, 'PUT', 409,
+                                                 {'Retry-After': '1'}))
+
+    def test_backoff(self):
+        self.assertEqual([1, 2, 3, 3],
+                         [self.policy.backoff(a) for a in range(1, 5)])
+
+    def test_backoff_jitter(self):
+        self.policy.jitter = True
+        for _i in range(20):
+            self.assertTrue(0 <= self.policy.backoff(2) <= 2)
+
+    def test_backoff_retry_after(self):
+        self.assertEqual(2.5, self.policy.backoff(1, {'Retry-After': '2.5'}))
+        self.assertEqual(3, self.policy.backoff(1, {'Retry-After': '60'}))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(5, retry.parse_retry_after('5'))
+        self.assertIsNone(retry.parse_retry_after('soon'))
+        date = time.strftime('%a, %d %b %Y %H:%M:%S GMT',
+                             time.gmtime(time.time() + 100))
+        self.assertTrue(90 < retry.parse_retry_after(date) <= 100)
@@ -13,9 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
 import re
 import six
+import subprocess
 import sys
+import tempfile
 
 import fixtures
 #note(n.s.): you may need it later
@@ -25,9 +28,16 @@ import testtools
 #note(n.s.): you may need it later
 #from climateclient import client as climate_client
 #from climateclient import exception
+from climateclient.openstack.common import timeutils
 from climateclient import shell
 from climateclient import tests
 
+# NOTE: slow modules the shell must not import before running a command,
+#       which is what keeps its startup fast.
+LAZY_MODULES = ('keystoneclient', 'requests', 'pbr.version',
+                'climateclient.v1.shell_commands.leases',
+                'climateclient.v1.shell_commands.hosts')
+
 FAKE_ENV = {'OS_USERNAME': 'username',
             'OS_PASSWORD': 'password',
             'OS_TENANT_NAME': 'tenant_name',
@@ -92,3 +102,79 @@ class ClimateShellTestCase(tests.TestCase):
         obj.options.os_cacert = 'cert'
 
         obj.authenticate_user()
+
+    def test_authenticate_user_token_cache(self):
+        self.make_env()
+        self.useFixture(fixtures.EnvironmentVariable('XDG_CACHE_HOME',
+                                                     tempfile.mkdtemp()))
+        expires = timeutils.utcnow() + datetime.timedelta(hours=1)
+        keystone_auth = self.patch(shell.ClimateShell,
+                                   '_keystone_authenticate')
+        keystone_auth.return_value = ('token', 'http://climate', expires)
+
+        for _i in range(2):
+            obj = shell.ClimateShell()
+            obj.options, _argv = obj.parser.parse_known_args([])
+            obj.authenticate_user()
+
+        self.assertEqual(1, keystone_auth.call_count)
+        self.assertTrue(obj.cached_token)
+        self.assertEqual('token', obj.client.lease.auth_token)
+
+        obj.authenticate_user(use_token_cache=False)
+        self.assertEqual(2, keystone_auth.call_count)
+        self.assertFalse(obj.cached_token)
+
+    def test_lazy_imports(self):
+        code = ('import sys, climateclient.shell; '
+                'print(" ".join(m for m in %r if m in sys.modules))'
+                % (LAZY_MODULES,))
+        output = subprocess.check_output([sys.executable, '-c', code])
+        self.assertEqual('', output.decode('utf-8').strip())
+
+    def test_commands_loaded_when_run(self):
+        self.climate_shell.command_manager.add_command(
+            'lease-list', shell.COMMANDS_V1['lease-list'])
+        cmd_factory, cmd_name, sub_argv = (
+            self.climate_shell.command_manager.find_command(['lease-list']))
+        self.assertEqual('lease-list', cmd_name)
+        self.assertEqual('ListLeases', cmd_factory.__name__)
+
+    def test_bash_completion_cache(self):
+        self.useFixture(fixtures.EnvironmentVariable('XDG_CACHE_HOME',
+                                                     tempfile.mkdtemp()))
+        self.climate_shell.command_manager.add_command(
+            'lease-list', shell.COMMANDS_V1['lease-list'])
+        completion_words = self.patch(shell.ClimateShell, '_completion_words')
+        completion_words.return_value = 'lease-list --limit'
+        stdout = self.useFixture(fixtures.StringStream('stdout')).stream
+        self.useFixture(fixtures.MonkeyPatch('sys.stdout', stdout))
+
+        self.climate_shell._bash_completion()
+        path = self.climate_shell._completion_cache_path()
+        self.climate_shell._bash_completion()
+
+        self.assertEqual(1, completion_words.call_count)
+        stdout.seek(0)
+        self.assertEqual(['lease-list --limit'] * 2,
+                         stdout.read().splitlines())
+
+        self.climate_shell.command_manager.add_command(
+            'lease-show', shell.COMMANDS_V1['lease-show'])
+        self.assertNotEqual(path,
+                            self.climate_shell._completion_cache_path())
+
+    def test_completion_words(self):
+        self.climate_shell.command_manager.add_command(
+            'lease-list', shell.COMMANDS_V1['lease-list'])
+        words = self.climate_shell._completion_words().split()
+        for word in ('lease-list', '--limit', '--os-auth-url'):
+            self.assertIn(word, words)
+
+    def test_cache_env_flags(self):
+        self.make_env(fake_env={'CLIMATECLIENT_HTTP_CACHE': 'false',
+                                'CLIMATECLIENT_NO_TOKEN_CACHE': 'yes'})
+        parser = self.climate_shell.build_option_parser('', '')
+        parsed_args = parser.parse_args([])
+        self.assertFalse(parsed_args.http_cache)
+        self.assertFalse(parsed_args.token_cache)
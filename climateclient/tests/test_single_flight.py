@@ -0,0 +1,95 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+
+from climateclient import single_flight
+from climateclient import tests
+
+
+class SingleFlightTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(SingleFlightTestCase, self).setUp()
+
+        self.flight = single_flight.SingleFlight()
+        self.release = threading.Event()
+        self.calls = []
+
+    def _call(self, key, error=None):
+        def func():
+            self.calls.append(key)
+            self.release.wait(5)
+            if error is not None:
+                raise error
+            return 'result of %s' % key
+        return func
+
+    def _run_concurrently(self, funcs_by_key):
+        outcomes = {}
+
+        def run(index, key, func):
+            try:
+                outcomes[index] = self.flight.do(key, func)
+            except Exception as e:
+                outcomes[index] = e
+
+        threads = [threading.Thread(target=run, args=(index, key, func))
+                   for index, (key, func) in enumerate(funcs_by_key)]
+        for thread in threads:
+            thread.start()
+        while (self.flight.in_flight() <
+               len(set(key for key, _func in funcs_by_key))):
+            time.sleep(0.001)
+        # NOTE: let the waiters register before the calls finish.
+        while self.flight.shared < len(funcs_by_key) - len(self.calls):
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+        return [outcomes[index] for index in range(len(funcs_by_key))]
+
+    def test_identical_calls_shared(self):
+        outcomes = self._run_concurrently(
+            [('a', self._call('a')) for _i in range(5)])
+
+        self.assertEqual(['result of a'] * 5, outcomes)
+        self.assertEqual(['a'], self.calls)
+        self.assertEqual(4, self.flight.shared)
+        self.assertEqual(0, self.flight.in_flight())
+
+    def test_different_keys_not_shared(self):
+        outcomes = self._run_concurrently(
+            [('a', self._call('a')), ('b', self._call('b'))])
+
+        self.assertEqual(['result of a', 'result of b'], outcomes)
+        self.assertEqual(['a', 'b'], sorted(self.calls))
+
+    def test_error_propagated(self):
+        error = ValueError('boom')
+        outcomes = self._run_concurrently(
+            [('a', self._call('a', error)) for _i in range(3)])
+
+        self.assertEqual([error] * 3, outcomes)
+        self.assertEqual(['a'], self.calls)
+
+    def test_not_cached(self):
+        self.release.set()
+
+        self.flight.do('a', self._call('a'))
+        self.flight.do('a', self._call('a'))
+
+        self.assertEqual(['a', 'a'], self.calls)
@@ -0,0 +1,80 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import os
+import stat
+import tempfile
+
+from climateclient.openstack.common import timeutils
+from climateclient import tests
+from climateclient import token_cache
+
+
+class TokenCacheTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(TokenCacheTestCase, self).setUp()
+
+        self.path = os.path.join(tempfile.mkdtemp(), 'cache', 'tokens.json')
+        self.cache = token_cache.TokenCache(self.path, early_expiry=60)
+        self.key = token_cache.TokenCache.key('http://keystone', 'user',
+                                              tenant_name='tenant')
+        self.now = datetime.datetime(2014, 1, 1)
+        timeutils.set_time_override(self.now)
+        self.addCleanup(timeutils.clear_time_override)
+
+    def test_set_get(self):
+        self.cache.set(self.key, 'token', self.now +
+                       datetime.timedelta(hours=1), 'http://climate')
+
+        entry = token_cache.TokenCache(self.path).get(self.key)
+
+        self.assertEqual('token', entry['token'])
+        self.assertEqual('http://climate', entry['endpoint'])
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_get_expiring_soon(self):
+        self.cache.set(self.key, 'token', self.now +
+                       datetime.timedelta(seconds=30), 'http://climate')
+
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_key_scope(self):
+        other = token_cache.TokenCache.key('http://keystone', 'user',
+                                           tenant_name='tenant',
+                                           region_name='region')
+        self.cache.set(self.key, 'token', self.now +
+                       datetime.timedelta(hours=1), 'http://climate')
+
+        self.assertNotEqual(self.key, other)
+        self.assertIsNone(self.cache.get(other))
+
+    def test_invalidate(self):
+        self.cache.set(self.key, 'token', self.now +
+                       datetime.timedelta(hours=1), 'http://climate')
+
+        self.cache.invalidate(self.key)
+
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_lock(self):
+        with self.cache.lock():
+            self.cache.set(self.key, 'token', self.now +
+                           datetime.timedelta(hours=1), 'http://climate')
+        self.assertEqual('token', self.cache.get(self.key)['token'])
@@ -0,0 +1,165 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import json
+import os
+import stat
+import tempfile
+
+import mock
+
+from climateclient import exception
+from climateclient import tests
+from climateclient import utils
+
+LEASE_ID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+
+class FindResourceTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(FindResourceTestCase, self).setUp()
+
+        self.client = mock.MagicMock()
+
+    def test_find_by_id(self):
+        self.assertEqual(LEASE_ID, utils.find_resource_id_by_name_or_id(
+            self.client, 'lease', LEASE_ID))
+        self.client.lease.get.assert_called_once_with(LEASE_ID)
+        self.assertFalse(self.client.lease.list.called)
+
+    def test_find_by_id_not_found(self):
+        self.client.lease.get.side_effect = (
+            exception.ClimateClientException('ERROR', code=404))
+        self.assertRaises(exception.ClimateClientException,
+                          utils.find_resource_id_by_name_or_id,
+                          self.client, 'lease', LEASE_ID)
+
+    def test_find_by_name(self):
+        self.client.lease.list.return_value = [{'id': LEASE_ID,
+                                                'name': 'lease1'}]
+        self.assertEqual(LEASE_ID, utils.find_resource_id_by_name_or_id(
+            self.client, 'lease', 'lease1'))
+
+    def test_find_by_name_with_index(self):
+        index = mock.MagicMock()
+        index.resolve.return_value = LEASE_ID
+        self.assertEqual(LEASE_ID, utils.find_resource_id_by_name_or_id(
+            self.client, 'lease', 'lease1', name_index=index))
+        index.resolve.assert_called_once_with(self.client, 'lease', 'lease1',
+                                              fresh=False)
+        self.assertFalse(self.client.lease.list.called)
+
+    def test_find_by_names(self):
+        self.client.lease.list.return_value = [{'id': LEASE_ID,
+                                                'name': 'lease1'},
+                                               {'id': 'id2', 'name': 'lease2'}]
+        self.assertEqual({'lease1': [LEASE_ID], 'lease3': []},
+                         utils.find_resource_ids_by_names(
+                             self.client, 'lease', ['lease1', 'lease3']))
+        self.client.lease.list.assert_called_once_with()
+
+
+class IterJsonArrayTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(IterJsonArrayTestCase, self).setUp()
+
+        self.leases = [{'id': i, 'name': u'lease\xe9%d' % i, 'value': 12345}
+                       for i in range(20)]
+        self.document = json.dumps({'other': {'leases': [1]},
+                                    'leases': self.leases,
+                                    'after': None}).encode('utf-8')
+
+    def test_iter(self):
+        for size in (1, 7, len(self.document)):
+            chunks = [self.document[i:i + size]
+                      for i in range(0, len(self.document), size)]
+            self.assertEqual(self.leases,
+                             list(utils.iter_json_array(chunks, 'leases')))
+
+    def test_iter_empty(self):
+        self.assertEqual([], list(utils.iter_json_array([b'{"leases": []}'],
+                                                        'leases')))
+        self.assertEqual([], list(utils.iter_json_array([b'{}'], 'leases')))
+
+    def test_iter_split_number(self):
+        self.assertEqual([1, 234], list(utils.iter_json_array(
+            [b'{"leases": [1, 23', b'4]}'], 'leases')))
+
+    def test_iter_invalid(self):
+        self.assertRaises(ValueError, list,
+                          utils.iter_json_array([b'{"leases": [{"a"'],
+                                                'leases'))
+
+
+class ParseDateTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(ParseDateTestCase, self).setUp()
+
+        utils._DATE_CACHE.clear()
+        self.addCleanup(utils._DATE_CACHE.clear)
+
+    def test_lease_date(self):
+        self.assertEqual(datetime.datetime(2014, 1, 2, 3, 4, 5, 600000),
+                         utils.parse_date('2014-01-02T03:04:05.6'))
+        self.assertEqual(datetime.datetime(2014, 1, 2, 3, 4, 5, 6),
+                         utils.parse_date('2014-01-02T03:04:05.000006'))
+
+    def test_api_date(self):
+        self.assertEqual(datetime.datetime(2014, 1, 2, 3, 4),
+                         utils.parse_date('2014-01-02 03:04',
+                                          utils.API_DATE_FORMAT))
+
+    def test_same_as_strptime(self):
+        for value, date_format in (
+                ('2014-1-2T3:04:05.000000', utils.LEASE_DATE_FORMAT),
+                ('2014-1-2 3:04', utils.API_DATE_FORMAT),
+                ('02/01/2014', '%d/%m/%Y')):
+            self.assertEqual(
+                datetime.datetime.strptime(value, date_format),
+                utils.parse_date(value, date_format))
+
+    def test_invalid(self):
+        for value, date_format in (
+                ('2014-02-30T00:00:00.000000', utils.LEASE_DATE_FORMAT),
+                ('2014-01-02T03:04:05', utils.LEASE_DATE_FORMAT),
+                ('2014-01-02 +3:04', utils.API_DATE_FORMAT),
+                ('2014-01-02T03:04', utils.API_DATE_FORMAT)):
+            self.assertRaises(ValueError, utils.parse_date, value,
+                              date_format)
+
+    def test_memoized(self):
+        date = utils.parse_date('2014-01-02 00:00', utils.API_DATE_FORMAT)
+
+        self.assertIs(date, utils.parse_date('2014-01-02 00:00',
+                                             utils.API_DATE_FORMAT))
+
+
+class WritePrivateFileTestCase(tests.TestCase):
+
+    def test_write(self):
+        path = os.path.join(tempfile.mkdtemp(), 'cache', 'data.json')
+
+        utils.write_private_file(path, '{}')
+
+        with open(path) as f:
+            self.assertEqual('{}', f.read())
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(path).st_mode))
+        self.assertEqual(0o700, stat.S_IMODE(
+            os.stat(os.path.dirname(path)).st_mode))
+        self.assertEqual(['data.json'], os.listdir(os.path.dirname(path)))
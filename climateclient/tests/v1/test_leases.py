@@ -0,0 +1,200 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import mock
+from six.moves.urllib import parse
+
+from climateclient import base
+from climateclient import exception
+from climateclient import tests
+from climateclient.v1 import leases
+from climateclient.v1.shell_commands import leases as lease_commands
+
+LEASE = {'id': 'lease_id',
+         'start_date': '2014-01-01T00:00:00.000000',
+         'end_date': '2014-01-02T00:00:00.000000'}
+
+
+class LeaseClientManagerTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(LeaseClientManagerTestCase, self).setUp()
+
+        self.manager = leases.LeaseClientManager('www.fake.com', 'token')
+        self.get = self.patch(self.manager, 'get')
+        self.get.return_value = dict(LEASE)
+        self.update = self.patch(self.manager, '_update')
+
+    def test_update_fetches_lease(self):
+        self.manager.update('lease_id', prolong_for='1d')
+
+        self.get.assert_called_once_with('lease_id')
+        self.update.assert_called_once_with(
+            '/leases/lease_id', {'end_date': '2014-01-03 00:00'},
+            response_key='lease')
+
+    def test_update_relative_dates(self):
+        self.manager.update('lease_id', name='name', defer_by='1h',
+                            relative_dates=True)
+
+        self.assertFalse(self.get.called)
+        self.update.assert_called_once_with(
+            '/leases/lease_id', {'name': 'name', 'defer_by': '1h'},
+            response_key='lease')
+
+    def test_update_conflict_not_retried(self):
+        self.update.side_effect = exception.ClimateClientException(
+            'ERROR', code=409)
+
+        self.assertRaises(exception.ClimateClientException,
+                          self.manager.update, 'lease_id', prolong_for='1d')
+        self.assertEqual(1, self.update.call_count)
+
+    def test_update_nothing(self):
+        self.assertEqual('No values to update passed.',
+                         self.manager.update('lease_id'))
+        self.assertFalse(self.update.called)
+
+
+class LeaseListTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(LeaseListTestCase, self).setUp()
+
+        self.manager = leases.LeaseClientManager('www.fake.com', 'token')
+        self.leases = [
+            {'id': '1', 'name': 'a', 'status': 'ACTIVE',
+             'start_date': '2014-01-01T00:00:00.000000',
+             'end_date': '2014-01-02T00:00:00.000000'},
+            {'id': '2', 'name': 'b', 'status': 'PENDING',
+             'start_date': '2014-01-03T00:00:00.000000',
+             'end_date': '2014-01-04T00:00:00.000000'},
+            {'id': '3', 'name': 'c', 'status': 'ACTIVE',
+             'start_date': '2014-01-05T00:00:00.000000',
+             'end_date': '2014-01-06T00:00:00.000000'},
+        ]
+        self._get = self.patch(self.manager, '_get')
+        self._get.return_value = self.leases
+
+    def test_list_filters_sent(self):
+        self.manager.list(name='a', status='ACTIVE', project_id='p')
+
+        self._get.assert_called_once_with(
+            '/leases?name=a&project_id=p&status=ACTIVE', 'leases')
+
+    def test_list_filters_fallback(self):
+        self.assertEqual(['1', '3'], [l['id'] for l in self.manager.list(
+            status='ACTIVE')])
+
+    def test_list_window_fallback(self):
+        leases = self.manager.list(start=datetime.datetime(2014, 1, 1, 12),
+                                   end='2014-01-05 00:00')
+
+        self.assertEqual(['1', '2'], [l['id'] for l in leases])
+        self.assertEqual(
+            '/leases?end=2014-01-05+00%3A00&start=2014-01-01+12%3A00',
+            self._get.call_args[0][0])
+
+    def test_list_filters_limit_fallback(self):
+        def get(url, key):
+            # NOTE: a server paginating but ignoring the filters.
+            query = dict(parse.parse_qsl(parse.urlparse(url).query))
+            leases = self.leases
+            if 'marker' in query:
+                leases = leases[int(query['marker']):]
+            return leases[:int(query['limit'])]
+
+        self._get.side_effect = get
+
+        leases = list(self.manager.paginate(page_size=1, status='ACTIVE',
+                                            limit=2))
+        self.assertEqual(['1', '3'], [l['id'] for l in leases])
+        self.assertEqual(3, self._get.call_count)
+
+        leases = self.manager.list(status='ACTIVE', limit=2)
+
+        self.assertEqual(['1', '3'], [l['id'] for l in leases])
+
+    def test_list_invalid_date(self):
+        self.assertRaises(exception.IncorrectLease, self.manager.list,
+                          start='yesterday')
+        self.assertFalse(self._get.called)
+
+    def test_list_filters_limit_page_size(self):
+        self.manager.list(name='a', limit=1)
+
+        self._get.assert_called_once_with(
+            '/leases?limit=%d&name=a' % base.DEFAULT_PAGE_SIZE, 'leases')
+
+
+class ListLeasesTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(ListLeasesTestCase, self).setUp()
+
+        self.command = lease_commands.ListLeases(mock.MagicMock(), [])
+        self.parser = self.command.get_parser('lease-list')
+
+    def test_args2body_dates(self):
+        parsed_args = self.parser.parse_args(
+            ['--start-date', '2014-01-01 12:00', '--status', 'ACTIVE'])
+
+        body = self.command.args2body(parsed_args)
+        self.assertEqual(datetime.datetime(2014, 1, 1, 12), body['start'])
+        self.assertEqual('ACTIVE', body['status'])
+
+    def test_args2body_invalid_date(self):
+        for args in (['--end-date', '2014-01-01'],
+                     ['--start-date', '2014-01-02 00:00',
+                      '--end-date', '2014-01-01 00:00']):
+            self.assertRaises(exception.IncorrectLease,
+                              self.command.args2body,
+                              self.parser.parse_args(args))
+
+    def test_stream(self):
+        parsed_args = self.parser.parse_args(['--stream'])
+
+        self.command.retrieve_list(parsed_args)
+        self.command.app.client.lease.iter_list.assert_called_once_with()
+
+    def test_stream_with_options(self):
+        for args in (['--status', 'ACTIVE'], ['--limit', '2'],
+                     ['--sort-by', 'id'], ['--page-size', '10']):
+            self.assertRaises(exception.ClimateClientException,
+                              self.command.retrieve_list,
+                              self.parser.parse_args(['--stream'] + args))
+        self.assertFalse(self.command.app.client.lease.iter_list.called)
+
+    def test_default_sort(self):
+        self.command.retrieve_list(self.parser.parse_args([]))
+
+        self.command.app.client.lease.list.assert_called_once_with(
+            sort_key='name')
+
+    def test_page_size_filters(self):
+        parsed_args = self.parser.parse_args(
+            ['--page-size', '10', '--status', 'ACTIVE', '--limit', '5'])
+
+        self.command.retrieve_list(parsed_args)
+        self.command.app.client.lease.paginate.assert_called_once_with(
+            page_size=10, status='ACTIVE', limit=5, sort_key='name')
+
+    def test_positive_int_options(self):
+        for option in ('--limit', '--page-size'):
+            for value in ('0', '-1', 'x'):
+                self.assertRaises(SystemExit, self.parser.parse_args,
+                                  [option, value])
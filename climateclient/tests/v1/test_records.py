@@ -0,0 +1,108 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+from climateclient import tests
+from climateclient import utils
+from climateclient.v1 import hosts
+from climateclient.v1 import leases
+from climateclient.v1 import records
+
+LEASE = {'id': 'lease_id', 'name': 'lease', 'status': 'ACTIVE',
+         'project_id': 'project_id',
+         'start_date': '2014-01-01T00:00:00.000000',
+         'end_date': '2014-01-02T00:00:00.000000',
+         'reservations': [{'id': 'reservation_id', 'lease_id': 'lease_id',
+                           'resource_type': 'physical:host'}],
+         'events': [{'id': 'event_id', 'event_type': 'start_lease',
+                     'time': '2014-01-01T00:00:00.000000'}],
+         'degraded': False}
+
+
+class RecordTestCase(tests.TestCase):
+
+    def setUp(self):
+        super(RecordTestCase, self).setUp()
+
+        self.lease = records.Lease(LEASE)
+
+    def test_dict_access(self):
+        self.assertEqual('lease', self.lease['name'])
+        self.assertEqual('lease', self.lease.name)
+        self.assertIsNone(self.lease.get('trust_id'))
+        self.assertNotIn('trust_id', self.lease)
+        self.assertRaises(KeyError, lambda: self.lease['trust_id'])
+        self.assertRaises(AttributeError, getattr, self.lease, 'trust_id')
+        self.assertEqual(sorted(LEASE), sorted(self.lease))
+        self.assertEqual(len(LEASE), len(self.lease))
+
+    def test_extras(self):
+        self.assertFalse(self.lease['degraded'])
+        self.assertFalse(self.lease.degraded)
+
+    def test_no_instance_dict(self):
+        self.assertRaises(AttributeError, setattr, self.lease, 'other', 1)
+
+    def test_nested(self):
+        reservation = self.lease['reservations'][0]
+        self.assertIsInstance(reservation, records.Reservation)
+        self.assertEqual('physical:host', reservation['resource_type'])
+        self.assertIsInstance(self.lease.events[0], records.Event)
+
+    def test_to_dict(self):
+        self.assertEqual(LEASE, self.lease.to_dict())
+        self.assertEqual(self.lease, LEASE)
+        self.assertEqual(self.lease, records.Lease(LEASE))
+
+    def test_interned(self):
+        other = records.Lease(dict(LEASE, status=''.join(['ACT', 'IVE'])))
+        self.assertIs(self.lease.status, other.status)
+
+    def test_date(self):
+        self.assertEqual(datetime.datetime(2014, 1, 2),
+                         self.lease.date('end_date'))
+        self.assertIs(self.lease.date('end_date'),
+                      self.lease.date('end_date'))
+        self.assertEqual('2014-01-02T00:00:00.000000',
+                         self.lease['end_date'])
+        self.assertIsNone(self.lease.date('updated_at'))
+        self.assertRaises(KeyError, self.lease.date, 'name')
+
+    def test_get_item_properties(self):
+        self.assertEqual(('lease_id', 'lease', ''),
+                         utils.get_item_properties(
+                             self.lease, ('id', 'name', 'trust_id')))
+
+
+class ManagerRecordsTestCase(tests.TestCase):
+
+    def test_lease_list(self):
+        manager = leases.LeaseClientManager('www.fake.com', 'token')
+        self.patch(manager, '_get').return_value = [dict(LEASE)]
+
+        self.assertEqual([dict(LEASE)], manager.list())
+        result = manager.list(as_records=True)
+        self.assertIsInstance(result[0], records.Lease)
+        self.assertEqual([LEASE], result)
+
+    def test_host_iter_list(self):
+        manager = hosts.ComputeHostClientManager('www.fake.com', 'token')
+        self.patch(manager, '_iter').return_value = iter(
+            [{'id': '1', 'hypervisor_hostname': 'host', 'gpu': 'k80'}])
+
+        host, = list(manager.iter_list(as_records=True))
+        self.assertIsInstance(host, records.Host)
+        self.assertEqual('k80', host['gpu'])
@@ -0,0 +1,102 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import logging
+import os
+
+from climateclient.openstack.common import timeutils
+from climateclient import utils
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_EARLY_EXPIRY = 300
+
+
+class TokenCache(object):
+    """File cache of Keystone tokens and Climate endpoints.
+
+    Entries are keyed by auth URL, user, tenant and region, and hold the
+    token, its expiry date and the reservation endpoint of the catalog. An
+    entry expiring within early_expiry seconds is not returned, so that the
+    token is renewed before the server can reject it.
+
+    The file is only readable by its owner. Concurrent invocations should
+    hold ``lock()`` while they look up and renew an entry, so that a single
+    one of them authenticates.
+    """
+
+    def __init__(self, path, early_expiry=DEFAULT_EARLY_EXPIRY):
+        self.path = path
+        self.early_expiry = early_expiry
+
+    @staticmethod
+    def key(auth_url, username, tenant_id=None, tenant_name=None,
+            region_name=None):
+        """Returns the key of the entry of a user."""
+        scope = '|'.join([auth_url or '', username or '', tenant_id or '',
+                          tenant_name or '', region_name or ''])
+        return hashlib.sha1(scope.encode('utf-8')).hexdigest()
+
+    def lock(self):
+        """Returns an inter-process lock of the cache file."""
+        return utils.inter_process_lock(self.path)
+
+    def get(self, key):
+        """Returns the entry of a key, None if missing or expiring soon.
+
+        :returns: Dict with the token, expires and endpoint keys.
+        :rtype: dict
+        """
+        entry = self._load().get(key)
+        if entry is None:
+            return None
+        try:
+            expires = timeutils.parse_isotime(entry['expires'])
+        except (KeyError, ValueError):
+            return None
+        if timeutils.is_soon(expires, self.early_expiry):
+            return None
+        return entry
+
+    def set(self, key, token, expires, endpoint):
+        """Records the token of a key, expires being a datetime."""
+        entries = self._load()
+        entries[key] = {'token': token, 'expires': timeutils.isotime(expires),
+                        'endpoint': endpoint}
+        self._save(entries)
+
+    def invalidate(self, key):
+        """Forgets the token of a key, e.g. after the server rejected it."""
+        entries = self._load()
+        if entries.pop(key, None) is not None:
+            self._save(entries)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, ValueError) as e:
+            LOG.debug('Ignoring unreadable token cache %s: %s', self.path, e)
+            return {}
+
+    def _save(self, entries):
+        try:
+            utils.write_private_file(self.path, json.dumps(entries))
+        except (IOError, OSError) as e:
+            LOG.debug('Unable to write token cache %s: %s', self.path, e)
@@ -0,0 +1,242 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""asyncio flavour of the v1 client.
+
+This module needs Python 3.6+ and aiohttp.
+"""
+
+import asyncio
+
+from climateclient import async_base
+from climateclient import base
+from climateclient.openstack.common.gettextutils import _  # noqa
+from climateclient.v1 import leases
+from climateclient.v1 import records
+
+
+class AsyncLeaseClientManager(async_base.AsyncBaseClientManager):
+    """Manager for the lease connected requests."""
+
+    record_class = records.Lease
+
+    async def create(self, name, start, end, reservations, events):
+        """Creates lease from values passed."""
+        values = {'name': name, 'start_date': start, 'end_date': end,
+                  'reservations': reservations, 'events': events}
+
+        return await self._create('/leases', values, 'lease')
+
+    async def get(self, lease_id):
+        """Describes lease specifications."""
+        return await self._get('/leases/%s' % lease_id, 'lease')
+
+    async def update(self, lease_id, name=None, prolong_for=None,
+                     reduce_by=None, advance_by=None, defer_by=None,
+                     relative_dates=False):
+        """Update attributes of the lease.
+
+        See climateclient.v1.leases.LeaseClientManager.update.
+        """
+        values = {}
+        if name:
+            values['name'] = name
+        date_changes = {'prolong_for': prolong_for, 'reduce_by': reduce_by,
+                        'advance_by': advance_by, 'defer_by': defer_by}
+
+        if relative_dates:
+            values.update((k, v) for k, v in date_changes.items() if v)
+        elif any(date_changes.values()):
+            leases.add_lease_dates(values, await self.get(lease_id),
+                                   **date_changes)
+
+        if not values:
+            return _('No values to update passed.')
+        return await self._update('/leases/%s' % lease_id, values,
+                                  response_key='lease')
+
+    async def delete(self, lease_id):
+        """Deletes lease with specified ID."""
+        await self._delete('/leases/%s' % lease_id)
+
+    async def get_many(self, lease_ids):
+        """Describes several leases concurrently."""
+        return await self._run_many(self.get, lease_ids)
+
+    async def update_many(self, lease_ids, **kwargs):
+        """Applies the same update to several leases concurrently."""
+        return await self._run_many(
+            lambda lease_id: self.update(lease_id, **kwargs), lease_ids)
+
+    async def delete_many(self, lease_ids):
+        """Deletes several leases concurrently."""
+        return await self._run_many(self.delete, lease_ids)
+
+    async def list(self, sort_by=None, limit=None, marker=None,
+                   sort_key=None, sort_dir=None, name=None, status=None,
+                   project_id=None, start=None, end=None, as_records=False):
+        """List leases.
+
+        See climateclient.v1.leases.LeaseClientManager.list.
+        """
+        result = await self._list('/leases', 'leases', limit=limit,
+                                  marker=marker,
+                                  sort_key=sort_key or sort_by,
+                                  sort_dir=sort_dir,
+                                  filters=leases.lease_filters(
+                                      name, status, project_id, start, end))
+        return self._as_records(result, as_records)
+
+    def paginate(self, page_size=base.DEFAULT_PAGE_SIZE, limit=None,
+                 marker=None, sort_key=None, sort_dir=None, name=None,
+                 status=None, project_id=None, start=None, end=None,
+                 as_records=False):
+        """Iterates asynchronously over leases, page_size per request.
+
+        See climateclient.v1.leases.LeaseClientManager.paginate.
+        """
+        result = self._paginate('/leases', 'leases', page_size=page_size,
+                                limit=limit, marker=marker,
+                                sort_key=sort_key, sort_dir=sort_dir,
+                                filters=leases.lease_filters(
+                                    name, status, project_id, start, end))
+        return self._as_records(result, as_records)
+
+    def _filter_locally(self, resources, filters):
+        filters = dict(filters or {})
+        start = filters.pop('start', None)
+        end = filters.pop('end', None)
+        result = super(AsyncLeaseClientManager, self)._filter_locally(
+            resources, filters)
+        return leases.filter_window(result, start, end)
+
+
+class AsyncComputeHostClientManager(async_base.AsyncBaseClientManager):
+    """Manager for the ComputeHost connected requests."""
+
+    record_class = records.Host
+
+    async def create(self, name, **kwargs):
+        """Creates host from values passed."""
+        values = {'name': name}
+        values.update(**kwargs)
+
+        return await self._create('/os-hosts', values, response_key='host')
+
+    async def get(self, host_id):
+        """Describes host specifications such as name and details."""
+        return await self._get('/os-hosts/%s' % host_id, 'host')
+
+    async def update(self, host_id, values):
+        """Update attributes of the host."""
+        if not values:
+            return _('No values to update passed.')
+        return await self._update('/os-hosts/%s' % host_id, values,
+                                  response_key='host')
+
+    async def delete(self, host_id):
+        """Deletes host with specified ID."""
+        await self._delete('/os-hosts/%s' % host_id)
+
+    async def get_many(self, host_ids):
+        """Describes several hosts concurrently."""
+        return await self._run_many(self.get, host_ids)
+
+    async def delete_many(self, host_ids):
+        """Deletes several hosts concurrently."""
+        return await self._run_many(self.delete, host_ids)
+
+    async def list(self, sort_by=None, limit=None, marker=None,
+                   sort_key=None, sort_dir=None, as_records=False):
+        """List hosts.
+
+        See climateclient.v1.hosts.ComputeHostClientManager.list.
+        """
+        hosts = await self._list('/os-hosts', 'hosts', limit=limit,
+                                 marker=marker, sort_key=sort_key or sort_by,
+                                 sort_dir=sort_dir)
+        return self._as_records(hosts, as_records)
+
+    def paginate(self, page_size=base.DEFAULT_PAGE_SIZE, limit=None,
+                 marker=None, sort_key=None, sort_dir=None,
+                 as_records=False):
+        """Iterates asynchronously over hosts, page_size per request.
+
+        See climateclient.v1.hosts.ComputeHostClientManager.paginate.
+        """
+        hosts = self._paginate('/os-hosts', 'hosts', page_size=page_size,
+                               limit=limit, marker=marker,
+                               sort_key=sort_key, sort_dir=sort_dir)
+        return self._as_records(hosts, as_records)
+
+
+class Client(object):
+    """Top level object to communicate with Climate from asyncio.
+
+    Mirrors climateclient.v1.client.Client, with coroutine methods, except
+    for paginate which returns an asynchronous iterator and iter_list which
+    is not available: streamed listings are not supported. At most
+    max_concurrency requests are in flight at once, whichever manager they
+    come from. The client must be closed, or used as a context manager.
+
+    **Examples**
+        async with Client(climate_url, auth_token) as client:
+            leases = await asyncio.gather(
+                *[client.lease.get(lease_id) for lease_id in lease_ids])
+    """
+
+    def __init__(self, climate_url, auth_token, session=None,
+                 pool_maxsize=base.DEFAULT_POOL_MAXSIZE,
+                 max_concurrency=async_base.DEFAULT_MAX_CONCURRENCY,
+                 retry_policy=None, rate_limiter=None,
+                 timeout=base.DEFAULT_TIMEOUT, circuit_breaker=None):
+        self.climate_url = climate_url
+        self.auth_token = auth_token
+
+        self._own_session = session is None
+        if session is None:
+            session = async_base.create_session(pool_maxsize=pool_maxsize)
+        self.session = session
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker
+
+        manager_kwargs = {'semaphore': self.semaphore,
+                          'retry_policy': self.retry_policy,
+                          'rate_limiter': self.rate_limiter,
+                          'timeout': self.timeout,
+                          'circuit_breaker': self.circuit_breaker}
+        self.lease = AsyncLeaseClientManager(self.climate_url,
+                                             self.auth_token,
+                                             self.session,
+                                             **manager_kwargs)
+        self.host = AsyncComputeHostClientManager(self.climate_url,
+                                                  self.auth_token,
+                                                  self.session,
+                                                  **manager_kwargs)
+
+    async def close(self):
+        """Closes the HTTP session if it was created by the client."""
+        if self._own_session:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
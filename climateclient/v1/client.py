@@ -14,6 +14,7 @@
 # limitations under the License.
 
 
+from climateclient import base
 from climateclient.v1 import hosts
 from climateclient.v1 import leases
 
@@ -31,11 +32,58 @@ class Client(object):
         ...
     """
 
-    def __init__(self, climate_url, auth_token):
+    def __init__(self, climate_url, auth_token, session=None,
+                 pool_connections=base.DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=base.DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 response_cache=None, hooks=None, retry_policy=None,
+                 rate_limiter=None, timeout=base.DEFAULT_TIMEOUT,
+                 circuit_breaker=None, single_flight=None):
         self.climate_url = climate_url
         self.auth_token = auth_token
 
+        # NOTE: all the managers share the same session so that connections
+        #       to the reservation endpoint are kept alive and reused.
+        if session is None:
+            session = base.create_session(pool_connections=pool_connections,
+                                          pool_maxsize=pool_maxsize,
+                                          pool_block=pool_block)
+        self.session = session
+        # NOTE: opt-in cache of GET responses, see cache.ResponseCache.
+        self.response_cache = response_cache
+
+        # NOTE: objects observing every request, see instrumentation.
+        self.hooks = hooks or []
+
+        # NOTE: failed idempotent requests are only retried with a policy,
+        #       see retry.RetryPolicy.
+        self.retry_policy = retry_policy
+
+        # NOTE: optional limit of the request rate, see ratelimit.RateLimiter.
+        self.rate_limiter = rate_limiter
+
+        # NOTE: seconds to wait for a connection and for data, either a
+        #       (connect, read) tuple or one value for both, None for ever.
+        self.timeout = timeout
+
+        # NOTE: optional fail fast while the service is down, see
+        #       circuit_breaker.CircuitBreaker.
+        self.circuit_breaker = circuit_breaker
+
+        # NOTE: optional sharing of identical GETs sent concurrently by
+        #       several threads, see single_flight.SingleFlight.
+        self.single_flight = single_flight
+
+        manager_kwargs = {'session': self.session,
+                          'response_cache': self.response_cache,
+                          'hooks': self.hooks,
+                          'retry_policy': self.retry_policy,
+                          'rate_limiter': self.rate_limiter,
+                          'timeout': self.timeout,
+                          'circuit_breaker': self.circuit_breaker,
+                          'single_flight': self.single_flight}
         self.lease = leases.LeaseClientManager(self.climate_url,
-                                               self.auth_token)
+                                               self.auth_token,
+                                               **manager_kwargs)
         self.host = hosts.ComputeHostClientManager(self.climate_url,
-                                                   self.auth_token)
+                                                   self.auth_token,
+                                                   **manager_kwargs)
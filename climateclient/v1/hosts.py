@@ -15,11 +15,14 @@
 
 from climateclient import base
 from climateclient.openstack.common.gettextutils import _  # noqa
+from climateclient.v1 import records
 
 
 class ComputeHostClientManager(base.BaseClientManager):
     """Manager for the ComputeHost connected requests."""
 
+    record_class = records.Host
+
     def create(self, name, **kwargs):
         """Creates host from values passed."""
         values = {'name': name}
@@ -42,9 +45,46 @@ class ComputeHostClientManager(base.BaseClientManager):
         """Deletes host with specified ID."""
         self._delete('/os-hosts/%s' % host_id)
 
-    def list(self, sort_by=None):
-        """List all hosts."""
-        hosts = self._get('/os-hosts', 'hosts')
-        if sort_by:
-            hosts = sorted(hosts, key=lambda l: l[sort_by])
-        return hosts
+    def get_many(self, host_ids, max_workers=base.DEFAULT_MAX_WORKERS):
+        """Describes several hosts concurrently.
+
+        :returns: One BulkResult per host ID.
+        """
+        return self._run_many(self.get, host_ids, max_workers)
+
+    def delete_many(self, host_ids, max_workers=base.DEFAULT_MAX_WORKERS):
+        """Deletes several hosts concurrently.
+
+        :returns: One BulkResult per host ID.
+        """
+        return self._run_many(self.delete, host_ids, max_workers)
+
+    def iter_list(self, as_records=False):
+        """Iterates over all hosts as they are received, unsorted.
+
+        With as_records, hosts are records.Host instead of dicts.
+        """
+        return self._as_records(self._iter('/os-hosts', 'hosts'), as_records)
+
+    def list(self, sort_by=None, limit=None, marker=None, sort_key=None,
+             sort_dir=None, as_records=False):
+        """List hosts.
+
+        sort_by is kept for compatibility and is a synonym of sort_key. With
+        as_records, hosts are records.Host instead of dicts.
+        """
+        hosts = self._list('/os-hosts', 'hosts', limit=limit, marker=marker,
+                           sort_key=sort_key or sort_by, sort_dir=sort_dir)
+        return self._as_records(hosts, as_records)
+
+    def paginate(self, page_size=base.DEFAULT_PAGE_SIZE, limit=None,
+                 marker=None, sort_key=None, sort_dir=None,
+                 as_records=False):
+        """Iterates over hosts, fetching page_size of them per request.
+
+        With as_records, hosts are records.Host instead of dicts.
+        """
+        hosts = self._paginate('/os-hosts', 'hosts', page_size=page_size,
+                               limit=limit, marker=marker,
+                               sort_key=sort_key, sort_dir=sort_dir)
+        return self._as_records(hosts, as_records)
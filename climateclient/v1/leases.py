@@ -13,15 +13,87 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
+import six
+
 from climateclient import base
+from climateclient import exception
 from climateclient.openstack.common.gettextutils import _  # noqa
 from climateclient.openstack.common import timeutils
 from climateclient import utils
+from climateclient.v1 import records
+
+
+def add_lease_date(values, lease, key, delta_date, positive_delta):
+    """Sets values[key] to the date of the lease moved by delta_date."""
+    delta_sec = utils.from_elapsed_time_to_delta(
+        delta_date,
+        pos_sign=positive_delta)
+    date = utils.parse_date(lease[key], utils.LEASE_DATE_FORMAT)
+    values[key] = timeutils.strtime(date + delta_sec,
+                                    utils.API_DATE_FORMAT)
+
+
+def add_lease_dates(values, lease, prolong_for=None, reduce_by=None,
+                    advance_by=None, defer_by=None):
+    """Sets the dates of the lease moved by the given changes in values."""
+    lease_end_date_change = prolong_for or reduce_by
+    lease_start_date_change = defer_by or advance_by
+
+    if lease_end_date_change:
+        add_lease_date(values, lease, 'end_date', lease_end_date_change,
+                       prolong_for is not None)
+    if lease_start_date_change:
+        add_lease_date(values, lease, 'start_date', lease_start_date_change,
+                       defer_by is not None)
+
+
+def lease_filters(name=None, status=None, project_id=None, start=None,
+                  end=None):
+    """Returns the lease list filters, with dates in the API format.
+
+    Dates given as strings are checked before anything is sent, so that a
+    malformed one fails early with IncorrectLease.
+    """
+    filters = {'name': name, 'status': status, 'project_id': project_id,
+               'start': start, 'end': end}
+    for key in ('start', 'end'):
+        if isinstance(filters[key], six.string_types):
+            try:
+                utils.parse_date(filters[key], utils.API_DATE_FORMAT)
+            except ValueError:
+                raise exception.IncorrectLease(
+                    _("Invalid %(key)s date %(date)s, expected "
+                      "YYYY-MM-DD HH:MM") % {'key': key,
+                                             'date': filters[key]})
+        elif isinstance(filters[key], datetime.datetime):
+            filters[key] = timeutils.strtime(filters[key],
+                                             utils.API_DATE_FORMAT)
+    return filters
+
+
+def filter_window(leases, start=None, end=None):
+    """Returns the leases overlapping the window from start to end.
+
+    start and end are dates in the API format, None for no bound.
+    """
+    if start is not None:
+        start = utils.parse_date(start, utils.API_DATE_FORMAT)
+        leases = [l for l in leases
+                  if utils.parse_date(l['end_date']) > start]
+    if end is not None:
+        end = utils.parse_date(end, utils.API_DATE_FORMAT)
+        leases = [l for l in leases
+                  if utils.parse_date(l['start_date']) < end]
+    return leases
 
 
 class LeaseClientManager(base.BaseClientManager):
     """Manager for the lease connected requests."""
 
+    record_class = records.Lease
+
     def create(self, name, start, end, reservations, events):
         """Creates lease from values passed."""
         values = {'name': name, 'start_date': start, 'end_date': end,
@@ -36,28 +108,24 @@ class LeaseClientManager(base.BaseClientManager):
         return self._get('/leases/%s' % lease_id, 'lease')
 
     def update(self, lease_id, name=None, prolong_for=None, reduce_by=None,
-               advance_by=None, defer_by=None):
-        """Update attributes of the lease."""
+               advance_by=None, defer_by=None, relative_dates=False):
+        """Update attributes of the lease.
+
+        Date changes are relative to the current dates of the lease. If
+        relative_dates is True they are sent as they are for the server to
+        apply them, in a single request. Otherwise the new dates are computed
+        from the lease fetched from the server just before the update.
+        """
         values = {}
         if name:
             values['name'] = name
+        date_changes = {'prolong_for': prolong_for, 'reduce_by': reduce_by,
+                        'advance_by': advance_by, 'defer_by': defer_by}
 
-        lease_end_date_change = prolong_for or reduce_by
-        lease_start_date_change = defer_by or advance_by
-        lease = None
-
-        if lease_end_date_change:
-            lease = self.get(lease_id)
-            self._add_lease_date(values, lease, 'end_date',
-                                 lease_end_date_change,
-                                 prolong_for is not None)
-
-        if lease_start_date_change:
-            if lease is None:
-                lease = self.get(lease_id)
-            self._add_lease_date(values, lease, 'start_date',
-                                 lease_start_date_change,
-                                 defer_by is not None)
+        if relative_dates:
+            values.update((k, v) for k, v in date_changes.items() if v)
+        elif any(date_changes.values()):
+            add_lease_dates(values, self.get(lease_id), **date_changes)
 
         if not values:
             return _('No values to update passed.')
@@ -68,18 +136,75 @@ class LeaseClientManager(base.BaseClientManager):
         """Deletes lease with specified ID."""
         self._delete('/leases/%s' % lease_id)
 
-    def list(self, sort_by=None):
-        """List all leases."""
-        leases = self._get('/leases', 'leases')
-        if sort_by:
-            leases = sorted(leases, key=lambda l: l[sort_by])
-        return leases
-
-    def _add_lease_date(self, values, lease, key, delta_date, positive_delta):
-        delta_sec = utils.from_elapsed_time_to_delta(
-            delta_date,
-            pos_sign=positive_delta)
-        date = timeutils.parse_strtime(lease[key],
-                                       utils.LEASE_DATE_FORMAT)
-        values[key] = timeutils.strtime(date + delta_sec,
-                                        utils.API_DATE_FORMAT)
+    def get_many(self, lease_ids, max_workers=base.DEFAULT_MAX_WORKERS):
+        """Describes several leases concurrently.
+
+        :returns: One BulkResult per lease ID.
+        """
+        return self._run_many(self.get, lease_ids, max_workers)
+
+    def update_many(self, lease_ids, max_workers=base.DEFAULT_MAX_WORKERS,
+                    **kwargs):
+        """Applies the same update to several leases concurrently.
+
+        :returns: One BulkResult per lease ID.
+        """
+        return self._run_many(lambda lease_id: self.update(lease_id,
+                                                           **kwargs),
+                              lease_ids, max_workers)
+
+    def delete_many(self, lease_ids, max_workers=base.DEFAULT_MAX_WORKERS):
+        """Deletes several leases concurrently.
+
+        :returns: One BulkResult per lease ID.
+        """
+        return self._run_many(self.delete, lease_ids, max_workers)
+
+    def iter_list(self, as_records=False):
+        """Iterates over all leases as they are received, unsorted.
+
+        With as_records, leases are records.Lease instead of dicts.
+        """
+        return self._as_records(self._iter('/leases', 'leases'), as_records)
+
+    def list(self, sort_by=None, limit=None, marker=None, sort_key=None,
+             sort_dir=None, name=None, status=None, project_id=None,
+             start=None, end=None, as_records=False):
+        """List leases.
+
+        Only the leases matching all the given filters are listed: name,
+        status and project_id must be equal, and the lease must overlap the
+        window from start to end, dates given as datetimes or as
+        YYYY-MM-DD HH:MM strings.
+
+        sort_by is kept for compatibility and is a synonym of sort_key. With
+        as_records, leases are records.Lease instead of dicts.
+        """
+        leases = self._list('/leases', 'leases', limit=limit, marker=marker,
+                            sort_key=sort_key or sort_by, sort_dir=sort_dir,
+                            filters=lease_filters(name, status, project_id,
+                                                  start, end))
+        return self._as_records(leases, as_records)
+
+    def paginate(self, page_size=base.DEFAULT_PAGE_SIZE, limit=None,
+                 marker=None, sort_key=None, sort_dir=None, name=None,
+                 status=None, project_id=None, start=None, end=None,
+                 as_records=False):
+        """Iterates over leases, fetching page_size of them per request.
+
+        Filters and as_records are the ones of list.
+        """
+        leases = self._paginate('/leases', 'leases', page_size=page_size,
+                                limit=limit, marker=marker,
+                                sort_key=sort_key, sort_dir=sort_dir,
+                                filters=lease_filters(name, status,
+                                                      project_id, start, end))
+        return self._as_records(leases, as_records)
+
+    def _filter_locally(self, resources, filters):
+        filters = dict(filters or {})
+        start = filters.pop('start', None)
+        end = filters.pop('end', None)
+        leases = super(LeaseClientManager, self)._filter_locally(resources,
+                                                                 filters)
+        return filter_window(leases, start, end)
@@ -0,0 +1,227 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact records of the resources of the reservation API.
+
+Listing methods return plain dicts unless called with as_records=True, in
+which case they return these records instead. A record holds its fields in
+__slots__, shares the strings repeated across resources (status, project
+ID...) and parses its dates only when asked to, which makes large lists of
+resources take several times less memory than dicts.
+
+Records can be read like the dicts they replace: record['name'], get(),
+keys(), items() and iteration work the same, as do attributes, so that
+utils.get_item_properties and the table renderers accept both.
+"""
+
+import six
+
+from climateclient.openstack.common import timeutils
+from climateclient import utils
+
+_MISSING = object()
+
+
+def _intern(value):
+    # NOTE: only native strings can be interned.
+    if type(value) is str:
+        return six.moves.intern(value)
+    return value
+
+
+class Record(object):
+    """Resource of the reservation API, built from its dict.
+
+    Subclasses list their fields in FIELDS. Values of INTERNED_FIELDS are
+    interned, DATE_FIELDS can be parsed with date(), and NESTED_FIELDS map
+    fields holding lists of resources to their record class. Keys of the
+    dict that are not fields are kept in a dict of extras.
+    """
+
+    FIELDS = ()
+    INTERNED_FIELDS = ()
+    DATE_FIELDS = ()
+    NESTED_FIELDS = {}
+
+    __slots__ = ('_extra', '_dates')
+
+    def __init__(self, values):
+        values = dict(values)
+        for field in self.FIELDS:
+            value = values.pop(field, _MISSING)
+            if value is _MISSING:
+                continue
+            if field in self.INTERNED_FIELDS:
+                value = _intern(value)
+            elif field in self.NESTED_FIELDS and isinstance(value, list):
+                value = [self.NESTED_FIELDS[field](v) for v in value]
+            setattr(self, field, value)
+        self._extra = values or None
+        self._dates = None
+
+    def date(self, field):
+        """Returns the value of a date field as a datetime, None if unset.
+
+        Dates are parsed on first access only.
+        """
+        if field not in self.DATE_FIELDS:
+            raise KeyError(field)
+        if self._dates is None:
+            self._dates = {}
+        if field not in self._dates:
+            value = self.get(field)
+            self._dates[field] = None if value is None else parse_date(value)
+        return self._dates[field]
+
+    def __getattr__(self, name):
+        # NOTE: only called for extras and missing fields.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        value = self._get(name)
+        if value is _MISSING:
+            raise AttributeError(name)
+        return value
+
+    def _get(self, key):
+        if key in self.FIELDS:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                return _MISSING
+        if self._extra is not None:
+            return self._extra.get(key, _MISSING)
+        return _MISSING
+
+    def __getitem__(self, key):
+        value = self._get(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = self._get(key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        return self._get(key) is not _MISSING
+
+    def keys(self):
+        keys = [field for field in self.FIELDS
+                if self._get(field) is not _MISSING]
+        if self._extra is not None:
+            keys.extend(self._extra)
+        return keys
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def values(self):
+        return [self[key] for key in self.keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        """Returns the dict the record was built from."""
+        values = {}
+        for key, value in self.items():
+            if key in self.NESTED_FIELDS and isinstance(value, list):
+                value = [v.to_dict() for v in value]
+            values[key] = value
+        return values
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        if not isinstance(other, dict):
+            return NotImplemented
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__, self.get('id'))
+
+
+def parse_date(value):
+    """Parses a date of the reservation API."""
+    for date_format in (utils.LEASE_DATE_FORMAT, '%Y-%m-%dT%H:%M:%S',
+                        utils.API_DATE_FORMAT):
+        try:
+            return utils.parse_date(value, date_format)
+        except ValueError:
+            pass
+    return timeutils.parse_isotime(value).replace(tzinfo=None)
+
+
+class Reservation(Record):
+    """Compact record of a reservation of a lease."""
+
+    FIELDS = ('id', 'lease_id', 'resource_id', 'resource_type', 'status',
+              'created_at', 'updated_at')
+    INTERNED_FIELDS = frozenset(['lease_id', 'resource_type', 'status'])
+    DATE_FIELDS = frozenset(['created_at', 'updated_at'])
+
+    __slots__ = FIELDS
+
+
+class Event(Record):
+    """Compact record of an event of a lease."""
+
+    FIELDS = ('id', 'lease_id', 'event_type', 'time', 'status',
+              'created_at', 'updated_at')
+    INTERNED_FIELDS = frozenset(['lease_id', 'event_type', 'status'])
+    DATE_FIELDS = frozenset(['time', 'created_at', 'updated_at'])
+
+    __slots__ = FIELDS
+
+
+class Lease(Record):
+    """Compact record of a lease, with its reservations and events."""
+
+    FIELDS = ('id', 'name', 'user_id', 'project_id', 'start_date',
+              'end_date', 'trust_id', 'action', 'status', 'status_reason',
+              'reservations', 'events', 'created_at', 'updated_at')
+    INTERNED_FIELDS = frozenset(['user_id', 'project_id', 'action',
+                                 'status'])
+    DATE_FIELDS = frozenset(['start_date', 'end_date', 'created_at',
+                             'updated_at'])
+    NESTED_FIELDS = {'reservations': Reservation, 'events': Event}
+
+    __slots__ = FIELDS
+
+
+class Host(Record):
+    """Compact record of a compute host.
+
+    Extra capabilities of the host are kept as extras.
+    """
+
+    FIELDS = ('id', 'hypervisor_hostname', 'hypervisor_type',
+              'hypervisor_version', 'vcpus', 'cpu_info', 'memory_mb',
+              'local_gb', 'service_name', 'trust_id', 'created_at',
+              'updated_at')
+    INTERNED_FIELDS = frozenset(['hypervisor_type', 'hypervisor_version',
+                                 'service_name'])
+    DATE_FIELDS = frozenset(['created_at', 'updated_at'])
+
+    __slots__ = FIELDS
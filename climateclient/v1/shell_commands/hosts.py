@@ -24,13 +24,14 @@ class ListHosts(command.ListCommand):
     log = logging.getLogger(__name__ + '.ListHosts')
     list_columns = ['id', 'hypervisor_hostname', 'vcpus', 'memory_mb',
                     'local_gb']
+    default_sort_by = 'hypervisor_hostname'
 
     def get_parser(self, prog_name):
         parser = super(ListHosts, self).get_parser(prog_name)
         parser.add_argument(
             '--sort-by', metavar="<host_column>",
-            help='column name used to sort result',
-            default='hypervisor_hostname'
+            help='column name used to sort result, defaults to '
+                 'hypervisor_hostname'
         )
         return parser
 
@@ -20,6 +20,7 @@ import re
 
 from climateclient import command
 from climateclient import exception
+from climateclient import utils
 
 
 class ListLeases(command.ListCommand):
@@ -27,16 +28,60 @@ class ListLeases(command.ListCommand):
     resource = 'lease'
     log = logging.getLogger(__name__ + '.ListLeases')
     list_columns = ['id', 'name', 'start_date', 'end_date']
+    default_sort_by = 'name'
 
     def get_parser(self, prog_name):
         parser = super(ListLeases, self).get_parser(prog_name)
         parser.add_argument(
             '--sort-by', metavar="<lease_column>",
-            help='column name used to sort result',
-            default='name'
+            help='column name used to sort result, defaults to name'
+        )
+        parser.add_argument(
+            '--name',
+            help='List only the leases with this name'
+        )
+        parser.add_argument(
+            '--status',
+            help='List only the leases with this status'
+        )
+        parser.add_argument(
+            '--project-id',
+            help='List only the leases of this project'
+        )
+        parser.add_argument(
+            '--start-date',
+            dest='start',
+            help='Time (YYYY-MM-DD HH:MM) UTC TZ, list only the leases '
+                 'ending after it'
+        )
+        parser.add_argument(
+            '--end-date',
+            dest='end',
+            help='Time (YYYY-MM-DD HH:MM) UTC TZ, list only the leases '
+                 'starting before it'
         )
         return parser
 
+    def args2body(self, parsed_args):
+        params = super(ListLeases, self).args2body(parsed_args)
+        for key in ('name', 'status', 'project_id'):
+            if getattr(parsed_args, key, None) is not None:
+                params[key] = getattr(parsed_args, key)
+        for key in ('start', 'end'):
+            if getattr(parsed_args, key, None) is not None:
+                try:
+                    params[key] = utils.parse_date(getattr(parsed_args, key),
+                                                   utils.API_DATE_FORMAT)
+                except ValueError:
+                    raise exception.IncorrectLease(
+                        'Invalid --%s-date %s, expected YYYY-MM-DD HH:MM'
+                        % (key, getattr(parsed_args, key)))
+        if ('start' in params and 'end' in params and
+                params['start'] > params['end']):
+            raise exception.IncorrectLease(
+                '--start-date must not be after --end-date')
+        return params
+
 
 class ShowLease(command.ShowCommand):
     """Show details about the given lease."""
@@ -115,14 +160,14 @@ class CreateLease(command.CreateCommand):
             params['name'] = parsed_args.name
         if not isinstance(parsed_args.start, datetime.datetime):
             try:
-                parsed_args.start = datetime.datetime.strptime(
-                    parsed_args.start, '%Y-%m-%d %H:%M')
+                parsed_args.start = utils.parse_date(
+                    parsed_args.start, utils.API_DATE_FORMAT)
             except ValueError:
                 raise exception.IncorrectLease
         if not isinstance(parsed_args.end, datetime.datetime):
             try:
-                parsed_args.end = datetime.datetime.strptime(
-                    parsed_args.end, '%Y-%m-%d %H:%M')
+                parsed_args.end = utils.parse_date(
+                    parsed_args.end, utils.API_DATE_FORMAT)
             except ValueError:
                 raise exception.IncorrectLease
         if parsed_args.start > parsed_args.end:
@@ -209,7 +254,7 @@ class CreateLease(command.CreateCommand):
                 raise exception.IncorrectLease(err_msg)
             event_date = event_info['event_date']
             try:
-                date = datetime.datetime.strptime(event_date, '%Y-%m-%d %H:%M')
+                date = utils.parse_date(event_date, utils.API_DATE_FORMAT)
                 event_date = datetime.datetime.strftime(date, '%Y-%m-%d %H:%M')
                 event_info['event_date'] = event_date
             except ValueError:
@@ -263,6 +308,14 @@ class UpdateLease(command.UpdateCommand):
             help='Time to advance the lease start',
             default=None
         )
+        parser.add_argument(
+            '--relative-dates',
+            action='store_true',
+            help='Send the date changes as they are for the server to apply '
+                 'them, instead of fetching the lease to compute the new '
+                 'dates. Requires server support',
+            default=False
+        )
 
         return parser
 
@@ -278,6 +331,8 @@ class UpdateLease(command.UpdateCommand):
             params['defer_by'] = parsed_args.defer_by
         if parsed_args.advance_by:
             params['advance_by'] = parsed_args.advance_by
+        if parsed_args.relative_dates:
+            params['relative_dates'] = True
         return params
 
 
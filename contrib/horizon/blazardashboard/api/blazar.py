@@ -13,15 +13,25 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
+import collections
 from collections import OrderedDict
+import datetime
 import logging
+import threading
+import time
 
+from django.conf import settings
 from django.db import connections
 from django.utils.translation import ugettext_lazy as _
+import pytz
 import six
 
+from climateclient import base as blazar_base
+from climateclient import circuit_breaker
 from climateclient import client as blazar_client
 from climateclient import exception as blazar_exception
+from climateclient import single_flight
 
 from openstack_dashboard.api import base
 
@@ -29,6 +39,20 @@ from openstack_dashboard.api import base
 LOG = logging.getLogger(__name__)
 LEASE_DATE_FORMAT = "%Y-%m-%d %H:%M"
 
+# Page renders give up on a slow reservation service instead of piling up
+# behind it, and stop calling it for a while once it keeps failing.
+BLAZAR_TIMEOUT = getattr(settings, 'BLAZAR_TIMEOUT', (5, 30))
+BLAZAR_CIRCUIT_BREAKER = circuit_breaker.CircuitBreaker(
+    failure_threshold=getattr(settings, 'BLAZAR_FAILURE_THRESHOLD', 5),
+    reset_timeout=getattr(settings, 'BLAZAR_RESET_TIMEOUT', 30))
+# Concurrent page loads listing the same leases share a single request.
+BLAZAR_SINGLE_FLIGHT = single_flight.SingleFlight()
+# Keep-alive connections to the reservation service, reused by all the
+# requests handled by the worker process.
+BLAZAR_SESSION = blazar_base.create_session(
+    pool_maxsize=getattr(settings, 'BLAZAR_POOL_MAXSIZE',
+                         blazar_base.DEFAULT_POOL_MAXSIZE))
+
 PRETTY_TYPE_NAMES = OrderedDict([
     ('compute', _('Compute Node (default)')),
     ('storage', _('Storage')),
@@ -64,18 +88,36 @@ class Lease(base.APIDictWrapper):
 
 
 def blazarclient(request):
-    """Initialization of Blazar client."""
-
-    endpoint = base.url_for(request, 'reservation')
-    LOG.debug('blazarclient connection created using token "%s" '
-              'and endpoint "%s"' % (request.user.token.id, endpoint))
-    return blazar_client.Client(climate_url=endpoint,
-                                auth_token=request.user.token.id)
+    """Returns the Blazar client of a request.
 
+    The client is created on first use and kept on the request for the
+    rest of its handling, so that a page render looks up the endpoint in
+    the catalog only once. All clients share the connections of
+    BLAZAR_SESSION.
+    """
+    token = request.user.token.id
+    client = getattr(request, '_blazar_client', None)
+    if client is not None and client.auth_token == token:
+        return client
 
-def lease_list(request):
-    """List the leases."""
-    leases = blazarclient(request).lease.list()
+    endpoint = base.url_for(request, 'reservation')
+    LOG.debug('blazarclient connection created using endpoint "%s"',
+              endpoint)
+    client = blazar_client.Client(climate_url=endpoint,
+                                  auth_token=token,
+                                  session=BLAZAR_SESSION,
+                                  timeout=BLAZAR_TIMEOUT,
+                                  circuit_breaker=BLAZAR_CIRCUIT_BREAKER,
+                                  single_flight=BLAZAR_SINGLE_FLIGHT)
+    request._blazar_client = client
+    return client
+
+
+def lease_list(request, **filters):
+    """List the leases, optionally filtered by name, status, project_id,
+    start and end (see climateclient.v1.leases.LeaseClientManager.list).
+    """
+    leases = blazarclient(request).lease.list(**filters)
     return [Lease(l) for l in leases]
 
 
@@ -88,12 +130,14 @@ def lease_get(request, lease_id):
 def lease_create(request, name, start, end, reservations, events):
     """Create a lease."""
     lease = blazarclient(request).lease.create(name, start, end, reservations, events)
+    HOST_AVAILABILITY.invalidate()
     return Lease(lease)
 
 
 def lease_update(request, lease_id, **kwargs):
     """Update a lease."""
     lease = blazarclient(request).lease.update(lease_id, **kwargs)
+    HOST_AVAILABILITY.invalidate()
     return Lease(lease)
 
 
@@ -101,6 +145,7 @@ def lease_delete(request, lease_id):
     """Delete a lease."""
     try:
         blazarclient(request).lease.delete(lease_id)
+        HOST_AVAILABILITY.invalidate()
     except blazar_exception.ClimateClientException:
         # XXX This is temporary until we can display a proper error pop-up in
         # Horizon instead of an error page
@@ -114,33 +159,128 @@ def dictfetchall(cursor):
         for row in cursor.fetchall()
     ]
 
-def compute_host_available(request, start_date, end_date):
+class HostAvailability(object):
+    """In-process index of the future allocations of every compute host.
+
+    Holds, for each host, its node type and the sorted, merged intervals
+    during which it is allocated, so that counting the hosts free during a
+    window takes one binary search per host instead of a query over the
+    whole allocation history. The index is reloaded from the database when
+    older than ttl seconds, and dropped by invalidate() when a lease is
+    changed from this process.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._hosts = {}
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def count_available(self, start_date, end_date, node_type=None):
+        """Returns the number of hosts free from start_date to end_date.
+
+        Dates are UTC datetimes. Only hosts of node_type are counted if it
+        is given.
+        """
+        start_date = _naive_utc(start_date)
+        end_date = _naive_utc(end_date)
+        count = 0
+        for host_node_type, starts, ends in self._load().values():
+            if node_type is not None and host_node_type != node_type:
+                continue
+            # NOTE: merged intervals are disjoint, the last one starting
+            #       before end_date is the only one that may overlap.
+            index = bisect.bisect_left(starts, end_date) - 1
+            if index < 0 or ends[index] <= start_date:
+                count += 1
+        return count
+
+    def _load(self):
+        with self._lock:
+            if (self._loaded_at is not None and
+                    time.time() - self._loaded_at < self.ttl):
+                return self._hosts
+            loaded_at = time.time()
+            hosts = self._query()
+            self._hosts, self._loaded_at = hosts, loaded_at
+            return hosts
+
+    def _query(self):
+        cursor = connections['blazar'].cursor()
+        cursor.execute('''\
+        SELECT
+            ch.id,
+            ex.capability_value
+        FROM
+            computehosts AS ch
+            LEFT JOIN computehost_extra_capabilities AS ex
+                ON ex.computehost_id = ch.id
+                AND ex.capability_name = 'node_type'
+                AND ex.deleted = '0'
+        WHERE
+            ch.deleted = '0'
+        ORDER BY
+            ex.created_at
+        ''')
+        node_types = dict(cursor.fetchall())
+
+        # Past allocations cannot overlap a window in the future, only the
+        # ones ending after now are loaded.
+        cursor.execute('''\
+        SELECT
+            cha.compute_host_id,
+            l.start_date,
+            l.end_date
+        FROM
+            computehost_allocations AS cha
+            JOIN reservations AS r ON r.id = cha.reservation_id
+            JOIN leases AS l ON l.id = r.lease_id
+        WHERE
+            l.end_date > %s
+            AND cha.deleted = '0'
+            AND r.deleted = '0'
+        ORDER BY
+            l.start_date
+        ''', [datetime.datetime.utcnow()])
+        intervals = collections.defaultdict(list)
+        for host_id, start_date, end_date in cursor.fetchall():
+            if host_id not in node_types:
+                continue
+            host_intervals = intervals[host_id]
+            if host_intervals and start_date <= host_intervals[-1][1]:
+                host_intervals[-1][1] = max(host_intervals[-1][1], end_date)
+            else:
+                host_intervals.append([start_date, end_date])
+
+        hosts = {}
+        for host_id, node_type in node_types.items():
+            host_intervals = intervals.get(host_id, ())
+            hosts[host_id] = (node_type,
+                              [interval[0] for interval in host_intervals],
+                              [interval[1] for interval in host_intervals])
+        return hosts
+
+
+def _naive_utc(date):
+    if date.tzinfo is not None:
+        date = date.astimezone(pytz.utc).replace(tzinfo=None)
+    return date
+
+
+HOST_AVAILABILITY = HostAvailability(
+    ttl=getattr(settings, 'BLAZAR_AVAILABILITY_TTL', 30))
+
+
+def compute_host_available(request, start_date, end_date, node_type=None):
     """
     Return the number of compute hosts available for reservation for the entire
-    specified date range.
+    specified date range, only counting hosts of node_type if it is given.
     """
-    start_date_str = start_date.strftime('%Y-%m-%d %H:%M')
-    end_date_str = end_date.strftime('%Y-%m-%d %H:%M')
-    cursor = connections['blazar'].cursor()
-    cursor.execute("""
-        select count(*) as available
-        from computehosts ch
-        where ch.id not in (
-            select ch.id
-            from computehosts ch
-            join computehost_allocations cha on cha.`compute_host_id` = ch.`id`
-            join reservations r on r.id = cha.`reservation_id`
-            join leases l on l.`id` = r.`lease_id`
-            where
-                r.deleted="0" and
-                ch.deleted="0" and
-                ((l.`start_date` > %s and l.`start_date` < %s)
-                or (l.`end_date` > %s and l.`end_date` < %s)
-                or (l.`start_date` < %s and l.`end_date` > %s))
-        )
-        """, [start_date_str, end_date_str, start_date_str, end_date_str, start_date_str, end_date_str])
-    count = cursor.fetchone()[0]
-    return count
+    return HOST_AVAILABILITY.count_available(start_date, end_date, node_type)
 
 def node_in_lease(request, lease_id):
     sql = '''\
@@ -198,9 +338,18 @@ def node_type_map(cursor=None):
     node_types = dict(cursor.fetchall())
     return node_types
 
-def reservation_calendar(request):
-    """Return a list of all scheduled leases."""
-    cursor = connections['blazar'].cursor()
+def reservation_calendar(request, start=None, end=None, node_type=None,
+                         since=None):
+    """Return the host allocations of the scheduled leases.
+
+    Only the allocations of leases overlapping the window from start to end
+    are returned, on hosts of node_type if it is given. With since, only
+    the allocations changed after that date are returned, deleted ones
+    included and flagged as such. Changed allocations whose lease no longer
+    overlaps the window are flagged as deleted too, so that clients drop
+    them. Every allocation has a changed_at date, the latest of the ones of
+    its allocation, reservation and lease.
+    """
     sql = '''\
     SELECT
         l.name,
@@ -209,23 +358,64 @@ def reservation_calendar(request):
         l.end_date,
         r.id,
         r.status,
-        c.hypervisor_hostname
+        c.hypervisor_hostname,
+        r.deleted != '0' OR cha.deleted != '0' AS deleted,
+        l.updated_at AS lease_updated_at,
+        r.updated_at AS reservation_updated_at,
+        cha.created_at AS allocation_created_at,
+        cha.updated_at AS allocation_updated_at,
+        cha.deleted_at AS allocation_deleted_at,
+        r.deleted_at AS reservation_deleted_at
     FROM
         computehost_allocations cha
         JOIN computehosts c ON c.id = cha.compute_host_id
         JOIN reservations r ON r.id = cha.reservation_id
         JOIN leases l ON l.id = r.lease_id
     WHERE
-        r.deleted = '0'
-        AND c.deleted = '0'
-        AND cha.deleted = '0'
-    ORDER BY
-        start_date,
-        project_id;
+        c.deleted = '0'
     '''
-    cursor.execute(sql)
+    sql_args = []
+    if since is None:
+        sql += " AND r.deleted = '0' AND cha.deleted = '0'"
+    else:
+        sql += (" AND (l.updated_at >= %s OR r.updated_at >= %s"
+                " OR cha.created_at >= %s OR cha.updated_at >= %s"
+                " OR cha.deleted_at >= %s OR r.deleted_at >= %s)")
+        sql_args.extend([since] * 6)
+    # NOTE: the window is applied below to changes, to report the
+    #       allocations moved out of it.
+    if start is not None and since is None:
+        sql += " AND l.end_date > %s"
+        sql_args.append(start)
+    if end is not None and since is None:
+        sql += " AND l.start_date < %s"
+        sql_args.append(end)
+    if node_type is not None:
+        sql += '''
+        AND c.id IN (
+            SELECT computehost_id
+            FROM computehost_extra_capabilities
+            WHERE capability_name = 'node_type'
+                AND capability_value = %s
+                AND deleted = '0'
+        )'''
+        sql_args.append(node_type)
+    sql += " ORDER BY l.start_date, l.project_id"
+
+    cursor = connections['blazar'].cursor()
+    cursor.execute(sql, sql_args)
     host_reservations = dictfetchall(cursor)
 
+    for reservation in host_reservations:
+        dates = [reservation.pop(key) for key in (
+            'lease_updated_at', 'reservation_updated_at',
+            'allocation_created_at', 'allocation_updated_at',
+            'allocation_deleted_at', 'reservation_deleted_at')]
+        reservation['changed_at'] = max(d for d in dates if d is not None)
+        reservation['deleted'] = bool(
+            reservation['deleted'] or
+            (start is not None and reservation['end_date'] <= start) or
+            (end is not None and reservation['start_date'] >= end))
     return host_reservations
 
 def available_nodetypes():
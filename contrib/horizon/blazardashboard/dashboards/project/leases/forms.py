@@ -251,14 +251,14 @@ class CreateForm(forms.SelfHandlingForm):
         cleaned_create_data['end_datetime'] = end_datetime
 
         # check for name conflicts
-        leases = api.blazar.lease_list(self.request)
-
-        for lease in leases:
-            if lease['name'] == cleaned_create_data.get("name"):
-                raise forms.ValidationError("A lease with this name already exists.")
+        name = cleaned_create_data.get("name")
+        if name and api.blazar.lease_list(self.request, name=name, limit=1):
+            raise forms.ValidationError("A lease with this name already exists.")
 
         # check for host availability
-        num_hosts = api.blazar.compute_host_available(self.request, start_datetime, end_datetime)
+        num_hosts = api.blazar.compute_host_available(
+            self.request, start_datetime, end_datetime,
+            node_type=cleaned_create_data.get('node_type'))
         if cleaned_create_data.get('min_hosts') > num_hosts:
             raise forms.ValidationError("Not enough hosts are available for this reservation (minimum %s requested; %s available). Try adjusting the number of hosts requested or the date range for the reservation." % (cleaned_create_data.get('min_hosts'), num_hosts))
 
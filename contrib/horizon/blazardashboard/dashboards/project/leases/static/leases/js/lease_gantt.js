@@ -1,6 +1,59 @@
 (function(window, horizon, $, undefined) {
   'use strict';
 
+  /* Returns one gantt task per allocation, the hosts of its reservation
+   * being listed in data.hosts. Hosts are grouped by reservation in a
+   * single pass, and the reservations of a group share their host list. */
+  function buildTasks(reservations) {
+    var hostsByReservation = {};
+    reservations.forEach(function(reservation) {
+      var hosts = hostsByReservation[reservation.id];
+      if (!hosts) {
+        hosts = hostsByReservation[reservation.id] = [];
+      }
+      hosts.push(reservation.hypervisor_hostname);
+    });
+
+    return reservations.map(function(reservation) {
+      reservation.hosts = hostsByReservation[reservation.id];
+      return {
+        'startDate': reservation.start_date,
+        'endDate': reservation.end_date,
+        'taskName': reservation.hypervisor_hostname,
+        'status': reservation.status,
+        'data': reservation
+      };
+    });
+  }
+
+  /* Returns the tasks on the hosts named in taskNames. */
+  function filterTasks(tasks, taskNames) {
+    var names = new Set(taskNames);
+    return tasks.filter(function(task) {
+      return names.has(task.taskName);
+    });
+  }
+
+  /* Returns func delayed until wait ms have passed without a call. */
+  function debounce(func, wait) {
+    var timeout = null;
+    return function() {
+      var args = arguments;
+      var self = this;
+      window.clearTimeout(timeout);
+      timeout = window.setTimeout(function() {
+        timeout = null;
+        func.apply(self, args);
+      }, wait);
+    };
+  }
+
+  // exposed for tools/benchmarks/lease_gantt.html
+  window.blazarGantt = {
+    'buildTasks': buildTasks,
+    'filterTasks': filterTasks
+  };
+
   function init() {
     var gantt;
     var all_tasks;
@@ -14,41 +67,122 @@
       'pending': 'task-pending'
     };
 
-    $.getJSON('../calendar.json')
-    .done(function(resp) {
-      var nodeTypesPretty = [ // preserve order so it's not random
-        ['compute', 'Compute Node'],
-        ['storage', 'Storage'],
-        ['gpu_k80', 'GPU (K80)'],
-        ['gpu_m40', 'GPU (M40)'],
-        ['gpu_p100', 'GPU (P100)'],
-        ['compute_ib', 'Infiniband Support'],
-        ['storage_hierarchy', 'Storage Hierarchy'],
-        ['fpga', 'FPGA'],
-        ['lowpower_xeon', 'Low power Xeon'],
-        ['atom', 'Atom'],
-        ['arm64', 'ARM64'],
-      ];
+    // Allocations are loaded for the displayed time range padded by
+    // LOAD_PADDING_DAYS on both sides, and then polled for changes.
+    var LOAD_PADDING_DAYS = 31;
+    var POLL_INTERVAL = 60 * 1000;
+    // Resizes and filter changes are applied once they stop for
+    // REDRAW_DELAY ms.
+    var ROW_HEIGHT = 20;
+    var REDRAW_DELAY = 150;
+    var allocations = {};
+    var loadedWindow = null;
+    var cursor = null;
 
-      all_tasks = resp.reservations.map(function(reservation, i) {
-        reservation.hosts = resp.reservations.filter(
-          function(r) {
-            return r.id === this.id;
-          },
-          reservation
-        ).map(function(h) { return h.hypervisor_hostname; });
-
-        return {
-          'startDate': new Date(reservation.start_date),
-          'endDate': new Date(reservation.end_date),
-          'taskName': reservation.hypervisor_hostname,
-          'status': reservation.status,
-          'data': reservation
+    var nodeTypesPretty = [ // preserve order so it's not random
+      ['compute', 'Compute Node'],
+      ['storage', 'Storage'],
+      ['gpu_k80', 'GPU (K80)'],
+      ['gpu_m40', 'GPU (M40)'],
+      ['gpu_p100', 'GPU (P100)'],
+      ['compute_ib', 'Infiniband Support'],
+      ['storage_hierarchy', 'Storage Hierarchy'],
+      ['fpga', 'FPGA'],
+      ['lowpower_xeon', 'Low power Xeon'],
+      ['atom', 'Atom'],
+      ['arm64', 'ARM64'],
+    ];
+
+    function epoch(date) {
+      return Math.floor(date.getTime() / 1000);
+    }
+
+    function decodeHosts(resp) {
+      return resp.hosts.name.map(function(name, i) {
+        return {'hypervisor_hostname': name, 'node_type': resp.hosts.node_type[i]};
+      });
+    }
+
+    /* merge the columns of calendar.json into allocations */
+    function mergeAllocations(resp) {
+      var columns = resp.allocations;
+      for (var i = 0; i < columns.id.length; i++) {
+        var hostname = resp.hosts.name[columns.host[i]];
+        var key = columns.id[i] + '/' + hostname;
+        if (columns.deleted && columns.deleted[i]) {
+          delete allocations[key];
+          continue;
         }
+        allocations[key] = {
+          'id': columns.id[i],
+          'name': columns.name[i],
+          'project_id': columns.project_id[i],
+          'status': columns.status[i],
+          'hypervisor_hostname': hostname,
+          'start_date': new Date(columns.start[i] * 1000),
+          'end_date': new Date(columns.end[i] * 1000)
+        };
+      }
+      cursor = resp.cursor;
+    }
+
+    function rebuildTasks() {
+      all_tasks = buildTasks($.map(allocations, function(reservation) {
+        return reservation;
+      }));
+      tasks = filterTasks(all_tasks, selectedTaskNames());
+    }
+
+    function selectedTaskNames() {
+      var nodeType = $('#node-type-chooser').val() || '*';
+      return hosts
+        .filter(function (host) {return nodeType === '*' || nodeType === host.node_type})
+        .map(function (host) {return host.hypervisor_hostname});
+    }
+
+    function loadWindow(timeDomain) {
+      var range = [
+        epoch(d3.time.day.offset(timeDomain[0], -LOAD_PADDING_DAYS)),
+        epoch(d3.time.day.offset(timeDomain[1], LOAD_PADDING_DAYS))
+      ];
+      return $.getJSON('../calendar.json', {'start': range[0], 'end': range[1]})
+        .done(function(resp) {
+          allocations = {};
+          mergeAllocations(resp);
+          hosts = decodeHosts(resp);
+          loadedWindow = range;
+          rebuildTasks();
+        });
+    }
+
+    /* reload the allocations if timeDomain goes past the loaded ones */
+    function ensureLoaded(timeDomain) {
+      if (loadedWindow && epoch(new Date(timeDomain[0])) >= loadedWindow[0] &&
+          epoch(new Date(timeDomain[1])) <= loadedWindow[1]) {
+        return;
+      }
+      loadWindow([new Date(timeDomain[0]), new Date(timeDomain[1])]).done(redraw);
+    }
+
+    function pollChanges() {
+      if (!loadedWindow || cursor === null) {
+        return;
+      }
+      $.getJSON('../calendar.json', {
+        'start': loadedWindow[0],
+        'end': loadedWindow[1],
+        'since': cursor
+      }).done(function(resp) {
+        mergeAllocations(resp);
+        rebuildTasks();
+        redraw();
       });
-      tasks = all_tasks;
-      hosts = resp.compute_hosts;
+    }
 
+    var initialStart = d3.time.hour.offset(new Date(), -3);
+    initialStart.setMinutes(0, 0, 0);
+    loadWindow([initialStart, d3.time.day.offset(initialStart, +1)])
+    .done(function() {
       // populate node-type-chooser
       var availableNodeTypes = {};
       hosts.forEach(function(host) {
@@ -61,21 +195,24 @@
       });
       $('#node-type-chooser').prop('disabled', false);
 
-      var taskNames = $.map(resp.compute_hosts, function(host, i) {
+      var taskNames = $.map(hosts, function(host, i) {
         return host.hypervisor_hostname;
       });
 
-      $('#blazar-gantt').empty().height(20 * taskNames.length);
+      // Only the rows in the viewport are drawn, see d3.gantt.
+      $('#blazar-gantt').empty().height(ROW_HEIGHT * taskNames.length);
       gantt = d3.gantt({
         selector: '#blazar-gantt',
         taskTypes: taskNames,
         taskStatus: taskStatus,
-        tickFormat: format
+        tickFormat: format,
+        virtual: true
       });
       gantt(tasks);
 
       /* set initial time range */
       setTimeDomain(gantt.timeDomain());
+      window.setInterval(pollChanges, POLL_INTERVAL);
     })
     .fail(function() {
       $('#blazar-gantt').html('<div class="alert alert-danger">Unable to load reservations.</div>');
@@ -110,7 +247,7 @@
       }
     }
 
-    $(window).on('resize', redraw);
+    $(window).on('resize', debounce(redraw, REDRAW_DELAY));
 
     form = $('form[name="blazar-gantt-controls"]');
 
@@ -118,29 +255,18 @@
       dateFormat: 'mm/dd/yyyy'
     });
 
-    $('#node-type-chooser').change(function() {
-      var timeDomain = getTimeDomain();
-      var nodeType = $('#node-type-chooser').val();
-
-      var filteredTaskNames = hosts
-        .filter(function (host) {return nodeType === '*' || nodeType === host.node_type})
-        .map(function (host) {return host.hypervisor_hostname});
-
-      tasks = all_tasks.filter(function(task) {
-        return filteredTaskNames.indexOf(task.taskName) >= 0
-      });
+    /* update the rows of the chart in place for the chosen node type */
+    function filterNodeType() {
+      if (!gantt) {
+        return;
+      }
+      var filteredTaskNames = selectedTaskNames();
+      tasks = filterTasks(all_tasks, filteredTaskNames);
+      $('#blazar-gantt').height(ROW_HEIGHT * filteredTaskNames.length);
+      gantt.taskTypes(filteredTaskNames).redraw(tasks);
+    }
 
-      $('#blazar-gantt').empty().height(20 * filteredTaskNames.length);
-      gantt = d3.gantt({
-        selector: '#blazar-gantt',
-        taskTypes: filteredTaskNames,
-        taskStatus: taskStatus,
-        tickFormat: format,
-        timeDomainStart: timeDomain[0],
-        timeDomainEnd: timeDomain[1],
-      });
-      gantt(tasks);
-    });
+    $('#node-type-chooser').change(debounce(filterNodeType, REDRAW_DELAY));
 
     $('input', form).on('change', function() {
       if (form.hasClass('time-domain-processed')) {
@@ -150,6 +276,7 @@
           setTimeDomain(timeDomain);
         }
         gantt.timeDomain(timeDomain);
+        ensureLoaded(timeDomain);
         redraw();
       }
     });
@@ -163,6 +290,7 @@
       ];
       setTimeDomain(timeDomain);
       gantt.timeDomain(timeDomain);
+      ensureLoaded(timeDomain);
       redraw();
     });
   }
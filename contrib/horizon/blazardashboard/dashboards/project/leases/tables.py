@@ -22,10 +22,24 @@ from horizon.utils import filters
 from functools import partial
 
 from blazardashboard import api
+from climateclient import utils as blazar_utils
 
 from datetime import datetime
 import pytz
 
+
+def parse_lease_date(value):
+    """Parses a lease date for display, like filters.parse_isotime.
+
+    Lease dates are all in the same format, which blazar_utils.parse_date
+    parses much faster than a generic ISO 8601 parser.
+    """
+    try:
+        return blazar_utils.parse_date(value).replace(tzinfo=pytz.utc)
+    except (TypeError, ValueError):
+        return filters.parse_isotime(value)
+
+
 class CreateLease(tables.LinkAction):
     name = "create"
     verbose_name = _("Create Lease")
@@ -46,10 +60,7 @@ class UpdateLease(tables.LinkAction):
     classes = ("btn-create", "ajax-modal")
 
     def allowed(self, request, lease):
-        print lease.end_date
-        if datetime.strptime(lease.end_date, '%Y-%m-%dT%H:%M:%S.%f').replace(tzinfo=pytz.utc) > datetime.now(pytz.utc):
-            return True
-        return False
+        return blazar_utils.parse_date(lease.end_date) > datetime.utcnow()
 
 
 class ViewLeaseCalendar(tables.LinkAction):
@@ -83,10 +94,10 @@ class LeasesTable(tables.DataTable):
     name = tables.Column("name", verbose_name=_("Lease name"),
                          link="horizon:project:leases:detail",)
     start_date = tables.Column("start_date", verbose_name=_("Start date"),
-                               filters=(filters.parse_isotime,
+                               filters=(parse_lease_date,
                                         partial(django_filters.date, arg='Y-m-d H:i T')),)
     end_date = tables.Column("end_date", verbose_name=_("End date"),
-                             filters=(filters.parse_isotime,
+                             filters=(parse_lease_date,
                                       partial(django_filters.date, arg='Y-m-d H:i T')),)
     action = tables.Column("action", verbose_name=_("Action"),)
     status = tables.Column("status", verbose_name=_("Status"),)
@@ -13,15 +13,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import calendar
+import datetime
+import hashlib
 import logging
 import json
 import pytz
 
-from django.core.serializers.json import DjangoJSONEncoder
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
+from django.utils.cache import patch_cache_control
 from django.utils.translation import ugettext_lazy as _
 from django.http import HttpResponse
+from django.http import HttpResponseBadRequest
+from django.http import HttpResponseNotModified
+from django.views.decorators import gzip
 
 from horizon import exceptions
 from horizon import forms
@@ -52,12 +58,90 @@ class CalendarView(views.APIView):
     template_name = 'project/leases/calendar.html'
 
 
+def _epoch(date):
+    return calendar.timegm(date.utctimetuple())
+
+
+def _epoch_param(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    return datetime.datetime.utcfromtimestamp(int(value))
+
+
+def encode_calendar(compute_hosts, reservations, since=None):
+    """Encode the calendar in columns, one list per attribute.
+
+    Hosts are referred to by their index in the host columns and dates are
+    epoch seconds, which keeps the document small when hosts have many
+    allocations. The cursor is the latest change date of the allocations,
+    to be passed as since to get the allocations changed afterwards.
+    """
+    host_index = {}
+    hosts = {'name': [], 'node_type': []}
+    for host in compute_hosts:
+        host_index[host['hypervisor_hostname']] = len(hosts['name'])
+        hosts['name'].append(host['hypervisor_hostname'])
+        hosts['node_type'].append(host.get('node_type'))
+
+    columns = ('id', 'name', 'project_id', 'status', 'host', 'start', 'end')
+    if since is not None:
+        columns += ('deleted',)
+    allocations = dict((column, []) for column in columns)
+    cursor = _epoch(since) if since is not None else 0
+    for reservation in reservations:
+        index = host_index.get(reservation['hypervisor_hostname'])
+        if index is None:
+            continue
+        allocations['id'].append(reservation['id'])
+        allocations['name'].append(reservation['name'])
+        allocations['project_id'].append(reservation['project_id'])
+        allocations['status'].append(reservation['status'])
+        allocations['host'].append(index)
+        allocations['start'].append(_epoch(reservation['start_date']))
+        allocations['end'].append(_epoch(reservation['end_date']))
+        if since is not None:
+            allocations['deleted'].append(reservation['deleted'])
+        cursor = max(cursor, _epoch(reservation['changed_at']))
+
+    return {'hosts': hosts, 'allocations': allocations, 'cursor': cursor}
+
+
+@gzip.gzip_page
 def calendar_data_view(request):
-    data = {}
-    data['compute_hosts'] = api.blazar.compute_host_list(request, node_types=True)
-    data['reservations'] = api.blazar.reservation_calendar(request)
-
-    return HttpResponse(json.dumps(data, cls=DjangoJSONEncoder), content_type="application/json")
+    """Return the reservation calendar as JSON, see encode_calendar.
+
+    The start and end query parameters, in epoch seconds, only return the
+    allocations of leases overlapping that window, node_type the hosts of
+    that type, and since the allocations changed since that cursor.
+    Responses carry an ETag, so that unchanged calendars are not sent
+    again.
+    """
+    try:
+        start, end, since = [_epoch_param(request, name)
+                             for name in ('start', 'end', 'since')]
+    except (ValueError, OverflowError, OSError):
+        return HttpResponseBadRequest('start, end and since must be epoch '
+                                      'seconds')
+    node_type = request.GET.get('node_type') or None
+
+    compute_hosts = api.blazar.compute_host_list(request, node_types=True)
+    if node_type is not None:
+        compute_hosts = [host for host in compute_hosts
+                         if host['node_type'] == node_type]
+    reservations = api.blazar.reservation_calendar(
+        request, start=start, end=end, node_type=node_type, since=since)
+
+    body = json.dumps(encode_calendar(compute_hosts, reservations, since),
+                      separators=(',', ':'))
+    etag = '"%s"' % hashlib.md5(body.encode('utf-8')).hexdigest()
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=0)
+    return response
 
 
 class DetailView(tabs.TabView):
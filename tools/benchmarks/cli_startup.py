@@ -0,0 +1,75 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures the start-up time of the climate CLI.
+
+Runs each of the following in a fresh interpreter and reports the best and
+median wall time: importing climateclient.shell, ``climate --version`` and
+``climate help``. It also lists the slow modules that were imported but are
+only needed once a command talks to the server:
+
+    python tools/benchmarks/cli_startup.py --runs 20
+"""
+
+from __future__ import print_function
+import argparse
+import subprocess
+import sys
+import time
+
+# NOTE: none of these is needed before authenticating or running a command.
+LAZY_MODULES = ('keystoneclient', 'requests', 'pbr.version',
+                'climateclient.v1.shell_commands.leases',
+                'climateclient.v1.shell_commands.hosts')
+
+CASES = [
+    ('import climateclient.shell', ['-c', 'import climateclient.shell']),
+    ('climate --version', ['-m', 'climateclient.shell', '--version']),
+    ('climate help', ['-m', 'climateclient.shell', 'help']),
+]
+
+
+def run(args):
+    """Returns the wall time of a new interpreter run with args."""
+    start = time.time()
+    subprocess.check_call([sys.executable] + args,
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return time.time() - start
+
+
+def loaded_lazy_modules():
+    """Returns the lazy modules imported along with climateclient.shell."""
+    code = ('import sys, climateclient.shell; '
+            'print(" ".join(m for m in %r if m in sys.modules))'
+            % (LAZY_MODULES,))
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return output.decode('utf-8').split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    for name, case_args in CASES:
+        times = sorted(run(case_args) for _i in range(args.runs))
+        print('%-28s best %6.1f ms  median %6.1f ms' %
+              (name, times[0] * 1000, times[len(times) // 2] * 1000))
+    print('eagerly imported: %s' % (' '.join(loaded_lazy_modules()) or
+                                    'nothing'))
+
+
+if __name__ == '__main__':
+    main()
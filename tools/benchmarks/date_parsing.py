@@ -0,0 +1,71 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares datetime.strptime with utils.parse_date on lease dates.
+
+Parses the same synthetic timestamps in LEASE_DATE_FORMAT with strptime,
+with parse_date on distinct dates (nothing memoized) and with parse_date
+on dates repeating as they do across leases (mostly memoized):
+
+    python tools/benchmarks/date_parsing.py --dates 100000
+"""
+
+from __future__ import print_function
+import argparse
+import datetime
+import time
+
+from climateclient import utils
+
+
+def synthetic_dates(count, distinct):
+    start = datetime.datetime(2014, 1, 1)
+    return [(start + datetime.timedelta(seconds=i % distinct * 3601,
+                                        microseconds=i % 7)).strftime(
+        utils.LEASE_DATE_FORMAT) for i in range(count)]
+
+
+def run(parse, dates):
+    start = time.time()
+    for date in dates:
+        parse(date, utils.LEASE_DATE_FORMAT)
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--dates', type=int, default=100000)
+    parser.add_argument('--distinct', type=int, default=1000,
+                        help='Number of distinct dates of the repeated case')
+    args = parser.parse_args()
+
+    distinct = synthetic_dates(args.dates, args.dates)
+    repeated = synthetic_dates(args.dates, args.distinct)
+
+    def parse_uncached(value, date_format):
+        utils._DATE_CACHE.clear()
+        return utils.parse_date(value, date_format)
+
+    cases = [('strptime', datetime.datetime.strptime, distinct),
+             ('parse_date, no cache hit', parse_uncached, distinct),
+             ('parse_date, repeated dates', utils.parse_date, repeated)]
+    for name, parse, dates in cases:
+        elapsed = run(parse, dates)
+        print('%-28s %7.3f s  %7.2f us/date' %
+              (name, elapsed, elapsed / len(dates) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
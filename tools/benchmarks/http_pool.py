@@ -0,0 +1,91 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares per-request connections with the pooled client session.
+
+Starts a local stub of the reservation API and issues the same number of
+``lease.get()`` calls with and without a shared keep-alive session:
+
+    python tools/benchmarks/http_pool.py --requests 2000
+"""
+
+from __future__ import print_function
+import argparse
+import json
+import threading
+import time
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from climateclient import base
+from climateclient.v1 import leases
+
+LEASE = {'id': 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee', 'name': 'lease',
+         'start_date': '2014-01-01T00:00:00.000000',
+         'end_date': '2014-01-02T00:00:00.000000'}
+
+
+class StubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({'lease': LEASE}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+def run(manager, count):
+    start = time.time()
+    for _i in range(count):
+        manager.get(LEASE['id'])
+    return count / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%s' % server.server_address[1]
+
+    unpooled = leases.LeaseClientManager(url, 'token')
+    pooled = leases.LeaseClientManager(url, 'token',
+                                       session=base.create_session())
+
+    print('new connection per request: %8.1f req/s' %
+          run(unpooled, args.requests))
+    print('pooled keep-alive session:  %8.1f req/s' %
+          run(pooled, args.requests))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# Copyright (c) 2014 Mirantis Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the memory taken by leases as dicts and as records.
+
+Decodes the same JSON list of synthetic leases, each with a reservation and
+two events, and keeps them either as dicts or as records.Lease:
+
+    python tools/benchmarks/lease_records.py --leases 100000
+
+Needs Python 3 for tracemalloc.
+"""
+
+from __future__ import print_function
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from climateclient.v1 import records
+
+STATUSES = ('PENDING', 'ACTIVE', 'TERMINATED', 'ERROR')
+
+
+def synthetic_leases(count):
+    leases = []
+    for i in range(count):
+        lease_id = '%08x-0000-4000-8000-%012x' % (i, i)
+        start = '2014-%02d-%02dT%02d:00:00.000000' % (
+            i % 12 + 1, i % 28 + 1, i % 24)
+        leases.append({
+            'id': lease_id, 'name': 'lease-%d' % i,
+            'user_id': 'user-%d' % (i % 50),
+            'project_id': 'project-%d' % (i % 20),
+            'start_date': start, 'end_date': start, 'trust_id': None,
+            'action': 'START', 'status': STATUSES[i % len(STATUSES)],
+            'status_reason': '', 'created_at': start, 'updated_at': None,
+            'reservations': [{
+                'id': 'r-%d' % i, 'lease_id': lease_id,
+                'resource_id': 'resource-%d' % i,
+                'resource_type': 'physical:host', 'status': 'pending',
+                'created_at': start, 'updated_at': None}],
+            'events': [{
+                'id': 'e-%d-%d' % (i, n), 'lease_id': lease_id,
+                'event_type': event_type, 'time': start,
+                'status': 'UNDONE', 'created_at': start, 'updated_at': None}
+                for n, event_type in enumerate(('start_lease', 'end_lease'))],
+        })
+    return json.dumps({'leases': leases})
+
+
+def measure(text, as_records):
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    leases = json.loads(text)['leases']
+    if as_records:
+        leases = [records.Lease(lease) for lease in leases]
+    elapsed = time.time() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del leases
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--leases', type=int, default=100000)
+    args = parser.parse_args()
+
+    text = synthetic_leases(args.leases)
+    for name, as_records in (('dicts', False), ('records', True)):
+        size, elapsed = measure(text, as_records)
+        print('%-8s %8.1f MiB  %6.0f bytes/lease  %6.2f s' %
+              (name, size / 2.0 ** 20, float(size) / args.leases, elapsed))
+
+
+if __name__ == '__main__':
+    main()